@@ -0,0 +1,68 @@
+"""
+Compare two benchmark result files written by benchmarks.run.
+
+Prints the median of every benchmark present in both files and the ratio
+new/old; ratios above the threshold are flagged as regressions.
+
+Usage:
+    python -m benchmarks.compare before.json after.json
+    python -m benchmarks.compare before.json after.json --threshold 1.2
+"""
+
+import argparse
+import json
+import sys
+
+DEFAULT_THRESHOLD = 1.10
+
+
+def _load(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _describe(meta):
+    return f"{meta.get('client_version')} / {meta.get('git')} / scale {meta.get('scale')} / {meta.get('timestamp')}"
+
+
+def compare(old, new):
+    """Return [(name, old_median, new_median, ratio)] for benchmarks measured in both."""
+    rows = []
+    for name, before in old['results'].items():
+        after = new['results'].get(name)
+        if not after or 'median' not in before or 'median' not in after:
+            continue
+        ratio = after['median'] / before['median'] if before['median'] else float('inf')
+        rows.append((name, before['median'], after['median'], ratio))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare two benchmark result files.')
+    parser.add_argument('old')
+    parser.add_argument('new')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='new/old ratio above which a benchmark counts as a regression')
+    args = parser.parse_args(argv)
+
+    old, new = _load(args.old), _load(args.new)
+    if old['meta'].get('repository') != new['meta'].get('repository'):
+        print('warning: the runs used different synthetic repositories')
+    print(f"old: {_describe(old['meta'])}")
+    print(f"new: {_describe(new['meta'])}")
+    print()
+    print(f"{'benchmark':<36} {'old ms':>10} {'new ms':>10} {'ratio':>7}")
+    regressions = 0
+    for name, before, after, ratio in compare(old, new):
+        flag = ''
+        if ratio > args.threshold:
+            flag = '  slower'
+            regressions += 1
+        elif ratio < 1 / args.threshold:
+            flag = '  faster'
+        print(f"{name:<36} {before * 1000:>10.1f} {after * 1000:>10.1f} {ratio:>7.2f}{flag}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
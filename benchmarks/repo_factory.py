@@ -0,0 +1,257 @@
+"""
+RepoFactory - Deterministic synthetic repositories shaped like Unreal projects.
+
+Repositories are written with a single `git fast-import` stream, so even the
+500k-file scale is generated in minutes rather than hours:
+
+- a Source/ tree of small C++ files and Config/*.ini (text, diffable);
+- Content/ full of binary `.uasset`/`.umap` blobs drawn from a fixed pool;
+- Content/Streamed/ holding Git LFS pointer files (tracked in .gitattributes);
+- a deep first-parent history where every commit touches a few files, with
+  a short merged side branch every MERGE_EVERY commits;
+- many branches pointing at older commits.
+
+After the import the working tree is checked out (without LFS smudging)
+and made dirty: some files modified, some untracked files added. The
+resulting layout is recorded in `<repo>.json` next to the repository and
+the repository is reused as long as the parameters match.
+
+Usage:
+    repo = build_repository('small', work_dir='benchmarks/.repos')
+    repo.path, repo.manifest['modified']
+"""
+
+import hashlib
+import json
+import os
+import random
+import shutil
+import subprocess
+import time
+from collections import namedtuple
+
+# files: tracked files in the initial tree; binary/lfs are part of files
+SCALES = {
+    'tiny':   dict(files=2_000,   binary=600,     lfs=300,    commits=300,    branches=20,  dirty=50),
+    'small':  dict(files=10_000,  binary=3_000,   lfs=1_500,  commits=2_000,  branches=50,  dirty=200),
+    'medium': dict(files=100_000, binary=30_000,  lfs=15_000, commits=10_000, branches=200, dirty=2_000),
+    'large':  dict(files=500_000, binary=150_000, lfs=75_000, commits=30_000, branches=500, dirty=5_000),
+}
+
+FACTORY_VERSION = 1
+SEED = 20240611
+BINARY_POOL = 512
+BINARY_SIZES = (1024, 8192)
+MERGE_EVERY = 50
+EPOCH = 1577836800  # 2020-01-01
+
+AUTHORS = [(f"Artist {i:02d}", f"artist{i:02d}@studio.example") for i in range(16)] + \
+          [(f"Programmer {i:02d}", f"dev{i:02d}@studio.example") for i in range(8)]
+AREAS = ['Characters', 'Environment', 'Props', 'VFX', 'UI', 'Audio', 'Maps', 'Blueprints']
+MODULES = ['Core', 'Gameplay', 'Rendering', 'Network', 'Animation', 'AI', 'Editor', 'Online']
+GITATTRIBUTES = b'Content/Streamed/** filter=lfs diff=lfs merge=lfs -text\n'
+
+SyntheticRepo = namedtuple('SyntheticRepo', 'path manifest')
+
+
+def _text_blob(path, revision):
+    body = [f"// {path}", f"// revision {revision}", '#include "CoreMinimal.h"', '']
+    name = os.path.splitext(os.path.basename(path))[0]
+    for i in range(6):
+        body.append(f"int32 {name}_Value{i}() {{ return {revision * 7 + i}; }}")
+    return ('\n'.join(body) + '\n').encode('utf-8')
+
+
+def _lfs_pointer(path, revision):
+    oid = hashlib.sha256(f"{path}@{revision}".encode('utf-8')).hexdigest()
+    size = 1_000_000 + int(oid[:6], 16)
+    return f"version https://git-lfs.github.com/spec/v1\noid sha256:{oid}\nsize {size}\n".encode('ascii')
+
+
+def _layout(params, rng):
+    """Return (text_paths, binary_paths, lfs_paths) for the initial tree."""
+    text_count = params['files'] - params['binary'] - params['lfs'] - 1  # .gitattributes
+    text = []
+    for i in range(text_count):
+        if i % 50 == 0:
+            text.append(f"Config/{MODULES[i % len(MODULES)]}/Default{i}.ini")
+        else:
+            module = MODULES[i % len(MODULES)]
+            text.append(f"Source/{module}/{'Private' if i % 3 else 'Public'}/Sub{i // 400:04d}/File{i}.{'cpp' if i % 2 else 'h'}")
+    binary = []
+    for i in range(params['binary']):
+        area = AREAS[i % len(AREAS)]
+        ext = 'umap' if area == 'Maps' else 'uasset'
+        binary.append(f"Content/{area}/Set{i // 500:04d}/Asset_{i}.{ext}")
+    lfs = [f"Content/Streamed/{AREAS[i % len(AREAS)]}/Pack{i // 500:04d}/Tex_{i}.uasset"
+           for i in range(params['lfs'])]
+    rng.shuffle(text)
+    return text, binary, lfs
+
+
+class _Stream:
+    """Writes a fast-import stream; `blob()` returns a mark."""
+
+    def __init__(self, out):
+        self.out = out
+        self.next_mark = 1
+
+    def mark(self):
+        mark = self.next_mark
+        self.next_mark += 1
+        return mark
+
+    def data(self, payload):
+        self.out.write(b'data %d\n' % len(payload))
+        self.out.write(payload)
+        self.out.write(b'\n')
+
+    def blob(self, payload):
+        mark = self.mark()
+        self.out.write(b'blob\nmark :%d\n' % mark)
+        self.data(payload)
+        return mark
+
+    def commit(self, ref, author, timestamp, message, parents=(), changes=()):
+        mark = self.mark()
+        name, email = author
+        ident = f"{name} <{email}> {timestamp} +0000".encode('utf-8')
+        self.out.write(b'commit %s\nmark :%d\nauthor %s\ncommitter %s\n' % (ref.encode(), mark, ident, ident))
+        self.data(message.encode('utf-8'))
+        if parents:
+            self.out.write(b'from :%d\n' % parents[0])
+            for parent in parents[1:]:
+                self.out.write(b'merge :%d\n' % parent)
+        for path, blob_mark in changes:
+            self.out.write(b'M 100644 :%d %s\n' % (blob_mark, path.encode('utf-8')))
+        self.out.write(b'\n')
+        return mark
+
+    def reset(self, ref, mark):
+        self.out.write(b'reset %s\nfrom :%d\n\n' % (ref.encode(), mark))
+
+
+def _run_git(args, cwd, env=None, **kwargs):
+    return subprocess.run(['git'] + args, cwd=cwd, check=True, env=env, **kwargs)
+
+
+def _generate(path, params):
+    rng = random.Random(SEED)
+    text, binary, lfs = _layout(params, rng)
+    _run_git(['init', '-q', '-b', 'main', path], cwd=None)
+    _run_git(['config', 'core.autocrlf', 'false'], cwd=path)
+
+    process = subprocess.Popen(['git', 'fast-import', '--quiet', '--done'], cwd=path, stdin=subprocess.PIPE)
+    stream = _Stream(process.stdin)
+
+    pool = []
+    for i in range(BINARY_POOL):
+        size = rng.randint(*BINARY_SIZES)
+        # Real packages start with the UE magic and contain plenty of NULs
+        payload = bytearray(rng.randbytes(size))
+        payload[::4] = bytes(len(payload[::4]))
+        pool.append(stream.blob(b'\xc1\x83\x2a\x9e' + bytes(payload)))
+
+    changes = [('.gitattributes', stream.blob(GITATTRIBUTES))]
+    changes += [(p, stream.blob(_text_blob(p, 0))) for p in text]
+    changes += [(p, pool[i % BINARY_POOL]) for i, p in enumerate(binary)]
+    changes += [(p, stream.blob(_lfs_pointer(p, 0))) for p in lfs]
+    timestamp = EPOCH
+    head = stream.commit('refs/heads/main', AUTHORS[0], timestamp, 'Initial import', changes=changes)
+    commits = [head]
+
+    revisions = {}
+    for n in range(1, params['commits']):
+        timestamp += rng.randint(600, 7200)
+        author = rng.choice(AUTHORS)
+        changes = []
+        for rel in rng.sample(text, rng.randint(1, 3)):
+            revisions[rel] = revisions.get(rel, 0) + 1
+            changes.append((rel, stream.blob(_text_blob(rel, revisions[rel]))))
+        if rng.random() < 0.3:
+            changes.append((rng.choice(binary), pool[rng.randrange(BINARY_POOL)]))
+        if rng.random() < 0.1:
+            rel = rng.choice(lfs)
+            revisions[rel] = revisions.get(rel, 0) + 1
+            changes.append((rel, stream.blob(_lfs_pointer(rel, revisions[rel]))))
+        if n % MERGE_EVERY == 0:
+            # Short side branch merged back: gives the graph real lanes
+            side = head
+            for k in range(3):
+                rel = rng.choice(text)
+                revisions[rel] = revisions.get(rel, 0) + 1
+                side = stream.commit('refs/heads/main', author, timestamp - 300 + k,
+                                     f"Feature work {n}.{k}", parents=(side,),
+                                     changes=[(rel, stream.blob(_text_blob(rel, revisions[rel])))])
+            head = stream.commit('refs/heads/main', author, timestamp, f"Merge feature {n}",
+                                 parents=(head, side), changes=changes)
+        else:
+            head = stream.commit('refs/heads/main', author, timestamp,
+                                 f"Update {changes[0][0].rsplit('/', 1)[-1]} ({n})",
+                                 parents=(head,), changes=changes)
+        commits.append(head)
+    stream.reset('refs/heads/main', head)
+
+    for b in range(params['branches']):
+        stream.reset(f"refs/heads/feature/task-{b:04d}", commits[rng.randrange(len(commits))])
+    stream.out.write(b'done\n')
+    process.stdin.close()
+    if process.wait() != 0:
+        raise RuntimeError('git fast-import failed')
+
+    env = dict(os.environ, GIT_LFS_SKIP_SMUDGE='1')
+    _run_git(['-c', 'filter.lfs.smudge=', '-c', 'filter.lfs.process=', '-c', 'filter.lfs.required=false',
+              'reset', '-q', '--hard', 'main'], cwd=path, env=env)
+    return text, binary, lfs
+
+
+def _make_dirty(path, params, text, binary):
+    """Modify some tracked files and add untracked ones; returns the changed paths."""
+    rng = random.Random(SEED + 1)
+    count = params['dirty']
+    modified = rng.sample(text, count // 2) + rng.sample(binary, count // 4)
+    for rel in modified:
+        with open(os.path.join(path, rel), 'ab') as f:
+            f.write(b'\n// local edit\n' if not rel.endswith(('.uasset', '.umap')) else b'\x00\x01')
+    untracked = [f"Content/Developers/Local/New_{i}.uasset" if i % 2 else f"Source/Core/Private/New{i}.cpp"
+                 for i in range(count - len(modified))]
+    for rel in untracked:
+        full = os.path.join(path, rel)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        with open(full, 'wb') as f:
+            f.write(b'new file\n')
+    return modified, untracked
+
+
+def build_repository(scale, work_dir, force=False, **overrides):
+    """Create (or reuse) the repository for `scale`; returns SyntheticRepo(path, manifest)."""
+    params = dict(SCALES[scale], **overrides)
+    path = os.path.abspath(os.path.join(work_dir, scale))
+    manifest_path = path + '.json'
+    wanted = {'factory_version': FACTORY_VERSION, 'seed': SEED, 'params': params}
+    if not force and os.path.isdir(os.path.join(path, '.git')) and os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+        if {k: manifest.get(k) for k in wanted} == wanted:
+            return SyntheticRepo(path, manifest)
+    if os.path.exists(path):
+        shutil.rmtree(path)
+    os.makedirs(work_dir, exist_ok=True)
+
+    print(f"Generating '{scale}' repository in {path} ...")
+    started = time.perf_counter()
+    text, binary, lfs = _generate(path, params)
+    modified, untracked = _make_dirty(path, params, text, binary)
+    head = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=path, capture_output=True, text=True).stdout.strip()
+    manifest = dict(wanted,
+                    generated_in=round(time.perf_counter() - started, 1),
+                    head=head,
+                    sample_text=text[:20],
+                    sample_binary=binary[:20],
+                    sample_lfs=lfs[:20],
+                    modified=modified,
+                    untracked=untracked)
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    print(f"  done in {manifest['generated_in']}s")
+    return SyntheticRepo(path, manifest)
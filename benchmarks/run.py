@@ -0,0 +1,500 @@
+"""
+Benchmark runner - Times the GitManager APIs and the Qt paint paths on a
+synthetic repository and writes the results to JSON.
+
+Core benchmarks run headless against a fresh `GitManager`. Qt benchmarks
+run with the offscreen platform plugin; they are skipped (and the reason
+recorded) when PyQt6 is not available. HOME is pointed at a temporary
+directory so the persistent cache and settings of the machine are neither
+used nor touched.
+
+Usage:
+    python -m benchmarks.run --scale small
+    python -m benchmarks.run --scale medium --repeat 3 --only status,history
+    python -m benchmarks.compare benchmarks/results/before.json benchmarks/results/after.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks.repo_factory import SCALES, build_repository  # noqa: E402
+
+DEFAULT_WORK_DIR = os.path.join(ROOT, 'benchmarks', '.repos')
+DEFAULT_RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+FIXTURES_DIR = os.path.join(ROOT, 'benchmarks', 'fixtures')
+HISTORY_LIMIT = 1000
+QT_TIMEOUT = 60.0
+
+BENCHMARKS = []
+
+
+def benchmark(name, group='core'):
+    """Register `fn(ctx)`; it returns a Case (or a plain callable to time)."""
+    def register(fn):
+        BENCHMARKS.append((name, group, fn))
+        return fn
+    return register
+
+
+class Case:
+    """What to time: `run()` is measured, `setup()`/`teardown()` are not."""
+
+    def __init__(self, run, setup=None, teardown=None):
+        self.run = run
+        self.setup = setup
+        self.teardown = teardown
+
+
+class Context:
+    """Shared state of one benchmark session."""
+
+    def __init__(self, repo):
+        self.repo = repo
+        self.path = repo.path
+        self.manifest = repo.manifest
+        self._managers = []
+        self.cleanups = []
+
+    def manager(self):
+        from core.git_manager import GitManager
+        manager = GitManager()
+        manager.set_repository(self.path)
+        self._managers.append(manager)
+        return manager
+
+    def drop_caches(self):
+        """Forget everything cached in memory and on disk for the repository."""
+        from core.diff_cache import get_diff_cache
+        from core.persistent_cache import default_cache_root
+        for manager in self._managers:
+            manager.close()
+        self._managers = []
+        get_diff_cache().clear()
+        shutil.rmtree(default_cache_root(), ignore_errors=True)
+
+    def close(self):
+        for manager in self._managers:
+            manager.close()
+        self._managers = []
+        for cleanup in self.cleanups:
+            cleanup()
+        self.cleanups = []
+
+    def git(self, *args):
+        return subprocess.run(['git'] + list(args), cwd=self.path, capture_output=True,
+                              text=True, check=True).stdout
+
+
+def _summarize(runs):
+    return {
+        'runs': [round(r, 6) for r in runs],
+        'min': round(min(runs), 6),
+        'median': round(statistics.median(runs), 6),
+        'mean': round(statistics.fmean(runs), 6),
+        'max': round(max(runs), 6),
+    }
+
+
+def _measure(case, repeat):
+    if callable(case) and not isinstance(case, Case):
+        case = Case(case)
+    runs = []
+    for _ in range(repeat):
+        if case.setup:
+            case.setup()
+        started = time.perf_counter()
+        try:
+            case.run()
+        finally:
+            runs.append(time.perf_counter() - started)
+            if case.teardown:
+                case.teardown()
+    return runs
+
+
+# ==================== CORE ====================
+
+@benchmark('status.cold')
+def bench_status_cold(ctx):
+    state = {}
+
+    def setup():
+        ctx.drop_caches()
+        state['manager'] = ctx.manager()
+    return Case(lambda: state['manager'].get_status_summary(), setup=setup)
+
+
+@benchmark('status.warm')
+def bench_status_warm(ctx):
+    manager = ctx.manager()
+    manager.get_status_summary()
+    return lambda: manager.get_status_summary()
+
+
+@benchmark('status.scoped')
+def bench_status_scoped(ctx):
+    manager = ctx.manager()
+    manager.get_status_summary()
+    paths = set(ctx.manifest['modified'][:10])
+    return lambda: manager.get_status_summary(paths=paths)
+
+
+@benchmark('history.cold')
+def bench_history_cold(ctx):
+    state = {}
+
+    def setup():
+        ctx.drop_caches()
+        state['manager'] = ctx.manager()
+    return Case(lambda: state['manager'].get_commit_history(limit=HISTORY_LIMIT), setup=setup)
+
+
+@benchmark('history.warm')
+def bench_history_warm(ctx):
+    manager = ctx.manager()
+    manager.get_commit_history(limit=HISTORY_LIMIT)
+    return lambda: manager.get_commit_history(limit=HISTORY_LIMIT)
+
+
+@benchmark('history.first_page')
+def bench_history_first_page(ctx):
+    state = {}
+
+    def setup():
+        state['manager'] = ctx.manager()
+    return Case(lambda: state['manager'].history_pager.get_page(0), setup=setup)
+
+
+@benchmark('history.deep_page')
+def bench_history_deep_page(ctx):
+    state = {}
+    page = max(0, ctx.manifest['params']['commits'] // 200 - 1)
+
+    def setup():
+        state['manager'] = ctx.manager()
+    return Case(lambda: state['manager'].history_pager.get_page(page), setup=setup)
+
+
+@benchmark('branches')
+def bench_branches(ctx):
+    manager = ctx.manager()
+    return lambda: manager.get_all_branches()
+
+
+@benchmark('diff.commit_bundle.cold')
+def bench_commit_bundle_cold(ctx):
+    commit = ctx.git('rev-parse', 'HEAD~10').strip()
+    state = {}
+
+    def setup():
+        ctx.drop_caches()
+        state['manager'] = ctx.manager()
+    return Case(lambda: state['manager'].get_commit_diff_bundle(commit), setup=setup)
+
+
+@benchmark('diff.commit_bundle.warm')
+def bench_commit_bundle_warm(ctx):
+    commit = ctx.git('rev-parse', 'HEAD~10').strip()
+    manager = ctx.manager()
+    manager.get_commit_diff_bundle(commit)
+    return lambda: manager.get_commit_diff_bundle(commit)
+
+
+@benchmark('diff.file.text')
+def bench_file_diff_text(ctx):
+    manager = ctx.manager()
+    path = next(p for p in ctx.manifest['modified'] if not p.endswith(('.uasset', '.umap')))
+    return lambda: manager.get_file_diff(path)
+
+
+@benchmark('diff.file.binary')
+def bench_file_diff_binary(ctx):
+    manager = ctx.manager()
+    path = next(p for p in ctx.manifest['modified'] if p.endswith(('.uasset', '.umap')))
+    return lambda: manager.get_file_diff(path)
+
+
+@benchmark('lfs_track_files')
+def bench_lfs_track(ctx):
+    manager = ctx.manager()
+    patterns = ['*.fbx', '*.wav'] + ctx.manifest['sample_binary'][:5]
+
+    def restore():
+        # Put .gitattributes and the index back the way the factory left them
+        ctx.git('reset', '-q', '--', '.gitattributes', *patterns[2:])
+        ctx.git('checkout', '--', '.gitattributes')
+    return Case(lambda: manager.lfs_track_files(patterns), teardown=restore)
+
+
+@benchmark('stage_files')
+def bench_stage_files(ctx):
+    manager = ctx.manager()
+    files = ctx.manifest['modified'] + ctx.manifest['untracked']
+    return Case(lambda: manager.stage_files(files), teardown=manager.unstage_all)
+
+
+def _unreal_module(name):
+    import importlib.util
+    path = os.path.join(ROOT, 'plugins', 'unreal_engine', f'{name}.py')
+    spec = importlib.util.spec_from_file_location(f'unreal_engine_{name}', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _asset_catalog_class():
+    return _unreal_module('asset_catalog').AssetCatalog
+
+
+@benchmark('assets.catalog.build')
+def bench_asset_catalog_build(ctx):
+    catalog_class = _asset_catalog_class()
+    state = {}
+
+    def setup():
+        ctx.drop_caches()
+        state['catalog'] = catalog_class(ctx.path)
+    return Case(lambda: state['catalog'].refresh(), setup=setup, teardown=lambda: state['catalog'].close())
+
+
+@benchmark('assets.catalog.reopen')
+def bench_asset_catalog_reopen(ctx):
+    # A new session over a persisted catalog: ls-files + diff-files, no re-stat
+    catalog_class = _asset_catalog_class()
+    ctx.drop_caches()
+    first = catalog_class(ctx.path)
+    first.refresh()
+    first.close()
+    state = {}
+
+    def setup():
+        state['catalog'] = catalog_class(ctx.path)
+    return Case(lambda: state['catalog'].refresh(), setup=setup, teardown=lambda: state['catalog'].close())
+
+
+@benchmark('assets.catalog.query')
+def bench_asset_catalog_query(ctx):
+    catalog = _asset_catalog_class()(ctx.path)
+    catalog.refresh()
+    ctx.cleanups.append(catalog.close)
+    return lambda: (catalog.query(folder='Content', min_size=1024 * 1024, order='size'), catalog.summary())
+
+
+@benchmark('assets.package_reader')
+def bench_package_reader(ctx):
+    # Header decode of the package fixtures (one per supported summary layout)
+    read_package = _unreal_module('package_reader').read_package
+    paths = [os.path.join(FIXTURES_DIR, name) for name in sorted(os.listdir(FIXTURES_DIR))
+             if name.endswith(('.uasset', '.umap'))]
+    for path in paths:
+        read_package(path)  # a fixture the reader rejects fails the run here
+    return lambda: [read_package(path) for path in paths]
+
+
+# ==================== QT ====================
+
+def _qt_app():
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+def _wait(app, done, timeout=QT_TIMEOUT):
+    deadline = time.perf_counter() + timeout
+    while not done():
+        if time.perf_counter() > deadline:
+            raise TimeoutError('timed out waiting for the widget')
+        app.processEvents()
+        time.sleep(0.001)
+
+
+@benchmark('qt.changes.reset_and_paint', group='qt')
+def bench_changes_reset(ctx):
+    from PyQt6.QtWidgets import QListView
+    from ui.changes_model import ChangesModel
+    _qt_app()
+    entries = ctx.manager().get_status_summary()['entries']
+    view = QListView()
+    view.resize(420, 900)
+    state = {}
+
+    def setup():
+        state['model'] = ChangesModel()
+        view.setModel(state['model'])
+
+    def run():
+        state['model'].set_entries(entries)
+        view.grab()
+    return Case(run, setup=setup)
+
+
+@benchmark('qt.changes.delta', group='qt')
+def bench_changes_delta(ctx):
+    from ui.changes_model import ChangesModel
+    _qt_app()
+    entries = ctx.manager().get_status_summary()['entries']
+    model = ChangesModel()
+    state = {'full': True}
+
+    def run():
+        # Alternate between the full list and one missing a few rows
+        model.set_entries(entries if state['full'] else entries[10:])
+        state['full'] = not state['full']
+    model.set_entries(entries)
+    state['full'] = False
+    return run
+
+
+@benchmark('qt.commit_graph.layout_and_paint', group='qt')
+def bench_commit_graph(ctx):
+    from PyQt6.QtCore import QRect
+    from ui.commit_graph_widget import CommitGraphWidget
+    _qt_app()
+    manager = ctx.manager()
+    rows = []
+    page = 0
+    while len(rows) < HISTORY_LIMIT:
+        chunk = manager.history_pager.get_page(page)
+        if not chunk:
+            break
+        rows.extend(chunk)
+        page += 1
+    commits = [{'hash': c['hash'], 'parents': c.get('parents', []), 'timestamp': c.get('timestamp', 0),
+                'graph': c.get('graph'), 'message': c['message'], 'author': c['author'],
+                'email': c.get('email', ''), 'date': c['date']} for c in rows]
+    widget = CommitGraphWidget()
+    widget.resize(900, 900)
+
+    def run():
+        widget.set_commits(commits)
+        widget.grab(QRect(0, 0, 900, 900))
+    return run
+
+
+@benchmark('qt.diff_view.load_and_paint', group='qt')
+def bench_diff_view(ctx):
+    from ui.diff_view import DiffView
+    app = _qt_app()
+    commit = ctx.git('rev-parse', 'HEAD~10').strip()
+    text = ctx.git('log', '-p', '--no-color', '-n', '200', commit)
+    view = DiffView()
+    view.resize(900, 900)
+
+    def run():
+        view.set_diff(text)
+        _wait(app, lambda: not view._loading)
+        view.grab()
+    return run
+
+
+# ==================== RUNNER ====================
+
+def _git_version():
+    try:
+        return subprocess.run(['git', '--version'], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return None
+
+
+def _client_version():
+    try:
+        from core.version import CURRENT_VERSION
+        return CURRENT_VERSION
+    except ImportError:
+        return None
+
+
+def _qt_unavailable():
+    try:
+        import PyQt6.QtWidgets  # noqa: F401
+    except ImportError as e:
+        return f"PyQt6 not available: {e}"
+    return None
+
+
+def run_benchmarks(scale, repeat=5, work_dir=DEFAULT_WORK_DIR, only=None, skip_qt=False):
+    """Run the registered benchmarks; returns the result document."""
+    repo = build_repository(scale, work_dir)
+    ctx = Context(repo)
+    qt_skipped = 'disabled with --no-qt' if skip_qt else _qt_unavailable()
+    results = {}
+    for name, group, factory in BENCHMARKS:
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        if group == 'qt' and qt_skipped:
+            results[name] = {'group': group, 'skipped': qt_skipped}
+            continue
+        print(f"  {name} ...", end='', flush=True)
+        try:
+            runs = _measure(factory(ctx), repeat)
+            results[name] = dict(_summarize(runs), group=group)
+            print(f" median {results[name]['median'] * 1000:.1f} ms")
+        except Exception as e:
+            results[name] = {'group': group, 'error': f"{type(e).__name__}: {e}"}
+            print(f" failed: {e}")
+        finally:
+            ctx.close()
+    return {
+        'meta': {
+            'client_version': _client_version(),
+            'git': _git_version(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'scale': scale,
+            'repeat': repeat,
+            'repository': {k: repo.manifest[k] for k in ('factory_version', 'seed', 'params', 'head')},
+        },
+        'results': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the git client on a synthetic repository.')
+    parser.add_argument('--scale', choices=sorted(SCALES, key=lambda s: SCALES[s]['files']), default='small')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--work-dir', default=DEFAULT_WORK_DIR,
+                        help='where generated repositories are kept (reused between runs)')
+    parser.add_argument('--out', help='result file (default: benchmarks/results/<scale>-<time>.json)')
+    parser.add_argument('--only', help='comma-separated benchmark name prefixes, e.g. status,diff')
+    parser.add_argument('--no-qt', action='store_true', help='skip the offscreen Qt benchmarks')
+    args = parser.parse_args(argv)
+
+    work_dir = os.path.abspath(args.work_dir)
+    out = args.out or os.path.join(DEFAULT_RESULTS_DIR, f"{args.scale}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    only = [p.strip() for p in args.only.split(',')] if args.only else None
+
+    home = tempfile.mkdtemp(prefix='git-client-bench-')
+    saved = {k: os.environ.get(k) for k in ('HOME', 'USERPROFILE')}
+    os.environ['HOME'] = os.environ['USERPROFILE'] = home
+    try:
+        document = run_benchmarks(args.scale, args.repeat, work_dir, only, args.no_qt)
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        shutil.rmtree(home, ignore_errors=True)
+
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2)
+    print(f"Results written to {out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
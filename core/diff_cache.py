@@ -0,0 +1,168 @@
+"""
+DiffCache - Process-wide LRU of commit diffs, bounded by memory size.
+
+A commit's diff never changes, so entries are immutable and safe to share
+between every tab (and thread) that has the same repository open. Each
+file is cached separately under (repo, commit, path) and the cache
+evicts the least recently used files until the total size fits the
+budget, so one huge commit pushes out old entries instead of being
+silently left uncached.
+
+Only full object ids are cached; symbolic refs like HEAD or a branch
+name move and must always go to git.
+"""
+
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+
+# One file of a commit diff. Immutable so it can be handed out without copying.
+DiffEntry = namedtuple('DiffEntry', ['status', 'diff', 'old_path'])
+
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+
+_FULL_OID = re.compile(r'\A(?:[0-9a-f]{40}|[0-9a-f]{64})\Z')
+
+
+def is_immutable_revision(revision):
+    """True for a full commit id, the only revisions whose diff never changes."""
+    return bool(revision) and _FULL_OID.match(revision) is not None
+
+
+def repo_key(repo_path):
+    """Normalize a repository path so every tab on the same repo shares entries."""
+    return os.path.normcase(os.path.realpath(repo_path))
+
+
+def _entry_size(entry):
+    size = sys.getsizeof(entry) + sys.getsizeof(entry.diff)
+    if entry.old_path:
+        size += sys.getsizeof(entry.old_path)
+    return size
+
+
+class DiffCache:
+    """
+    Byte-bounded LRU of DiffEntry objects keyed by (repo, commit, path).
+
+    Usage:
+        cache = get_diff_cache()
+        key = repo_key(repo_path)
+        cache.put_bundle(key, commit_hash, {'a.txt': DiffEntry('M', diff, None)})
+        cache.get_bundle(key, commit_hash)    # {path: DiffEntry} or None
+        cache.get(key, commit_hash, 'a.txt')  # DiffEntry or None
+        cache.stats()                         # hits, misses, evictions, bytes, entries
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # (repo, commit, path) -> (DiffEntry, size)
+        self._commits = {}              # (repo, commit) -> tuple of paths in git order
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, repo, commit, path):
+        with self._lock:
+            item = self._entries.get((repo, commit, path))
+            if item is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((repo, commit, path))
+            self.hits += 1
+            return item[0]
+
+    def get_bundle(self, repo, commit):
+        """Return every file of a commit in git's order, or None if any of them was evicted."""
+        with self._lock:
+            paths = self._commits.get((repo, commit))
+            if paths is None:
+                self.misses += 1
+                return None
+            bundle = {}
+            for path in paths:
+                item = self._entries.get((repo, commit, path))
+                if item is None:
+                    del self._commits[(repo, commit)]
+                    self.misses += 1
+                    return None
+                bundle[path] = item[0]
+            for path in paths:
+                self._entries.move_to_end((repo, commit, path))
+            self.hits += 1
+            return bundle
+
+    def contains_bundle(self, repo, commit):
+        """Check for a full bundle without touching LRU order or counters."""
+        with self._lock:
+            paths = self._commits.get((repo, commit))
+            return paths is not None and all((repo, commit, path) in self._entries for path in paths)
+
+    def put(self, repo, commit, path, entry):
+        with self._lock:
+            self._put(repo, commit, path, entry)
+            self._evict()
+
+    def put_bundle(self, repo, commit, bundle):
+        """Cache all files of a commit ({path: DiffEntry}) and remember their order."""
+        with self._lock:
+            for path, entry in bundle.items():
+                self._put(repo, commit, path, entry)
+            self._commits[(repo, commit)] = tuple(bundle)
+            self._evict()
+
+    def _put(self, repo, commit, path, entry):
+        key = (repo, commit, path)
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        size = _entry_size(entry)
+        self._entries[key] = (entry, size)
+        self._bytes += size
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._entries:
+            (repo, commit, path), (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+            # The bundle is incomplete now; get_bundle() would miss anyway.
+            self._commits.pop((repo, commit), None)
+
+    def clear(self, repo=None):
+        """Drop everything, or only the entries of one repository."""
+        with self._lock:
+            if repo is None:
+                self._entries.clear()
+                self._commits.clear()
+                self._bytes = 0
+                return
+            for key in [k for k in self._entries if k[0] == repo]:
+                self._bytes -= self._entries.pop(key)[1]
+            for key in [k for k in self._commits if k[0] == repo]:
+                del self._commits[key]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'entries': len(self._entries)
+            }
+
+
+_diff_cache = None
+_diff_cache_lock = threading.Lock()
+
+def get_diff_cache():
+    global _diff_cache
+    with _diff_cache_lock:
+        if _diff_cache is None:
+            _diff_cache = DiffCache()
+        return _diff_cache
@@ -0,0 +1,240 @@
+"""
+DiffClassifier - Short-circuits diffs of binary and Git LFS files.
+
+A text diff of a `.uasset` is either "Binary files differ" or, for LFS,
+a three-line pointer diff; both cost a git process and a render pass for
+nothing useful. The classifier decides from the path alone (compiled
+gitattributes LFS rules plus well-known binary extensions) or from git's
+own binary marker, and builds a compact summary instead: old/new size,
+LFS object change and, for the working tree, the lock holder.
+
+Summaries end up in the persistent diff cache, so they are stored
+language-neutral (a `binary-summary {json}` line under git's own header)
+and turned into text by render_summaries() when a diff is shown.
+
+Sizes and LFS pointers are read through the cat-file co-process, so
+summarizing a 300-asset commit spawns no extra processes.
+"""
+
+import json
+import os
+import time
+
+from core.translations import tr
+
+LFS_POINTER_PREFIX = b'version https://git-lfs.github.com/spec/v1'
+# LFS pointer files are ~130 bytes; anything larger is real content.
+MAX_POINTER_SIZE = 1024
+# `git lfs locks --local` is refreshed at most this often.
+LOCKS_TTL = 30.0
+SUMMARY_TAG = 'binary-summary '
+
+BINARY_EXTENSIONS = frozenset((
+    '.uasset', '.umap', '.ubulk', '.uexp', '.upk', '.pak', '.utoc', '.ucas',
+    '.png', '.jpg', '.jpeg', '.tga', '.bmp', '.psd', '.exr', '.hdr', '.dds', '.tif', '.tiff',
+    '.fbx', '.abc', '.blend', '.max', '.mb',
+    '.wav', '.mp3', '.ogg', '.flac', '.mp4', '.mov', '.avi', '.bnk',
+    '.ttf', '.otf', '.zip', '.7z', '.rar', '.gz',
+    '.dll', '.exe', '.lib', '.pdb', '.so', '.dylib', '.a',
+))
+
+
+def parse_lfs_pointer(data):
+    """Return (oid, size) from LFS pointer bytes, or None if `data` is not a pointer."""
+    if not data or len(data) > MAX_POINTER_SIZE or not data.startswith(LFS_POINTER_PREFIX):
+        return None
+    oid = None
+    size = None
+    for line in data.split(b'\n'):
+        if line.startswith(b'oid sha256:'):
+            oid = line[11:].strip().decode('ascii', errors='replace')
+        elif line.startswith(b'size '):
+            try:
+                size = int(line[5:].strip())
+            except ValueError:
+                pass
+    if oid is None:
+        return None
+    return oid, size
+
+
+def format_size(size_bytes):
+    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+        if size_bytes < 1024.0:
+            return f"{size_bytes:.2f} {unit}"
+        size_bytes /= 1024.0
+    return f"{size_bytes:.2f} PB"
+
+
+def render_summaries(diff):
+    """Replace the stored summary lines of `diff` with text in the current language."""
+    if SUMMARY_TAG not in diff:
+        return diff
+    lines = []
+    for line in diff.split('\n'):
+        if not line.startswith(SUMMARY_TAG):
+            lines.append(line)
+            continue
+        try:
+            summary = json.loads(line[len(SUMMARY_TAG):])
+        except ValueError:
+            lines.append(line)
+            continue
+        kind = tr('diff_lfs_file') if summary.get('lfs') else tr('diff_binary_file')
+        if lines and lines[-1].startswith('Binary files '):
+            lines[-1] += f" ({kind})"
+        lines.extend(_summary_lines(summary))
+    return '\n'.join(lines)
+
+
+def _summary_lines(summary):
+    old, new = summary.get('old'), summary.get('new')
+
+    def size_text(side):
+        if side is None:
+            return tr('diff_not_present')
+        return '?' if side[0] is None else format_size(side[0])
+
+    def oid_text(side):
+        if side is None:
+            return '-'
+        # A smudged working copy has content, not a pointer; hashing it is not worth it
+        return side[1][:12] if side[1] else '?'
+
+    lines = [f"{tr('diff_size')}: {size_text(old)} -> {size_text(new)}"]
+    old_oid = old[1] if old else None
+    new_oid = new[1] if new else None
+    if old_oid or new_oid:
+        if old_oid == new_oid:
+            lines.append(f"{tr('diff_lfs_oid')}: {old_oid[:12]} ({tr('diff_lfs_unchanged')})")
+        else:
+            lines.append(f"{tr('diff_lfs_oid')}: {oid_text(old)} -> {oid_text(new)}")
+    if summary.get('lock'):
+        lines.append(f"{tr('diff_locked_by')}: {summary['lock']}")
+    return lines
+
+
+def has_binary_marker(diff):
+    """True if git already decided the patch is binary (checked in the header only)."""
+    head = '\n' + diff.split('\n@@', 1)[0]
+    return '\nBinary files ' in head or '\nGIT binary patch' in head
+
+
+class BlobSide:
+    """One side (old or new) of a binary change."""
+    __slots__ = ('size', 'lfs_oid')
+
+    def __init__(self, size=None, lfs_oid=None):
+        self.size = size
+        self.lfs_oid = lfs_oid
+
+
+class DiffClassifier:
+    """
+    Decides which paths get a summary instead of a text diff.
+
+    Usage:
+        classifier = DiffClassifier(git_manager)
+        if classifier.is_binary_path('Content/Hero.uasset'):
+            text = classifier.summarize_worktree('Content/Hero.uasset')
+        text = classifier.summarize_blobs(path, old_oid, new_oid)
+    """
+
+    def __init__(self, git_manager):
+        self.git_manager = git_manager
+        self._locks = {}
+        self._locks_ts = 0.0
+
+    def reset(self):
+        self._locks = {}
+        self._locks_ts = 0.0
+
+    def is_lfs_path(self, path):
+        return self.git_manager.get_lfs_matcher().matches(path)
+
+    def is_binary_path(self, path):
+        return os.path.splitext(path)[1].lower() in BINARY_EXTENSIONS or self.is_lfs_path(path)
+
+    # ---- sides ----
+
+    def _blob_side(self, spec):
+        """BlobSide for an object spec (oid, 'HEAD:path', ':path'), None if missing."""
+        info = self.git_manager.get_object_info(spec)
+        if not info or info[1] != 'blob':
+            return None
+        oid, _, size = info
+        if size <= MAX_POINTER_SIZE:
+            _, data = self.git_manager.read_object(oid)
+            pointer = parse_lfs_pointer(data)
+            if pointer:
+                return BlobSide(pointer[1], pointer[0])
+        return BlobSide(size)
+
+    def _worktree_side(self, path):
+        full_path = os.path.join(self.git_manager.repo_path, path)
+        try:
+            size = os.path.getsize(full_path)
+        except OSError:
+            return None
+        if size <= MAX_POINTER_SIZE:
+            # Not smudged yet: the pointer itself is checked out
+            try:
+                with open(full_path, 'rb') as f:
+                    pointer = parse_lfs_pointer(f.read(MAX_POINTER_SIZE + 1))
+                if pointer:
+                    return BlobSide(pointer[1], pointer[0])
+            except OSError:
+                pass
+        return BlobSide(size)
+
+    # ---- locks ----
+
+    def lock_owner(self, path):
+        now = time.time()
+        if now - self._locks_ts >= LOCKS_TTL:
+            self._locks_ts = now
+            # --local reads the locks cached by the last lock/verify, no network round trip
+            success, output = self.git_manager.run_command(['git', 'lfs', 'locks', '--local', '--json'], timeout=10)
+            locks = {}
+            if success and output:
+                try:
+                    for lock in json.loads(output):
+                        owner = lock.get('owner') or {}
+                        locks[lock.get('path', '')] = owner.get('name', '') if isinstance(owner, dict) else str(owner)
+                except (ValueError, AttributeError):
+                    pass
+            self._locks = locks
+        return self._locks.get(path.replace('\\', '/'))
+
+    # ---- summaries ----
+
+    @staticmethod
+    def _format(path, old, new, lfs, lock_owner=None):
+        def side(blob):
+            return None if blob is None else [blob.size, blob.lfs_oid]
+
+        summary = {'lfs': bool(lfs), 'old': side(old), 'new': side(new)}
+        if lock_owner:
+            summary['lock'] = lock_owner
+        return '\n'.join([
+            f"diff --git a/{path} b/{path}",
+            f"Binary files {'a/' + path if old else '/dev/null'} and {'b/' + path if new else '/dev/null'} differ",
+            SUMMARY_TAG + json.dumps(summary, ensure_ascii=False)
+        ])
+
+    def summarize_blobs(self, path, old_oid, new_oid, lfs=None):
+        """Summary for a change between two blob ids (either may be None)."""
+        old = self._blob_side(old_oid) if old_oid else None
+        new = self._blob_side(new_oid) if new_oid else None
+        if lfs is None:
+            lfs = bool((old and old.lfs_oid) or (new and new.lfs_oid)) or self.is_lfs_path(path)
+        return self._format(path, old, new, lfs)
+
+    def summarize_worktree(self, path):
+        """Summary of HEAD (or the index, for new files) against the working tree copy."""
+        git_path = path.replace('\\', '/')
+        old = self._blob_side(f"HEAD:{git_path}") or self._blob_side(f":{git_path}")
+        new = self._worktree_side(path)
+        lfs = bool((old and old.lfs_oid) or (new and new.lfs_oid)) or self.is_lfs_path(git_path)
+        owner = self.lock_owner(git_path) if lfs else None
+        return self._format(git_path, old, new, lfs, owner)
@@ -0,0 +1,527 @@
+"""
+File system watching for repositories.
+
+RepositoryWatcher turns raw change notifications from the worktree and the
+git directory into debounced change sets:
+
+    {'paths': {'Content/Maps/L1.umap'}, 'dirs': {'Content/Maps'},
+     'index': False, 'refs': True, 'full': False, 'gitignore': False,
+     'gitattributes': False}
+
+`paths` holds the changed repository-relative files or directories,
+`dirs` the directories containing them ('' is the repository root), `index` and `refs` tell whether the index or
+HEAD/refs moved, `gitignore` / `gitattributes` whether a .gitignore or
+.gitattributes file changed, and `full` asks for a complete rescan (e.g.
+after the native backend dropped events).
+
+Backends:
+    InotifyBackend   - Linux, inotify through ctypes
+    WindowsBackend   - Windows, recursive ReadDirectoryChangesW
+    PollingBackend   - portable stat snapshots, used by tests and as stand-in
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+# Entries under .git that affect what the UI shows. Everything else in the
+# git directory (objects, logs, locks) is churn and ignored.
+GIT_REF_FILES = ('HEAD', 'packed-refs', 'MERGE_HEAD', 'ORIG_HEAD', 'CHERRY_PICK_HEAD', 'REVERT_HEAD')
+GIT_SKIP_DIRS = ('objects', 'logs', 'lfs', 'hooks', 'info', 'modules', 'worktrees')
+
+
+def resolve_git_dir(repo_path):
+    """Return the git directory of a worktree, following `.git` files."""
+    dot_git = os.path.join(repo_path, '.git')
+    if os.path.isfile(dot_git):
+        try:
+            with open(dot_git, 'r', encoding='utf-8') as f:
+                line = f.readline().strip()
+            if line.startswith('gitdir:'):
+                git_dir = line[len('gitdir:'):].strip()
+                if not os.path.isabs(git_dir):
+                    git_dir = os.path.join(repo_path, git_dir)
+                return os.path.normpath(git_dir)
+        except OSError:
+            pass
+    return dot_git
+
+
+class WatcherBackend:
+    """
+    Base class for change notification sources.
+
+    A backend watches a list of (absolute_dir, prefix) roots and reports
+    changed paths as prefix + '/'-separated path relative to the root.
+    """
+
+    def __init__(self, roots, on_paths, on_overflow, should_skip_dir=None):
+        self.roots = roots
+        self.on_paths = on_paths
+        self.on_overflow = on_overflow
+        self.should_skip_dir = should_skip_dir or (lambda rel: False)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+        self._thread = None
+
+    def _run(self):
+        raise NotImplementedError
+
+
+class PollingBackend(WatcherBackend):
+    """Detects changes by comparing (mtime, size) snapshots of every file."""
+
+    def __init__(self, roots, on_paths, on_overflow, should_skip_dir=None, interval=2.0):
+        super().__init__(roots, on_paths, on_overflow, should_skip_dir)
+        self.interval = interval
+        self._snapshot = None
+
+    def _scan(self):
+        snapshot = {}
+        for root, prefix in self.roots:
+            stack = [(root, prefix.rstrip('/'))]
+            while stack:
+                directory, rel_dir = stack.pop()
+                try:
+                    with os.scandir(directory) as it:
+                        for entry in it:
+                            rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                            try:
+                                if entry.is_dir(follow_symlinks=False):
+                                    if not self.should_skip_dir(rel):
+                                        stack.append((entry.path, rel))
+                                    continue
+                                st = entry.stat(follow_symlinks=False)
+                            except OSError:
+                                continue
+                            snapshot[rel] = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    continue
+        return snapshot
+
+    def poll_once(self):
+        """Scan once and report the paths that changed since the last scan."""
+        snapshot = self._scan()
+        previous = self._snapshot
+        self._snapshot = snapshot
+        if previous is None:
+            return []
+        changed = [p for p, sig in snapshot.items() if previous.get(p) != sig]
+        changed.extend(p for p in previous if p not in snapshot)
+        if changed:
+            self.on_paths(changed)
+        return changed
+
+    def _run(self):
+        self.poll_once()
+        while not self._stop.wait(self.interval):
+            self.poll_once()
+
+
+class InotifyBackend(WatcherBackend):
+    """Linux inotify watches, one per directory, added as directories appear."""
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_EXCL_UNLINK = 0x04000000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+                  IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR | IN_EXCL_UNLINK)
+
+    _libc = None
+
+    @classmethod
+    def available(cls):
+        if not sys.platform.startswith('linux'):
+            return False
+        if cls._libc is None:
+            try:
+                libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+                libc.inotify_init1.argtypes = [ctypes.c_int]
+                libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+                libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+                cls._libc = libc
+            except (OSError, AttributeError):
+                return False
+        return True
+
+    def __init__(self, roots, on_paths, on_overflow, should_skip_dir=None):
+        super().__init__(roots, on_paths, on_overflow, should_skip_dir)
+        self._fd = -1
+        self._watches = {}
+
+    def _add_watch(self, path, rel):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), self.WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err in (errno.ENOSPC, errno.ENOMEM):
+                raise OSError(err, "inotify watch limit reached")
+            return
+        self._watches[wd] = (path, rel)
+
+    def _add_tree(self, path, rel):
+        stack = [(path, rel)]
+        while stack:
+            directory, rel_dir = stack.pop()
+            self._add_watch(directory, rel_dir)
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            child = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                            if not self.should_skip_dir(child):
+                                stack.append((entry.path, child))
+            except OSError:
+                continue
+
+    def start(self):
+        self._fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        try:
+            for root, prefix in self.roots:
+                self._add_tree(root, prefix.rstrip('/'))
+        except OSError:
+            os.close(self._fd)
+            self._fd = -1
+            raise
+        super().start()
+
+    def stop(self):
+        super().stop()
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+        self._watches.clear()
+
+    def _run(self):
+        header = struct.Struct('iIII')
+        while not self._stop.is_set():
+            try:
+                ready, _, _ = select.select([self._fd], [], [], 0.5)
+                if not ready:
+                    continue
+                data = os.read(self._fd, 256 * 1024)
+            except (OSError, ValueError):
+                if self._stop.is_set():
+                    return
+                continue
+
+            changed = []
+            pos = 0
+            while pos + header.size <= len(data):
+                wd, mask, _, length = header.unpack_from(data, pos)
+                name = data[pos + header.size:pos + header.size + length].rstrip(b'\0')
+                pos += header.size + length
+
+                if mask & self.IN_Q_OVERFLOW:
+                    self.on_overflow()
+                    continue
+                if mask & self.IN_IGNORED:
+                    self._watches.pop(wd, None)
+                    continue
+                watch = self._watches.get(wd)
+                if not watch:
+                    continue
+                path, rel_dir = watch
+                name = os.fsdecode(name)
+                rel = f"{rel_dir}/{name}" if rel_dir and name else (name or rel_dir)
+                if mask & self.IN_ISDIR and mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    if not self.should_skip_dir(rel):
+                        try:
+                            self._add_tree(os.path.join(path, name), rel)
+                        except OSError:
+                            self.on_overflow()
+                changed.append(rel)
+            if changed:
+                self.on_paths(changed)
+
+
+class WindowsBackend(WatcherBackend):
+    """One recursive ReadDirectoryChangesW handle per root."""
+
+    FILE_LIST_DIRECTORY = 0x0001
+    FILE_SHARE_ALL = 0x00000001 | 0x00000002 | 0x00000004
+    OPEN_EXISTING = 3
+    FILE_FLAG_BACKUP_SEMANTICS = 0x02000000
+    NOTIFY_FILTER = 0x00000001 | 0x00000002 | 0x00000008 | 0x00000010
+    INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
+    @classmethod
+    def available(cls):
+        return os.name == 'nt'
+
+    def __init__(self, roots, on_paths, on_overflow, should_skip_dir=None):
+        super().__init__(roots, on_paths, on_overflow, should_skip_dir)
+        self._handles = []
+        self._threads = []
+
+    def start(self):
+        from ctypes import wintypes
+        self._kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        self._kernel32.CreateFileW.restype = wintypes.HANDLE
+        self._kernel32.CreateFileW.argtypes = [wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD,
+                                               ctypes.c_void_p, wintypes.DWORD, wintypes.DWORD,
+                                               wintypes.HANDLE]
+        self._kernel32.ReadDirectoryChangesW.argtypes = [wintypes.HANDLE, ctypes.c_void_p, wintypes.DWORD,
+                                                         wintypes.BOOL, wintypes.DWORD,
+                                                         ctypes.POINTER(wintypes.DWORD),
+                                                         ctypes.c_void_p, ctypes.c_void_p]
+        self._kernel32.CancelIoEx.argtypes = [wintypes.HANDLE, ctypes.c_void_p]
+        self._kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+        self._stop.clear()
+        for root, prefix in self.roots:
+            handle = self._kernel32.CreateFileW(root, self.FILE_LIST_DIRECTORY, self.FILE_SHARE_ALL, None,
+                                                self.OPEN_EXISTING, self.FILE_FLAG_BACKUP_SEMANTICS, None)
+            if not handle or handle == self.INVALID_HANDLE_VALUE:
+                self.stop()
+                raise OSError(ctypes.get_last_error(), f"Cannot watch {root}")
+            self._handles.append(handle)
+            thread = threading.Thread(target=self._run_handle, args=(handle, prefix.rstrip('/')),
+                                      name='WindowsBackend', daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def stop(self):
+        self._stop.set()
+        for handle in self._handles:
+            self._kernel32.CancelIoEx(handle, None)
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=2)
+        for handle in self._handles:
+            self._kernel32.CloseHandle(handle)
+        self._handles = []
+        self._threads = []
+
+    def _run_handle(self, handle, prefix):
+        from ctypes import wintypes
+        buffer = ctypes.create_string_buffer(64 * 1024)
+        returned = wintypes.DWORD()
+        while not self._stop.is_set():
+            ok = self._kernel32.ReadDirectoryChangesW(handle, buffer, len(buffer), True, self.NOTIFY_FILTER,
+                                                      ctypes.byref(returned), None, None)
+            if self._stop.is_set():
+                return
+            if not ok:
+                self.on_overflow()
+                time.sleep(1.0)
+                continue
+            if returned.value == 0:
+                # The kernel buffer overflowed and the individual events are lost.
+                self.on_overflow()
+                continue
+
+            raw = buffer.raw[:returned.value]
+            changed = []
+            pos = 0
+            while True:
+                next_offset, _, name_length = struct.unpack_from('<III', raw, pos)
+                name = raw[pos + 12:pos + 12 + name_length].decode('utf-16-le', errors='replace')
+                name = name.replace('\\', '/')
+                changed.append(f"{prefix}/{name}" if prefix else name)
+                if not next_offset:
+                    break
+                pos += next_offset
+            self.on_paths(changed)
+
+
+def create_backend(roots, on_paths, on_overflow, should_skip_dir=None):
+    """Return the best native backend for this platform, or None."""
+    for backend_cls in (WindowsBackend, InotifyBackend):
+        if backend_cls.available():
+            return backend_cls(roots, on_paths, on_overflow, should_skip_dir)
+    return None
+
+
+class RepositoryWatcher:
+    """
+    Watches a repository and reports debounced change sets.
+
+    Usage:
+        watcher = RepositoryWatcher(repo_path, on_change)
+        if watcher.start():
+            ...  # on_change(changes) is called from a background thread
+        watcher.stop()
+
+    Events are collected until the tree has been quiet for `debounce`
+    seconds (but never longer than `max_delay`), then delivered as one
+    change set. `ignored_dirs` holds repository-relative directories that
+    git ignores (e.g. Intermediate/, Saved/); changes under them are dropped.
+    """
+
+    def __init__(self, repo_path, callback, debounce=0.3, max_delay=2.0,
+                 ignored_dirs=None, backend_factory=None):
+        self.repo_path = repo_path
+        self.callback = callback
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.git_dir = resolve_git_dir(repo_path)
+        self.backend_factory = backend_factory or create_backend
+        self.backend = None
+        self._ignored = set()
+        self._lock = threading.Lock()
+        self._pending = None
+        self._first_event = 0.0
+        self._last_event = 0.0
+        self._timer = None
+        self.set_ignored_dirs(ignored_dirs or [])
+
+    def set_ignored_dirs(self, ignored_dirs):
+        self._ignored = {d.replace('\\', '/').strip('/') for d in ignored_dirs if d and d.strip('/')}
+
+    def _is_ignored(self, rel_dir):
+        if not self._ignored or not rel_dir:
+            return False
+        parts = rel_dir.split('/')
+        for i in range(1, len(parts) + 1):
+            if '/'.join(parts[:i]) in self._ignored:
+                return True
+        return False
+
+    def _should_skip_dir(self, rel):
+        if rel == '.git' or rel.startswith('.git/'):
+            sub = rel[5:].split('/', 1)[0]
+            return sub in GIT_SKIP_DIRS
+        return self._is_ignored(rel)
+
+    def _roots(self):
+        roots = [(self.repo_path, '')]
+        inside = os.path.normcase(os.path.abspath(self.git_dir)).startswith(
+            os.path.normcase(os.path.abspath(self.repo_path)) + os.sep)
+        if not inside and os.path.isdir(self.git_dir):
+            roots.append((self.git_dir, '.git'))
+        return roots
+
+    def start(self):
+        """Start watching. Returns False if no backend could be started."""
+        if self.backend:
+            return True
+        backend = self.backend_factory(self._roots(), self._on_paths, self._on_overflow, self._should_skip_dir)
+        if backend is None:
+            return False
+        try:
+            backend.start()
+        except OSError as e:
+            print(f"[WARN] File watcher unavailable for {self.repo_path}: {e}")
+            return False
+        self.backend = backend
+        return True
+
+    def stop(self):
+        if self.backend:
+            self.backend.stop()
+            self.backend = None
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            self._pending = None
+
+    def classify(self, paths):
+        """Turn raw relative paths into a change set (None if nothing relevant)."""
+        changes = {'paths': set(), 'dirs': set(), 'index': False, 'refs': False, 'full': False, 'gitignore': False,
+                   'gitattributes': False}
+        relevant = False
+        for rel in paths:
+            rel = rel.replace('\\', '/').strip('/')
+            if rel == '.git':
+                continue
+            if rel.startswith('.git/'):
+                sub = rel[5:]
+                if sub == 'index':
+                    changes['index'] = True
+                    relevant = True
+                elif sub in GIT_REF_FILES or sub.startswith('refs/'):
+                    if not sub.endswith('.lock'):
+                        changes['refs'] = True
+                        relevant = True
+                continue
+            rel_dir = rel.rsplit('/', 1)[0] if '/' in rel else ''
+            if self._is_ignored(rel) or self._is_ignored(rel_dir):
+                continue
+            if rel == '.gitignore' or rel.endswith('/.gitignore'):
+                changes['gitignore'] = True
+            elif rel == '.gitattributes' or rel.endswith('/.gitattributes'):
+                changes['gitattributes'] = True
+            changes['paths'].add(rel)
+            changes['dirs'].add(rel_dir)
+            relevant = True
+        return changes if relevant else None
+
+    def _merge(self, changes):
+        with self._lock:
+            now = time.monotonic()
+            if self._pending is None:
+                self._pending = changes
+                self._first_event = now
+            else:
+                self._pending['paths'] |= changes['paths']
+                self._pending['dirs'] |= changes['dirs']
+                for key in ('index', 'refs', 'full', 'gitignore', 'gitattributes'):
+                    self._pending[key] = self._pending[key] or changes[key]
+            self._last_event = now
+            if self._timer is None:
+                self._schedule(self.debounce)
+
+    def _schedule(self, delay):
+        self._timer = threading.Timer(delay, self._flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _flush(self):
+        with self._lock:
+            if self._pending is None:
+                self._timer = None
+                return
+            now = time.monotonic()
+            quiet_for = now - self._last_event
+            waited = now - self._first_event
+            if quiet_for < self.debounce and waited < self.max_delay:
+                self._schedule(min(self.debounce - quiet_for, self.max_delay - waited))
+                return
+            changes = self._pending
+            self._pending = None
+            self._timer = None
+        try:
+            self.callback(changes)
+        except Exception as e:
+            print(f"[ERROR] File watcher callback failed: {e}")
+
+    def _on_paths(self, paths):
+        changes = self.classify(paths)
+        if changes:
+            self._merge(changes)
+
+    def _on_overflow(self):
+        self._merge({'paths': set(), 'dirs': set(), 'index': True, 'refs': True, 'full': True, 'gitignore': False,
+                     'gitattributes': True})
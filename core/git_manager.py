@@ -1,9 +1,85 @@
 import subprocess
 import os
 import time
-import fnmatch
+import difflib
 from pathlib import Path
 import re
+from core.object_reader import GitObjectReader
+from core.status_engine import StatusEngine
+from core.lfs_matcher import LFSMatcher
+from core.history_pager import HistoryPager
+from core.diff_cache import DiffEntry, get_diff_cache, is_immutable_revision, repo_key
+from core.diff_classifier import DiffClassifier, format_size, has_binary_marker
+from core.persistent_cache import PersistentCache, KIND_COMMIT, KIND_FILES, KIND_BUNDLE
+from core.job_context import tracked_process, job_cancelled
+from core.tracing import trace_command
+from core.fs_watcher import resolve_git_dir
+
+# Blobs larger than this are diffed by git itself instead of difflib, whose
+# matching can go quadratic on big files.
+INPROCESS_DIFF_LIMIT = 64 * 1024
+# How often ref tips are compared against the persistent cache.
+REF_SYNC_INTERVAL = 10.0
+# Upper bound of commits purged from the persistent cache per rewritten ref.
+MAX_REWRITE_PURGE = 5000
+
+def _plural(count, unit):
+    return f"{count} {unit}" if count == 1 else f"{count} {unit}s"
+
+def _relative_date(timestamp, now=None):
+    """Format a commit time like `git log --date=relative` does."""
+    diff = int((now if now is not None else time.time()) - timestamp)
+    if diff < 0:
+        return "in the future"
+    if diff < 90:
+        return f"{_plural(diff, 'second')} ago"
+    diff = (diff + 30) // 60
+    if diff < 90:
+        return f"{_plural(diff, 'minute')} ago"
+    diff = (diff + 30) // 60
+    if diff < 36:
+        return f"{_plural(diff, 'hour')} ago"
+    diff = (diff + 12) // 24
+    if diff < 14:
+        return f"{_plural(diff, 'day')} ago"
+    if diff < 70:
+        return f"{_plural((diff + 3) // 7, 'week')} ago"
+    if diff < 365:
+        return f"{_plural((diff + 15) // 30, 'month')} ago"
+    if diff < 1825:
+        total_months = (diff * 12 * 2 + 365) // (365 * 2)
+        years, months = divmod(total_months, 12)
+        if months:
+            return f"{_plural(years, 'year')}, {_plural(months, 'month')} ago"
+        return f"{_plural(years, 'year')} ago"
+    return f"{_plural((diff + 183) // 365, 'year')} ago"
+
+_C_ESCAPES = {0x07: b'a', 0x08: b'b', 0x09: b't', 0x0a: b'n', 0x0b: b'v',
+              0x0c: b'f', 0x0d: b'r', 0x22: b'"', 0x5c: b'\\'}
+
+def _quote_path(path):
+    """Quote a path the way git writes it in diff headers with core.quotepath=false."""
+    if not any(byte < 0x20 or byte in (0x22, 0x5c, 0x7f) for byte in path):
+        return path
+    out = bytearray(b'"')
+    for byte in path:
+        if byte in _C_ESCAPES:
+            out += b'\\' + _C_ESCAPES[byte]
+        elif byte < 0x20 or byte == 0x7f:
+            out += b'\\%03o' % byte
+        else:
+            out.append(byte)
+    out += b'"'
+    return bytes(out)
+
+def _split_lines(text):
+    """Split on '\\n' only, as git does, keeping the terminators."""
+    lines = text.split('\n')
+    last = lines.pop()
+    lines = [line + '\n' for line in lines]
+    if last:
+        lines.append(last)
+    return lines
 
 def _is_valid_git_ref(ref):
     if not ref or not isinstance(ref, str):
@@ -21,11 +97,42 @@ class GitManager:
         self.repo_path = None
         self._lfs_cache = []
         self._lfs_cache_ts = 0.0
+        self._lfs_matcher = None
+        self._lfs_matcher_key = None
+        self._git_dirs = None
+        self._attribute_files = None
+        self._reported_attribute_files = set()
+        self._object_reader = None
+        self._persistent_cache = None
+        self._refs_synced_ts = 0.0
+        self.status_engine = StatusEngine(self)
+        self.history_pager = HistoryPager(self)
+        self.diff_classifier = DiffClassifier(self)
         
     def set_repository(self, path):
+        self.close()
         self.repo_path = path
         self._lfs_cache = []
         self._lfs_cache_ts = 0.0
+        self._lfs_matcher = None
+        self._lfs_matcher_key = None
+        self._git_dirs = None
+        self._attribute_files = None
+        self._reported_attribute_files = set()
+        self._refs_synced_ts = 0.0
+        self.status_engine.reset()
+        self.history_pager.reset()
+        self.diff_classifier.reset()
+
+    def close(self):
+        """Stop the long-lived helper processes owned by this manager."""
+        if self._object_reader:
+            self._object_reader.close()
+            self._object_reader = None
+        if self._persistent_cache:
+            self._persistent_cache.close()
+            self._persistent_cache = None
+        self.history_pager.close()
     
     def check_and_remove_lock(self):
         if not self.repo_path:
@@ -40,24 +147,33 @@ class GitManager:
                 return False, f"Failed to remove lock file: {str(e)}"
         return False, "No lock file found"
         
+    def _run_process(self, command, timeout, **kwargs):
+        """
+        subprocess.run() with captured output whose child is killed if the
+        scheduler job running it is cancelled (see core.job_context).
+        """
+        kwargs['cwd'] = self.repo_path
+        if os.name == 'nt':
+            kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW
+        with trace_command(command, self.repo_path) as span:
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, **kwargs)
+            with tracked_process(process):
+                try:
+                    stdout, stderr = process.communicate(timeout=timeout)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    process.communicate()
+                    raise
+            span.exit_code = process.returncode
+            span.bytes_out = len(stdout)
+        return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
+
     def run_command(self, command, timeout=30):
         try:
-            use_shell = isinstance(command, str)
-            
-            kwargs = {
-                'cwd': self.repo_path,
-                'capture_output': True,
-                'text': True,
-                'shell': use_shell,
-                'encoding': 'utf-8',
-                'errors': 'replace',
-                'timeout': timeout
-            }
-            
-            if os.name == 'nt':
-                kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW
-            
-            result = subprocess.run(command, **kwargs)
+            result = self._run_process(command, timeout, shell=isinstance(command, str), text=True,
+                                       encoding='utf-8', errors='replace')
+            if job_cancelled():
+                return False, "Cancelled"
 
             if result.returncode == 0:
                 return True, result.stdout.rstrip()
@@ -70,17 +186,231 @@ class GitManager:
             return False, f"Command timed out after {timeout}s"
         except Exception as e:
             return False, str(e)
-            
+
+    def run_command_raw(self, command, timeout=30):
+        """Like run_command, but return stdout as undecoded bytes (for -z output)."""
+        try:
+            result = self._run_process(command, timeout)
+            if job_cancelled():
+                return False, "Cancelled"
+            if result.returncode == 0:
+                return True, result.stdout
+            return False, result.stderr.decode('utf-8', errors='replace').strip()
+        except subprocess.TimeoutExpired:
+            return False, f"Command timed out after {timeout}s"
+        except Exception as e:
+            return False, str(e)
+
+    # ==================== PERSISTENT CACHE ====================
+
+    def get_persistent_cache(self):
+        """On-disk cache of commit data for the current repository (None without one)."""
+        if not self.repo_path:
+            return None
+        if self._persistent_cache is None or self._persistent_cache.repo_path != self.repo_path:
+            if self._persistent_cache:
+                self._persistent_cache.close()
+            self._persistent_cache = PersistentCache(self.repo_path)
+        return self._persistent_cache if self._persistent_cache.enabled else None
+
+    def _sync_persistent_refs(self, cache):
+        """Purge cached commits that a rewritten ref (rebase, reset, force-push) dropped."""
+        now = time.time()
+        if now - self._refs_synced_ts < REF_SYNC_INTERVAL:
+            return
+        self._refs_synced_ts = now
+        success, output = self.run_command(['git', 'for-each-ref', '--format=%(refname) %(objectname)'])
+        if not success:
+            return
+        refs = {}
+        for line in output.splitlines():
+            name, _, oid = line.rpartition(' ')
+            if name:
+                refs[name] = oid
+        for _, old_oid, new_oid in cache.update_refs(refs):
+            is_ancestor, _ = self.run_command(['git', 'merge-base', '--is-ancestor', old_oid, new_oid])
+            if is_ancestor:
+                continue  # fast-forward, nothing was rewritten
+            success, dropped = self.run_command(
+                ['git', 'rev-list', f'--max-count={MAX_REWRITE_PURGE}', old_oid, f'^{new_oid}'])
+            if success and dropped:
+                cache.delete_commits(dropped.split())
+
+    # ==================== OBJECT METHODS ====================
+
+    def _get_object_reader(self):
+        if not self.repo_path:
+            return None
+        if self._object_reader is None or self._object_reader.repo_path != self.repo_path:
+            if self._object_reader:
+                self._object_reader.close()
+            self._object_reader = GitObjectReader(self.repo_path)
+        return self._object_reader
+
+    def read_object(self, spec):
+        """Read an object through the cat-file co-process. Returns (type, bytes)."""
+        reader = self._get_object_reader()
+        if not reader:
+            return None, None
+        return reader.read(spec)
+
+    def get_object_info(self, spec):
+        """Return (oid, type, size) for an object spec, or None if missing."""
+        reader = self._get_object_reader()
+        if not reader:
+            return None
+        return reader.info(spec)
+
+    def get_file_at_revision(self, revision, file_path):
+        """Return the text of a file at a revision (e.g. the .uproject at HEAD~3)."""
+        if not _is_valid_git_ref(revision):
+            return None
+        file_path = file_path.replace('\\', '/')
+        obj_type, data = self.read_object(f"{revision}:{file_path}")
+        if obj_type != 'blob':
+            return None
+        return data.decode('utf-8', errors='replace')
+
+    def _read_commit_object(self, commit_hash):
+        obj_type, data = self.read_object(commit_hash)
+        if obj_type != 'commit':
+            return None
+        tree = None
+        parents = []
+        for line in data.split(b'\n'):
+            if not line:
+                break
+            if line.startswith(b'tree '):
+                tree = line[5:].decode('ascii')
+            elif line.startswith(b'parent '):
+                parents.append(line[7:].decode('ascii'))
+        return {'tree': tree, 'parents': parents}
+
+    def _read_tree_object(self, tree_oid):
+        entries = {}
+        if not tree_oid:
+            return entries
+        obj_type, data = self.read_object(tree_oid)
+        if obj_type != 'tree':
+            return entries
+        raw_len = len(tree_oid) // 2
+        pos = 0
+        end = len(data)
+        while pos < end:
+            space = data.index(b' ', pos)
+            nul = data.index(b'\0', space)
+            mode = data[pos:space].decode('ascii')
+            name = data[space + 1:nul].decode('utf-8', errors='surrogateescape')
+            oid = data[nul + 1:nul + 1 + raw_len].hex()
+            entries[name] = (mode, oid)
+            pos = nul + 1 + raw_len
+        return entries
+
+    def _diff_trees(self, old_tree, new_tree, prefix=''):
+        """Yield (path, old_mode, old_oid, new_mode, new_oid) for changed blobs."""
+        if old_tree == new_tree:
+            return
+        old_entries = self._read_tree_object(old_tree)
+        new_entries = self._read_tree_object(new_tree)
+        for name in sorted(set(old_entries) | set(new_entries)):
+            old_mode, old_oid = old_entries.get(name, (None, None))
+            new_mode, new_oid = new_entries.get(name, (None, None))
+            if old_oid == new_oid and old_mode == new_mode:
+                continue
+            path = f"{prefix}{name}"
+            old_is_tree = old_mode == '40000'
+            new_is_tree = new_mode == '40000'
+            if old_is_tree or new_is_tree:
+                yield from self._diff_trees(old_oid if old_is_tree else None,
+                                            new_oid if new_is_tree else None,
+                                            f"{path}/")
+                if old_is_tree and new_mode and not new_is_tree:
+                    yield path, None, None, new_mode, new_oid
+                elif new_is_tree and old_mode and not old_is_tree:
+                    yield path, old_mode, old_oid, None, None
+                continue
+            yield path, old_mode, old_oid, new_mode, new_oid
+
+    def _blob_mode(self, tree_oid, path):
+        parts = path.split('/')
+        for name in parts[:-1]:
+            mode, tree_oid = self._read_tree_object(tree_oid).get(name, (None, None))
+            if mode != '40000':
+                return '100644'
+        mode, _ = self._read_tree_object(tree_oid).get(parts[-1], ('100644', None))
+        return mode
+
+    def _format_blob_diff(self, path, old_mode, old_oid, new_mode, new_oid):
+        """Render a git-style unified diff for two blobs read from the co-process."""
+        if old_oid and old_oid == new_oid:
+            # Mode-only change: git prints no index line and no body
+            return '\n'.join([f"diff --git a/{path} b/{path}", f"old mode {old_mode}", f"new mode {new_mode}"])
+        old_data = b''
+        new_data = b''
+        if old_oid:
+            _, old_data = self.read_object(old_oid)
+        if new_oid:
+            _, new_data = self.read_object(new_oid)
+        if old_data is None or new_data is None:
+            return None
+        if len(old_data) > INPROCESS_DIFF_LIMIT or len(new_data) > INPROCESS_DIFF_LIMIT:
+            return None
+
+        header = [f"diff --git a/{path} b/{path}"]
+        if not old_oid:
+            header.append(f"new file mode {new_mode}")
+            header.append(f"index 0000000..{new_oid[:7]}")
+        elif not new_oid:
+            header.append(f"deleted file mode {old_mode}")
+            header.append(f"index {old_oid[:7]}..0000000")
+        elif old_mode != new_mode:
+            header.append(f"old mode {old_mode}")
+            header.append(f"new mode {new_mode}")
+            header.append(f"index {old_oid[:7]}..{new_oid[:7]}")
+        else:
+            header.append(f"index {old_oid[:7]}..{new_oid[:7]} {new_mode}")
+
+        if b'\0' in old_data[:8000] or b'\0' in new_data[:8000]:
+            old_name = f"a/{path}" if old_oid else "/dev/null"
+            new_name = f"b/{path}" if new_oid else "/dev/null"
+            header.append(f"Binary files {old_name} and {new_name} differ")
+            return '\n'.join(header)
+
+        # git terminates file names containing spaces with a tab
+        name_suffix = '\t' if ' ' in path else ''
+        old_lines = _split_lines(old_data.decode('utf-8', errors='replace'))
+        new_lines = _split_lines(new_data.decode('utf-8', errors='replace'))
+        body = list(difflib.unified_diff(
+            old_lines,
+            new_lines,
+            fromfile=f"a/{path}{name_suffix}" if old_oid else "/dev/null",
+            tofile=f"b/{path}{name_suffix}" if new_oid else "/dev/null",
+            lineterm=''
+        ))
+        if not body and old_oid and new_oid and old_mode == new_mode:
+            return ''
+        # Lines keep their '\n'; the one that lacks it gets git's marker
+        lines = body[:2]
+        for line in body[2:]:
+            if line.endswith('\n'):
+                lines.append(line[:-1])
+                continue
+            lines.append(line)
+            if not line.startswith('@@'):
+                lines.append('\\ No newline at end of file')
+        return '\n'.join(header + lines)
+
     def is_git_repository(self, path):
         git_dir = os.path.join(path, '.git')
         return os.path.exists(git_dir)
         
     def get_current_branch(self):
-        summary = self.get_status_summary(include_sizes=False)
-        if summary.get('branch'):
-            return summary['branch']
-        success, output = self.run_command("git branch --show-current")
-        return output if success else "unknown"
+        success, output = self.run_command(['git', 'symbolic-ref', '--short', '-q', 'HEAD'])
+        if success and output:
+            return output
+        # Detached HEAD, reported the same way `git status --branch` does
+        success, _ = self.run_command(['git', 'rev-parse', '--verify', '-q', 'HEAD'])
+        return "HEAD" if success else "unknown"
 
     def get_head_hash(self):
         """Get the full hash of the current HEAD."""
@@ -186,6 +516,22 @@ class GitManager:
     
     def stash_show(self, stash_index='stash@{0}'):
         """Show stash diff"""
+        if re.match(r'^stash@\{\d+\}$', stash_index or ''):
+            stash = self._read_commit_object(stash_index)
+            if stash and stash['parents']:
+                base = self._read_commit_object(stash['parents'][0])
+                if base:
+                    parts = []
+                    for path, old_mode, old_oid, new_mode, new_oid in self._diff_trees(base['tree'], stash['tree']):
+                        diff = self._format_blob_diff(path, old_mode, old_oid, new_mode, new_oid)
+                        if diff is None:
+                            parts = None
+                            break
+                        if diff:
+                            parts.append(diff)
+                    if parts is not None:
+                        return '\n'.join(parts)
+
         success, output = self.run_command(['git', 'stash', 'show', '-p', stash_index])
         return output if success else "No se puede mostrar el stash"
     
@@ -204,6 +550,7 @@ class GitManager:
     
     def resolve_conflict_ours(self, file_path):
         """Resolve conflict using our version (current branch)"""
+        self.status_engine.note_local_change([file_path])
         success, msg = self.run_command(['git', 'checkout', '--ours', file_path])
         if success:
             return self.run_command(['git', 'add', file_path])
@@ -211,6 +558,7 @@ class GitManager:
     
     def resolve_conflict_theirs(self, file_path):
         """Resolve conflict using their version (incoming branch)"""
+        self.status_engine.note_local_change([file_path])
         success, msg = self.run_command(['git', 'checkout', '--theirs', file_path])
         if success:
             return self.run_command(['git', 'add', file_path])
@@ -218,6 +566,7 @@ class GitManager:
     
     def mark_resolved(self, file_path):
         """Mark a file as resolved after manual edit"""
+        self.status_engine.note_local_change([file_path])
         return self.run_command(['git', 'add', file_path])
     
     def abort_merge(self):
@@ -234,134 +583,51 @@ class GitManager:
         return os.path.exists(merge_head)
         
     def get_status(self):
-        summary = self.get_status_summary(include_sizes=False)
+        summary = self.status_engine.summary() or self.get_status_summary(include_sizes=False)
         result = {}
         for entry in summary.get('entries', []):
-            result[entry['path']] = entry['state']
+            result[entry.path] = entry.state
         return result
     
-    def get_status_summary(self, include_sizes=False, size_threshold=100 * 1024 * 1024):
-        if not self.repo_path:
-            return {
-                'branch': 'unknown',
-                'ahead': 0,
-                'behind': 0,
-                'entries': [],
-                'large_files': [],
-                'error': 'repository path not set'
-            }
-        
-        success, output = self.run_command([
-            "git",
-            "-c",
-            "core.quotepath=false",
-            "status",
-            "--branch",
-            "--porcelain=v1",
-            "-uall"
-        ], timeout=10)
-        
-        if not success or output is None:
-            return {
-                'branch': 'unknown',
-                'ahead': 0,
-                'behind': 0,
-                'entries': [],
-                'large_files': [],
-                'error': output or 'git status failed'
-            }
-
-        branch = 'unknown'
-        ahead = 0
-        behind = 0
-        entries = []
-        large_files = []
-        lfs_patterns = []
-
-        if include_sizes:
-            lfs_patterns = self.get_lfs_tracked_patterns()
-
-        lines = output.split('\n')
-        for line in lines:
-            if not line:
-                continue
-            if line.startswith('##'):
-                status_line = line[2:].strip()
-                branch_part = status_line
-                if '...' in status_line:
-                    branch_part = status_line.split('...')[0]
-                if branch_part:
-                    branch = branch_part.split()[0]
-
-                meta_start = status_line.find('[')
-                meta_end = status_line.find(']')
-                if meta_start != -1 and meta_end != -1 and meta_end > meta_start:
-                    meta = status_line[meta_start + 1:meta_end]
-                    ahead_match = re.search(r'ahead (\d+)', meta)
-                    behind_match = re.search(r'behind (\d+)', meta)
-                    if ahead_match:
-                        ahead = int(ahead_match.group(1))
-                    if behind_match:
-                        behind = int(behind_match.group(1))
-                continue
-
-            if len(line) <= 3:
-                continue
-
-            state = line[:2].strip()
-            file_path = line[3:]
-
-            if file_path.startswith('"') and file_path.endswith('"'):
-                file_path = file_path[1:-1]
-                file_path = file_path.replace('\\"', '"').replace('\\\\', '\\')
+    def get_status_summary(self, include_sizes=False, size_threshold=100 * 1024 * 1024, paths=None):
+        """
+        Return {branch, head, upstream, ahead, behind, entries, large_files, error}.
 
-            if '->' in file_path:
-                parts = file_path.split(' -> ')
-                if len(parts) == 2:
-                    file_path = parts[1]
+        entries are StatusEntry records (see core/status_parser.py); head
+        is the HEAD commit id, or None on an unborn branch.
 
-            is_large = False
-            if include_sizes and not state.startswith('D'):
-                full_path = os.path.join(self.repo_path, file_path)
-                if os.path.exists(full_path) and not os.path.isdir(full_path):
-                    try:
-                        size = os.path.getsize(full_path)
-                        if size > size_threshold:
-                            tracked = False
-                            for pattern in lfs_patterns:
-                                if fnmatch.fnmatch(file_path, pattern) or fnmatch.fnmatch(os.path.basename(file_path), pattern):
-                                    tracked = True
-                                    break
-                            if not tracked:
-                                is_large = True
-                    except Exception:
-                        pass
-
-            entries.append({
-                'path': file_path,
-                'state': state or '??',
-                'large': is_large
-            })
+        With paths=None the whole tree is rescanned. With a set of files or
+        directories only those are re-queried and merged into the last
+        snapshot kept by the status engine.
+        """
+        return self.status_engine.refresh(paths, include_sizes=include_sizes, size_threshold=size_threshold)
 
-            if is_large:
-                large_files.append(file_path)
+    def get_ignored_directories(self):
+        """Return repository-relative directories that git ignores as a whole."""
+        if not self.repo_path:
+            return []
+        success, output = self.run_command([
+            'git', 'ls-files', '--others', '--ignored', '--exclude-standard', '--directory', '-z'
+        ], timeout=60)
+        if not success or not output:
+            return []
+        return [p.rstrip('/') for p in output.split('\0') if p.endswith('/')]
 
-        return {
-            'branch': branch,
-            'ahead': ahead,
-            'behind': behind,
-            'entries': entries,
-            'large_files': large_files,
-            'error': None
-        }
-        
     def get_file_diff(self, file_path):
-        success, output = self.run_command(f"git diff HEAD -- \"{file_path}\"")
+        # Binary/LFS files get a size/oid/lock summary, without running git diff
+        if self.repo_path and self.diff_classifier.is_binary_path(file_path):
+            return self.diff_classifier.summarize_worktree(file_path)
+
+        success, output = self.run_command(['git', 'diff', 'HEAD', '--', file_path])
         if success and output:
+            if has_binary_marker(output):
+                return self.diff_classifier.summarize_worktree(file_path)
             return output
             
-        success, output = self.run_command(f"git diff --cached -- \"{file_path}\"")
+        success, output = self.run_command(['git', 'diff', '--cached', '--', file_path])
         if success and output:
+            if has_binary_marker(output):
+                return self.diff_classifier.summarize_worktree(file_path)
             return output
             
         return "No hay diferencias para mostrar"
@@ -392,22 +658,23 @@ class GitManager:
                 if os.name == 'nt':
                     kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW
 
-                process = subprocess.Popen(
-                    ['git', 'push', '--progress'],
-                    **kwargs
-                )
-                
-                output_lines = []
-                while True:
-                    line = process.stdout.readline() if process.stdout else ''
-                    if not line and process.poll() is not None:
-                        break
-                    if line:
-                        output_lines.append(line)
-                        progress_callback(line.strip())
-                
-                process.wait()
-                full_output = ''.join(output_lines)
+                command = ['git', 'push', '--progress']
+                with trace_command(command, self.repo_path) as span:
+                    process = subprocess.Popen(command, **kwargs)
+                    
+                    output_lines = []
+                    while True:
+                        line = process.stdout.readline() if process.stdout else ''
+                        if not line and process.poll() is not None:
+                            break
+                        if line:
+                            output_lines.append(line)
+                            progress_callback(line.strip())
+                    
+                    process.wait()
+                    full_output = ''.join(output_lines)
+                    span.exit_code = process.returncode
+                    span.bytes_out = len(full_output)
                 
                 # Check for "no upstream branch" error
                 if process.returncode != 0 and "no upstream branch" in full_output:
@@ -448,6 +715,10 @@ class GitManager:
         
         return info
         
+    def relative_date(self, timestamp):
+        """Translated `git log --date=relative` text for a commit time."""
+        return self.translate_relative_date(_relative_date(timestamp))
+
     def translate_relative_date(self, date_str):
         translations = {
             'second': 'segundo',
@@ -477,6 +748,12 @@ class GitManager:
         return result
     
     def get_commit_history(self, limit=20):
+        cache = self.get_persistent_cache()
+        if cache:
+            commits = self._get_cached_commit_history(cache, limit)
+            if commits is not None:
+                return commits
+
         success, result = self.run_command([
             'git',
             'log',
@@ -510,33 +787,264 @@ class GitManager:
             })
         
         return commits
-        
+
+    def _get_cached_commit_history(self, cache, limit):
+        """
+        History from the persistent cache: only the (cheap) commit ids are
+        listed by git, metadata is formatted just for commits not seen before.
+        """
+        success, output = self.run_command(['git', 'rev-list', '--all', '-n', str(limit)])
+        if not success:
+            return None
+        hashes = output.split()
+        known = self.get_commit_metadata(hashes)
+        if known is None:
+            return None
+
+        commits = []
+        for commit_hash in hashes:
+            meta = known.get(commit_hash)
+            if not meta:
+                continue
+            author, email, timestamp, message = meta
+            commits.append({
+                'hash': commit_hash,
+                'author': author,
+                'email': email,
+                'date': self.relative_date(timestamp),
+                'message': message
+            })
+        return commits
+
+    def get_commit_metadata(self, hashes):
+        """
+        Return {hash: [author, email, timestamp, message]} for full commit ids.
+
+        Commits found in the persistent cache cost nothing; the rest are
+        formatted by one `git show --no-walk` and stored. None if git fails.
+        """
+        cache = self.get_persistent_cache()
+        known = {}
+        if cache:
+            self._sync_persistent_refs(cache)
+            known = cache.get_many(KIND_COMMIT, hashes)
+        missing = [h for h in hashes if h not in known]
+        if not missing:
+            return known
+        success, raw = self.run_command_raw([
+            'git', 'show', '-s', '--no-walk=unsorted', '--no-color', '-z',
+            '--pretty=format:%H%x1f%an%x1f%ae%x1f%ct%x1f%s', *missing
+        ], timeout=60)
+        if not success:
+            return None
+        fetched = {}
+        for record in raw.split(b'\0'):
+            parts = record.strip(b'\n').decode('utf-8', errors='replace').split('\x1f', 4)
+            if len(parts) == 5:
+                commit_hash, author, email, timestamp, message = parts
+                fetched[commit_hash] = [author, email, int(timestamp or 0), message]
+        if cache:
+            cache.put_many(KIND_COMMIT, fetched)
+        known.update(fetched)
+        return known
+
     def get_commit_diff(self, commit_hash):
         if not _is_valid_git_ref(commit_hash):
             return "Invalid commit hash"
-        success, output = self.run_command(f"git show {commit_hash}")
+        success, output = self.run_command(['git', 'show', commit_hash])
         return output if success else "No se pudo obtener el diff"
     
     def get_commit_files(self, commit_hash):
         if not _is_valid_git_ref(commit_hash):
             return []
-        success, output = self.run_command(f"git show --name-status --format= {commit_hash}")
+        cache = self.get_persistent_cache() if is_immutable_revision(commit_hash) else None
+        if cache:
+            # A commit already shown in the history has its whole bundle cached
+            bundle = self._get_cached_bundle(commit_hash)
+            if bundle is not None:
+                return [{'status': entry.status, 'path': path} for path, entry in bundle.items()]
+            files = cache.get(KIND_FILES, commit_hash)
+            if files is not None:
+                return files
+        success, output = self.run_command_raw(['git', 'show', '--name-status', '--format=', '-z', commit_hash])
         if not success:
             return []
         files = []
-        for line in output.strip().split('\n'):
-            if not line.strip():
-                continue
-            parts = line.split('\t', 1)
-            if len(parts) == 2:
-                status, path = parts
-                files.append({'status': status[0], 'path': path})
+        fields = output.lstrip(b'\n').decode('utf-8', errors='replace').split('\0')
+        index = 0
+        while index + 1 < len(fields):
+            status = fields[index]
+            # Renames and copies list the old path before the new one
+            index += 3 if status[:1] in ('R', 'C') else 2
+            if status and index <= len(fields):
+                files.append({'status': status[0], 'path': fields[index - 1]})
+        if cache:
+            cache.put(KIND_FILES, commit_hash, files)
         return files
     
+    def get_commit_diff_bundle(self, commit_hash):
+        """
+        Load every file of a commit with a single `git show` process.
+
+        Returns {path: DiffEntry(status, diff, old_path)} in git's output
+        order. Merge commits are diffed against their first parent. Bundles
+        of full commit ids are served from the shared diff cache.
+        """
+        if not _is_valid_git_ref(commit_hash) or not self.repo_path:
+            return {}
+        cacheable = is_immutable_revision(commit_hash)
+        if cacheable:
+            cached = self._get_cached_bundle(commit_hash)
+            if cached is not None:
+                return cached
+        command = [
+            'git', '-c', 'core.quotepath=false', 'show',
+            '--format=', '--raw', '--no-abbrev', '--patch', '-z', '--no-color',
+            '--no-ext-diff', '-m', '--first-parent', commit_hash
+        ]
+        with trace_command(command, self.repo_path) as span:
+            try:
+                process = self._open_process(command)
+            except Exception:
+                return {}
+            try:
+                # A superseded fetch kills `git show`; the truncated bundle is discarded below
+                with tracked_process(process):
+                    bundle = self._parse_diff_bundle(process.stdout)
+            finally:
+                process.stdout.close()
+                process.wait()
+            span.exit_code = process.returncode
+            span.bytes_out = sum(len(entry.diff) for entry in bundle.values())
+        if process.returncode != 0 or job_cancelled():
+            return {}
+        if cacheable:
+            get_diff_cache().put_bundle(repo_key(self.repo_path), commit_hash, bundle)
+            cache = self.get_persistent_cache()
+            if cache:
+                cache.put(KIND_BUNDLE, commit_hash, [[path, *entry] for path, entry in bundle.items()])
+        return bundle
+
+    def _get_cached_bundle(self, commit_hash):
+        """Bundle from the in-memory diff cache, else from disk (promoted to memory)."""
+        key = repo_key(self.repo_path)
+        bundle = get_diff_cache().get_bundle(key, commit_hash)
+        if bundle is not None:
+            return bundle
+        cache = self.get_persistent_cache()
+        stored = cache.get(KIND_BUNDLE, commit_hash) if cache else None
+        if stored is None:
+            return None
+        bundle = {path: DiffEntry(status, diff, old_path) for path, status, diff, old_path in stored}
+        get_diff_cache().put_bundle(key, commit_hash, bundle)
+        return bundle
+
+    def _open_process(self, command):
+        kwargs = {
+            'cwd': self.repo_path,
+            'stdout': subprocess.PIPE,
+            'stderr': subprocess.DEVNULL
+        }
+        if os.name == 'nt':
+            kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW
+        return subprocess.Popen(command, **kwargs)
+
+    @staticmethod
+    def _read_nul_field(stream):
+        chunks = []
+        while True:
+            buf = stream.peek(65536)
+            if not buf:
+                return b''.join(chunks) if chunks else None
+            idx = buf.find(b'\0')
+            if idx >= 0:
+                chunks.append(stream.read(idx + 1)[:-1])
+                return b''.join(chunks)
+            chunks.append(stream.read(len(buf)))
+
+    def _parse_diff_bundle(self, stream):
+        """Stream-parse `git show --raw --patch -z` output in one pass."""
+        files = []
+        while True:
+            field = self._read_nul_field(stream)
+            if not field or not field.startswith(b':'):
+                # An empty field separates the raw records from the patches.
+                break
+            # :old_mode new_mode old_oid new_oid status
+            parts = field[1:].split()
+            status = parts[-1].decode('ascii', errors='replace')
+            old_oid = parts[2].decode('ascii', errors='replace') if len(parts) >= 5 else None
+            new_oid = parts[3].decode('ascii', errors='replace') if len(parts) >= 5 else None
+            old_path = self._read_nul_field(stream) or b''
+            new_path = old_path
+            if status[:1] in ('R', 'C'):
+                new_path = self._read_nul_field(stream) or b''
+            files.append((
+                status[:1],
+                old_path,
+                new_path,
+                None if not old_oid or old_oid.strip('0') == '' else old_oid,
+                None if not new_oid or new_oid.strip('0') == '' else new_oid
+            ))
+
+        # Patches are matched by their header: a typechange emits two
+        # sections (delete + add) for one raw record, so positions drift.
+        patches = {}
+        current = None
+        for line in stream:
+            if line.startswith(b'diff --git '):
+                current = patches.setdefault(line.rstrip(b'\n'), [])
+                current.append(line)
+            elif current is not None:
+                current.append(line)
+
+        bundle = {}
+        for status, old_path, new_path, old_oid, new_oid in files:
+            header = b'diff --git ' + _quote_path(b'a/' + old_path) + b' ' + _quote_path(b'b/' + new_path)
+            diff = b''.join(patches.get(header, ())).decode('utf-8', errors='replace').rstrip('\n')
+            old_path = old_path.decode('utf-8', errors='replace')
+            new_path = new_path.decode('utf-8', errors='replace')
+            if (old_oid or new_oid) and (has_binary_marker(diff) or self.diff_classifier.is_binary_path(new_path)):
+                diff = self.diff_classifier.summarize_blobs(new_path, old_oid, new_oid)
+            bundle[new_path] = DiffEntry(status, diff, old_path if old_path != new_path else None)
+        return bundle
+
     def get_commit_file_diff(self, commit_hash, file_path):
         if not _is_valid_git_ref(commit_hash):
             return ""
-        success, output = self.run_command(f"git show {commit_hash} -- \"{file_path}\"")
+        if self.repo_path and is_immutable_revision(commit_hash):
+            git_path = file_path.replace('\\', '/')
+            cached = get_diff_cache().get(repo_key(self.repo_path), commit_hash, git_path)
+            if cached is None:
+                bundle = self._get_cached_bundle(commit_hash)
+                cached = bundle.get(git_path) if bundle else None
+            if cached is not None:
+                return cached.diff
+        commit = self._read_commit_object(commit_hash)
+        if commit is not None:
+            git_path = file_path.replace('\\', '/')
+            new_info = self.get_object_info(f"{commit_hash}:{git_path}")
+            old_info = None
+            if commit['parents']:
+                old_info = self.get_object_info(f"{commit['parents'][0]}:{git_path}")
+            new_oid = new_info[0] if new_info and new_info[1] == 'blob' else None
+            old_oid = old_info[0] if old_info and old_info[1] == 'blob' else None
+            if not new_oid and not old_oid:
+                return ""
+            if self.diff_classifier.is_binary_path(git_path):
+                return self.diff_classifier.summarize_blobs(git_path, old_oid, new_oid)
+            new_mode = self._blob_mode(commit['tree'], git_path) if new_oid else None
+            old_mode = None
+            if old_oid:
+                parent = self._read_commit_object(commit['parents'][0])
+                old_mode = self._blob_mode(parent['tree'] if parent else None, git_path)
+            diff = self._format_blob_diff(git_path, old_mode, old_oid, new_mode, new_oid)
+            if diff is not None:
+                if has_binary_marker(diff):
+                    return self.diff_classifier.summarize_blobs(git_path, old_oid, new_oid)
+                return diff
+
+        success, output = self.run_command(['git', 'show', commit_hash, '--', file_path])
         if not success:
             return ""
         lines = output.split('\n')
@@ -588,22 +1096,23 @@ class GitManager:
                 if os.name == 'nt':
                     kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW
                     
-                process = subprocess.Popen(
-                    ['git', 'clone', '--progress', url, target_path],
-                    **kwargs
-                )
-                
-                output_lines = []
-                while True:
-                    line = process.stdout.readline() if process.stdout else ''
-                    if not line and process.poll() is not None:
-                        break
-                    if line:
-                        output_lines.append(line)
-                        if progress_callback:
-                            progress_callback(line.strip())
-                
-                process.wait()
+                command = ['git', 'clone', '--progress', url, target_path]
+                with trace_command(command, target_path) as span:
+                    process = subprocess.Popen(command, **kwargs)
+                    
+                    output_lines = []
+                    while True:
+                        line = process.stdout.readline() if process.stdout else ''
+                        if not line and process.poll() is not None:
+                            break
+                        if line:
+                            output_lines.append(line)
+                            if progress_callback:
+                                progress_callback(line.strip())
+                    
+                    process.wait()
+                    span.exit_code = process.returncode
+                    span.bytes_out = sum(len(line) for line in output_lines)
                 
                 if process.returncode == 0:
                     return True, target_path
@@ -619,10 +1128,11 @@ class GitManager:
                 if os.name == 'nt':
                     kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW
                     
-                result = subprocess.run(
-                    ['git', 'clone', url, target_path],
-                    **kwargs
-                )
+                command = ['git', 'clone', url, target_path]
+                with trace_command(command, target_path) as span:
+                    result = subprocess.run(command, **kwargs)
+                    span.exit_code = result.returncode
+                    span.bytes_out = len(result.stdout or '')
                 
                 if result.returncode == 0:
                     return True, target_path
@@ -748,6 +1258,7 @@ class GitManager:
 
         self._lfs_cache = []
         self._lfs_cache_ts = 0.0
+        self.invalidate_lfs_matcher()
         return True, "Archivos configurados correctamente"
         
     def lfs_pull(self):
@@ -792,6 +1303,67 @@ class GitManager:
         self._lfs_cache_ts = now
         return patterns
 
+    def get_git_dirs(self):
+        """
+        Return (git_dir, common_dir) as absolute paths. They differ in linked
+        worktrees, and in worktrees and submodules `.git` is a file, so they
+        are asked from git once per repository.
+        """
+        if self._git_dirs is None:
+            success, output = self.run_command(['git', 'rev-parse', '--git-dir', '--git-common-dir'], timeout=10)
+            lines = output.splitlines() if success else []
+            if len(lines) != 2:
+                # Not cached: a cancelled or failing call is retried next time
+                git_dir = resolve_git_dir(self.repo_path)
+                return git_dir, git_dir
+            self._git_dirs = tuple(os.path.normpath(os.path.join(self.repo_path, line)) for line in lines)
+        return self._git_dirs
+
+    def get_lfs_matcher(self):
+        """
+        Return an LFSMatcher for the current .gitattributes rules.
+
+        The attribute files are listed from the index and the matcher is
+        rebuilt only when the index or `info/attributes` changes, or after
+        invalidate_lfs_matcher() (the file watcher reports .gitattributes
+        edits); otherwise this costs two stat calls.
+        """
+        if not self.repo_path:
+            return LFSMatcher([])
+
+        git_dir, common_dir = self.get_git_dirs()
+        key = []
+        for path in (os.path.join(git_dir, 'index'), os.path.join(common_dir, 'info', 'attributes')):
+            try:
+                st = os.stat(path)
+                key.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                key.append(None)
+        key = tuple(key)
+        if self._lfs_matcher is not None and key == self._lfs_matcher_key:
+            return self._lfs_matcher
+
+        success, output = self.run_command_raw([
+            'git', 'ls-files', '-z', '--cached', '--', ':(glob)**/.gitattributes'
+        ], timeout=10)
+        files = {'.gitattributes'} | self._reported_attribute_files
+        if success and output:
+            files.update(p.decode('utf-8', errors='replace') for p in output.split(b'\0') if p)
+        self._attribute_files = sorted(files)
+        self._lfs_matcher = LFSMatcher.from_repository(self.repo_path, self._attribute_files, common_dir)
+        self._lfs_matcher_key = key
+        return self._lfs_matcher
+
+    def invalidate_lfs_matcher(self, paths=None):
+        """
+        Rebuild the LFS matcher on next use. `paths` are the changed
+        .gitattributes files, read even before they are added to the index.
+        """
+        for path in paths or ():
+            if path == '.gitattributes' or path.endswith('/.gitattributes'):
+                self._reported_attribute_files.add(path)
+        self._lfs_matcher = None
+
     def get_lfs_locks(self):
         if not self.repo_path:
             return []
@@ -808,12 +1380,12 @@ class GitManager:
             return []
 
     def lfs_lock_file(self, file_path):
-        return self.run_command(f"git lfs lock \"{file_path}\"")
+        return self.run_command(['git', 'lfs', 'lock', file_path])
 
     def lfs_unlock_file(self, file_path, force=False):
-        cmd = f"git lfs unlock \"{file_path}\""
+        cmd = ['git', 'lfs', 'unlock', file_path]
         if force:
-            cmd += " --force"
+            cmd.append('--force')
         return self.run_command(cmd)
 
     def lfs_prune(self):
@@ -834,11 +1406,7 @@ class GitManager:
         return total_size
 
     def format_size(self, size_bytes):
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.2f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.2f} PB"
+        return format_size(size_bytes)
 
     def add_to_gitignore(self, file_path):
         if not self.repo_path:
@@ -860,6 +1428,7 @@ class GitManager:
         if not files:
             return True, "No files to stage"
         
+        self.status_engine.note_local_change(files if isinstance(files, list) else [files])
         if isinstance(files, list):
             chunk_size = 50
             for i in range(0, len(files), chunk_size):
@@ -876,12 +1445,14 @@ class GitManager:
         return self.run_command(['git', 'reset'])
     
     def unstage_file(self, file_path):
+        self.status_engine.note_local_change([file_path])
         return self.run_command(['git', 'reset', 'HEAD', '--', file_path])
         
     def commit(self, message):
         return self.run_command(['git', 'commit', '-m', message])
 
     def discard_file(self, file_path):
+        self.status_engine.note_local_change([file_path])
         success, output = self.run_command(["git", "ls-files", "--error-unmatch", file_path])
         is_tracked = success
         
@@ -913,5 +1484,5 @@ class GitManager:
         return self.stage_files(file_path)
 
     def get_ahead_behind_count(self):
-        summary = self.get_status_summary(include_sizes=False)
+        summary = self.status_engine.summary() or self.get_status_summary(include_sizes=False)
         return summary.get('ahead', 0), summary.get('behind', 0)
@@ -1,11 +1,13 @@
 """
-GitWorker - Background thread for Git operations.
+GitWorker - Background Git operations.
 
-This module provides a QThread-based worker to run Git operations
-without blocking the UI.
+This module provides a worker that runs Git operations on the shared job
+scheduler without blocking the UI and reports back through Qt signals.
 """
 
-from PyQt6.QtCore import QThread, QObject, pyqtSignal
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from core.job_scheduler import get_job_scheduler, PRIORITY_INTERACTIVE
 
 
 class GitOperationSignals(QObject):
@@ -16,17 +18,18 @@ class GitOperationSignals(QObject):
     error = pyqtSignal(str)
 
 
-class GitWorker(QThread):
+class GitWorker(QObject):
     """
-    Worker thread for running Git operations asynchronously.
+    Runs a Git operation asynchronously on the shared job scheduler.
     
     Usage:
-        worker = GitWorker(git_manager.push)
+        worker = GitWorker(git_manager.push, repo=git_manager.repo_path)
         worker.signals.finished.connect(on_push_finished)
         worker.start()
     """
     
-    def __init__(self, operation, *args, parent=None, progress_callback=None, **kwargs):
+    def __init__(self, operation, *args, parent=None, progress_callback=None,
+                 priority=PRIORITY_INTERACTIVE, repo=None, **kwargs):
         """
         Initialize the worker.
         
@@ -35,6 +38,8 @@ class GitWorker(QThread):
             *args: Arguments to pass to the operation
             parent: Parent QObject for proper cleanup
             progress_callback: If True, pass a progress callback to the operation
+            priority: Scheduler priority (user-triggered operations are interactive)
+            repo: Repository path, counted against the per-repo concurrency limit
             **kwargs: Keyword arguments to pass to the operation
         """
         super().__init__(parent)
@@ -43,9 +48,26 @@ class GitWorker(QThread):
         self.kwargs = kwargs
         self.signals = GitOperationSignals()
         self._use_progress_callback = progress_callback
+        self.priority = priority
+        self.repo = repo
+        self.job = None
+    
+    def start(self):
+        """Schedule the operation."""
+        # Never killed halfway: a commit or pull interrupted by a tab close could leave the index locked
+        self.job = get_job_scheduler().submit(self.run, priority=self.priority, repo=self.repo,
+                                              name=getattr(self.operation, '__name__', 'git-operation'),
+                                              terminate_on_cancel=False)
+    
+    def isRunning(self):
+        return self.job is not None and not self.job.done()
+    
+    def cancel(self):
+        """Drop the operation if it has not started yet."""
+        return self.job is not None and self.job.cancel()
         
     def run(self):
-        """Execute the Git operation in a background thread."""
+        """Execute the Git operation (on a scheduler worker thread)."""
         self.signals.started.emit()
         
         try:
@@ -64,25 +86,25 @@ class GitPullWorker(GitWorker):
     """Specialized worker for pull operations."""
     
     def __init__(self, git_manager, parent=None):
-        super().__init__(git_manager.pull, parent=parent)
+        super().__init__(git_manager.pull, parent=parent, repo=git_manager.repo_path)
 
 
 class GitPushWorker(GitWorker):
     """Specialized worker for push operations with progress."""
     
     def __init__(self, git_manager, parent=None):
-        super().__init__(git_manager.push, parent=parent, progress_callback=True)
+        super().__init__(git_manager.push, parent=parent, progress_callback=True, repo=git_manager.repo_path)
 
 
 class GitFetchWorker(GitWorker):
     """Specialized worker for fetch operations."""
     
     def __init__(self, git_manager, parent=None):
-        super().__init__(git_manager.fetch, parent=parent)
+        super().__init__(git_manager.fetch, parent=parent, repo=git_manager.repo_path)
 
 
 class GitCommitWorker(GitWorker):
     """Specialized worker for commit operations."""
     
     def __init__(self, git_manager, message, parent=None):
-        super().__init__(git_manager.commit, message, parent=parent)
+        super().__init__(git_manager.commit, message, parent=parent, repo=git_manager.repo_path)
@@ -0,0 +1,162 @@
+"""
+GraphLayout - Incremental lane assignment for the commit graph.
+
+Commits are fed in history order (children before parents) as
+(hash, parents) pairs. Each commit gets a lane (column); every lane waits
+for the next commit it leads to. A commit takes over the leftmost lane
+waiting for it, lanes that also waited for it converge into it (fork
+points), its first parent continues in its lane and every other parent
+either joins the lane already waiting for it or opens a new one (merges).
+Freed lanes are reused, leftmost first.
+
+Processing is strictly forward, so new pages extend the layout without
+touching earlier rows: each commit costs O(lanes). The whole state is a
+few small lists, which lets the history pager keep a snapshot at every
+page boundary and lay out any page from its snapshot alone.
+"""
+
+import heapq
+
+
+class GraphRow:
+    """
+    Layout of one commit row.
+
+    column  lane of the commit's node
+    color   color index of the node's lane
+    edges   [(from_lane, to_lane, color)] segments from the previous row into this row
+    width   number of lanes in use at this row (for sizing the graph column)
+    """
+    __slots__ = ('column', 'color', 'edges', 'width')
+
+    def __init__(self, column, color, edges, width):
+        self.column = column
+        self.color = color
+        self.edges = edges
+        self.width = width
+
+
+class LayoutState:
+    """Snapshot of the lane state between two rows."""
+    __slots__ = ('lanes', 'colors', 'sources', 'next_color')
+
+    def __init__(self, lanes=None, colors=None, sources=None, next_color=0):
+        self.lanes = lanes if lanes is not None else []        # hash each lane waits for, or None
+        self.colors = colors if colors is not None else []     # color index per lane
+        self.sources = sources if sources is not None else []  # (from_lane, lane, is_new) opened by the last row
+        self.next_color = next_color
+
+    def copy(self):
+        return LayoutState(list(self.lanes), list(self.colors), list(self.sources), self.next_color)
+
+
+class GraphLayout:
+    """
+    Lane layout engine.
+
+    Usage:
+        layout = GraphLayout()
+        rows = layout.add([(commit_hash, [parent, ...]), ...])   # one GraphRow per commit
+        snapshot = layout.snapshot()                              # resume point
+        layout = GraphLayout(snapshot)                            # continue from there
+    """
+
+    def __init__(self, state=None):
+        state = state.copy() if state is not None else LayoutState()
+        self._lanes = state.lanes
+        self._colors = state.colors
+        self._sources = state.sources
+        self._next_color = state.next_color
+        self._waiting = {}
+        self._free = []
+        for lane, commit_hash in enumerate(self._lanes):
+            if commit_hash is None:
+                self._free.append(lane)
+            else:
+                self._waiting.setdefault(commit_hash, []).append(lane)
+        heapq.heapify(self._free)
+
+    def snapshot(self):
+        return LayoutState(list(self._lanes), list(self._colors), list(self._sources), self._next_color)
+
+    def _new_color(self):
+        color = self._next_color
+        self._next_color += 1
+        return color
+
+    def _take_lane(self):
+        """Return the leftmost free lane index, growing the lane list if needed."""
+        while self._free:
+            lane = heapq.heappop(self._free)
+            if lane < len(self._lanes) and self._lanes[lane] is None:
+                return lane
+        self._lanes.append(None)
+        self._colors.append(0)
+        return len(self._lanes) - 1
+
+    def _assign(self, lane, commit_hash, color):
+        self._lanes[lane] = commit_hash
+        self._colors[lane] = color
+        self._waiting.setdefault(commit_hash, []).append(lane)
+
+    def _release(self, lane):
+        self._lanes[lane] = None
+        heapq.heappush(self._free, lane)
+
+    def _trim(self):
+        while self._lanes and self._lanes[-1] is None:
+            self._lanes.pop()
+            self._colors.pop()
+
+    def add_one(self, commit_hash, parents):
+        waiting = self._waiting.pop(commit_hash, None)
+        if waiting:
+            column = min(waiting)
+            color = self._colors[column]
+        else:
+            column = self._take_lane()
+            color = self._new_color()
+
+        # Segments from the previous row into this one: every open lane
+        # continues straight down, except lanes waiting for this commit,
+        # which bend into its column. Lanes opened by the previous row
+        # start at that row's node; merges into existing lanes add a
+        # second segment.
+        edges = []
+        opened = {lane: source for source, lane, is_new in self._sources if is_new}
+        for lane, target in enumerate(self._lanes):
+            if target is None:
+                continue
+            to_lane = column if target == commit_hash else lane
+            edges.append((opened.get(lane, lane), to_lane, self._colors[lane]))
+        for source, lane, is_new in self._sources:
+            target = self._lanes[lane]
+            if not is_new and target is not None:
+                edges.append((source, column if target == commit_hash else lane, self._colors[lane]))
+        self._sources = []
+
+        for lane in waiting or ():
+            if lane != column:
+                self._release(lane)
+
+        if parents:
+            self._assign(column, parents[0], color)
+            for parent in parents[1:]:
+                if parent == parents[0]:
+                    continue
+                lanes = self._waiting.get(parent)
+                if lanes:
+                    self._sources.append((column, min(lanes), False))
+                else:
+                    lane = self._take_lane()
+                    self._assign(lane, parent, self._new_color())
+                    self._sources.append((column, lane, True))
+        else:
+            self._release(column)
+
+        self._trim()
+        return GraphRow(column, color, edges, max(len(self._lanes), column + 1))
+
+    def add(self, commits):
+        """Lay out (hash, parents) pairs in order and return their GraphRows."""
+        return [self.add_one(commit_hash, parents) for commit_hash, parents in commits]
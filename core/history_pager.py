@@ -0,0 +1,265 @@
+"""
+HistoryPager - Commit history served in pages from a streaming `git rev-list`.
+
+Sequential pages (the user scrolling down) are read from one long-lived
+`git rev-list --topo-order --parents` process, so page N+1 costs only parsing the next
+ids. Pages the stream has already passed, and pages far ahead of it, are
+fetched with a one-shot `git rev-list --skip`. Author, date and subject
+come from GitManager.get_commit_metadata, which serves commits seen before
+from the persistent cache and formats only the rest. Parsed pages are kept
+in a bounded LRU.
+
+Jumping to a commit finds its row with a hash-only `git rev-list` (no
+formatting, no parsing of anything before it) and then loads that one
+page.
+
+Every row also carries its graph layout. The lane state is snapshotted at
+each page boundary, so a page can be laid out on its own; a missing
+snapshot is filled from `git rev-list --parents`, which is far cheaper
+than formatting the commits in between.
+"""
+
+import threading
+from collections import OrderedDict
+
+from core.graph_layout import GraphLayout, LayoutState
+
+# Pages further ahead of the stream than this are fetched with --skip
+# instead of reading (and discarding) everything in between.
+MAX_STREAM_GAP_PAGES = 2
+# GraphLayout needs children before parents; the default date order breaks
+# that when commit clocks are skewed. find_row uses it too so rows match.
+REV_LIST_ORDER = '--topo-order'
+
+
+class HistoryPager:
+    """
+    Paged access to `git log` for one repository.
+
+    Usage:
+        pager = HistoryPager(git_manager)
+        rows = pager.get_page(0)            # first page_size commits
+        row = pager.find_row('a1b2c3d')     # absolute row of a commit, or -1
+        rows = pager.get_page(row // pager.page_size)
+
+    Rows are dicts: hash, parents, author, email, timestamp, date, message,
+    graph (a core.graph_layout.GraphRow).
+    """
+
+    def __init__(self, git_manager, page_size=200, max_pages=20, rev_args=('--all',)):
+        self.git_manager = git_manager
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.rev_args = list(rev_args)
+        self._lock = threading.Lock()
+        self._stream = None
+        self.reset()
+
+    def reset(self):
+        """Drop cached pages and the stream (call after refs change)."""
+        with self._lock:
+            self._close_stream()
+            self._pages = OrderedDict()
+            self._stream_row = 0
+            self._stream_layout = None
+            # page index -> lane state before the page's first row
+            self._checkpoints = {0: LayoutState()}
+            self.total = None  # known once the end of history has been reached
+
+    def close(self):
+        with self._lock:
+            self._close_stream()
+
+    def _close_stream(self):
+        stream = self._stream
+        self._stream = None
+        if stream is None:
+            return
+        try:
+            stream.kill()
+            stream.stdout.close()
+            stream.wait(timeout=2)
+        except Exception:
+            pass
+
+    def _rev_list_command(self, skip=None, count=None):
+        command = ['git', 'rev-list', REV_LIST_ORDER, '--parents', *self.rev_args]
+        if skip:
+            command.append(f'--skip={skip}')
+        if count:
+            command.extend(['-n', str(count)])
+        return command
+
+    @staticmethod
+    def _parse_ids(line):
+        ids = line.decode('ascii', errors='replace').split()
+        if not ids:
+            return None, []
+        return ids[0], ids[1:]
+
+    def _build_rows(self, ids, graphs):
+        """Rows for (hash, parents) pairs; [] if the metadata cannot be read."""
+        metadata = self.git_manager.get_commit_metadata([commit_hash for commit_hash, _ in ids])
+        if metadata is None:
+            return []
+        rows = []
+        for (commit_hash, parents), graph in zip(ids, graphs):
+            meta = metadata.get(commit_hash)
+            if not meta:
+                continue
+            author, email, timestamp, message = meta
+            rows.append({
+                'hash': commit_hash,
+                'parents': parents,
+                'author': author,
+                'email': email,
+                'timestamp': timestamp,
+                'date': self.git_manager.relative_date(timestamp),
+                'message': message,
+                'graph': graph
+            })
+        return rows
+
+    def _checkpoint(self, row, layout):
+        if row % self.page_size == 0:
+            self._checkpoints.setdefault(row // self.page_size, layout.snapshot())
+
+    def _ensure_checkpoint(self, index):
+        """Make sure the lane state before page `index` is known."""
+        if index in self._checkpoints:
+            return
+        known = max(k for k in self._checkpoints if k < index)
+        layout = GraphLayout(self._checkpoints[known])
+        start = known * self.page_size
+        process = self.git_manager._open_process(
+            self._rev_list_command(skip=start, count=(index - known) * self.page_size))
+        try:
+            row = start
+            for line in process.stdout:
+                commit_hash, parents = self._parse_ids(line)
+                if not commit_hash:
+                    continue
+                layout.add_one(commit_hash, parents)
+                row += 1
+                self._checkpoint(row, layout)
+        finally:
+            try:
+                process.stdout.close()
+                process.wait(timeout=5)
+            except Exception:
+                pass
+        self._checkpoints.setdefault(index, layout.snapshot())
+
+    def _store(self, index, rows):
+        self._pages[index] = rows
+        self._pages.move_to_end(index)
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+
+    def cached_page(self, index):
+        """Return a page only if it is already parsed (never runs git)."""
+        with self._lock:
+            rows = self._pages.get(index)
+            if rows is not None:
+                self._pages.move_to_end(index)
+            return rows
+
+    def get_page(self, index):
+        """Return the rows of page `index` ([] past the end of history)."""
+        if index < 0 or not self.git_manager.repo_path:
+            return []
+        with self._lock:
+            rows = self._pages.get(index)
+            if rows is not None:
+                self._pages.move_to_end(index)
+                return rows
+
+            start = index * self.page_size
+            if self.total is not None and start >= self.total:
+                return []
+
+            gap = start - self._stream_row
+            can_stream = gap >= 0 and gap <= MAX_STREAM_GAP_PAGES * self.page_size
+            if can_stream and (self._stream is not None or self._stream_row == 0):
+                rows = self._read_from_stream(start)
+            else:
+                rows = self._read_with_skip(start)
+            self._store(index, rows)
+            return rows
+
+    def _read_from_stream(self, start):
+        if self._stream is None:
+            self._stream = self.git_manager._open_process(self._rev_list_command())
+            self._stream_layout = GraphLayout()
+        stdout = self._stream.stdout
+        layout = self._stream_layout
+        ids = []
+        graphs = []
+        while self._stream_row < start + self.page_size:
+            line = stdout.readline()
+            if not line:
+                self.total = self._stream_row
+                self._close_stream()
+                break
+            commit_hash, parents = self._parse_ids(line)
+            if not commit_hash:
+                continue
+            self._stream_row += 1
+            graph = layout.add_one(commit_hash, parents)
+            if self._stream_row > start:
+                ids.append((commit_hash, parents))
+                graphs.append(graph)
+            self._checkpoint(self._stream_row, layout)
+        return self._build_rows(ids, graphs)
+
+    def _read_with_skip(self, start):
+        success, output = self.git_manager.run_command_raw(
+            self._rev_list_command(skip=start, count=self.page_size), timeout=60)
+        if not success or not output:
+            if success:
+                self.total = start
+            return []
+        index = start // self.page_size
+        self._ensure_checkpoint(index)
+        layout = GraphLayout(self._checkpoints[index])
+        ids = []
+        graphs = []
+        for line in output.splitlines():
+            commit_hash, parents = self._parse_ids(line)
+            if commit_hash:
+                ids.append((commit_hash, parents))
+                graphs.append(layout.add_one(commit_hash, parents))
+        if len(ids) < self.page_size:
+            self.total = start + len(ids)
+        else:
+            self._checkpoints.setdefault(index + 1, layout.snapshot())
+        return self._build_rows(ids, graphs)
+
+    def find_row(self, revision):
+        """Return the absolute row of a commit in this history, or -1."""
+        success, commit_hash = self.git_manager.run_command(
+            ['git', 'rev-parse', '--verify', '-q', f'{revision}^{{commit}}'])
+        if not success or not commit_hash:
+            return -1
+        commit_hash = commit_hash.strip()
+
+        with self._lock:
+            for index, rows in self._pages.items():
+                for offset, row in enumerate(rows):
+                    if row['hash'] == commit_hash:
+                        return index * self.page_size + offset
+
+        process = self.git_manager._open_process(['git', 'rev-list', REV_LIST_ORDER, *self.rev_args])
+        target = commit_hash.encode('ascii')
+        try:
+            for row, line in enumerate(process.stdout):
+                if line.rstrip(b'\n') == target:
+                    return row
+        finally:
+            try:
+                process.kill()
+                process.stdout.close()
+                process.wait(timeout=2)
+            except Exception:
+                pass
+        return -1
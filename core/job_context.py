@@ -0,0 +1,48 @@
+"""
+JobContext - What a scheduler worker thread is currently running.
+
+Kept free of Qt so that `GitManager` can use it: child processes started
+while a job runs are registered with that job, and cancelling the job
+terminates them instead of letting a superseded `git show` run to the end.
+
+Usage:
+    process = subprocess.Popen(command, ...)
+    with tracked_process(process):
+        stdout, stderr = process.communicate(timeout=timeout)
+    if job_cancelled():
+        return False, "Cancelled"
+"""
+
+import threading
+from contextlib import contextmanager
+
+_local = threading.local()
+
+
+def current_job():
+    """The task running on this thread (see core.job_scheduler), or None."""
+    return getattr(_local, 'job', None)
+
+
+def set_current_job(job):
+    _local.job = job
+
+
+def job_cancelled():
+    """True if the job running on this thread no longer has anyone waiting for it."""
+    job = current_job()
+    return job is not None and job.cancel_requested
+
+
+@contextmanager
+def tracked_process(process):
+    """Terminate `process` if the current job is cancelled while it runs."""
+    job = current_job()
+    if job is None:
+        yield process
+        return
+    job.track_process(process)
+    try:
+        yield process
+    finally:
+        job.untrack_process(process)
@@ -0,0 +1,389 @@
+"""
+JobScheduler - One app-wide, priority-aware pool for background work.
+
+Every tab used to own a thread pool and every push, clone or info popup
+started its own QThread, so a handful of open repositories meant dozens of
+git processes fighting over the disk. All of that work now goes through a
+single scheduler:
+
+- a fixed number of worker threads shared by the whole application;
+- jobs run in priority order (interactive diff > status > history preload
+  > background fetch), first come first served within a priority;
+- at most `per_repo_limit` jobs run against the same repository at once
+  (one more for interactive jobs), and one worker is always kept free for
+  interactive jobs;
+- jobs submitted with a `key` are merged according to their mode:
+  SUPERSEDE cancels the previous job, SHARE reuses it (two widgets asking
+  for the same commit share one git run), COALESCE folds a burst of
+  requests into one pending run;
+- cancelling a job terminates the git processes it started, once nobody
+  else is waiting for its result;
+- results are handed back on the GUI thread through one Qt signal bridge.
+"""
+
+import heapq
+import itertools
+import os
+import threading
+from concurrent.futures import Future, InvalidStateError
+
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+
+from core.job_context import current_job, set_current_job
+
+PRIORITY_INTERACTIVE = 0   # what the user is looking at: diffs, commit/push/pull
+PRIORITY_STATUS = 10       # working tree status, repository info
+PRIORITY_PRELOAD = 20      # history pages, diff preloading
+PRIORITY_BACKGROUND = 30   # watcher setup, periodic fetch, indicators
+
+# How a keyed submission treats an earlier job with the same (repo, key)
+SUPERSEDE = 'supersede'    # cancel the earlier job, run the new one
+SHARE = 'share'            # attach to the earlier job while it is pending or running
+COALESCE = 'coalesce'      # fold into the pending job; same-key jobs run one at a time
+
+DEFAULT_MAX_WORKERS = max(3, min(6, os.cpu_count() or 4))
+DEFAULT_PER_REPO_LIMIT = 2
+# Workers that only interactive jobs may use, so a long push/clone or a
+# preload storm never delays the diff the user just clicked.
+RESERVED_INTERACTIVE = 1
+
+
+class _Task:
+    """One unit of work, shared by every Job handle waiting for it."""
+
+    def __init__(self, fn, args, priority, repo, key, mode, name, terminate_on_cancel):
+        self.fn = fn
+        self.args = args
+        self.priority = priority
+        self.repo = repo
+        self.key = key
+        self.mode = mode
+        self.name = name or getattr(fn, '__name__', 'job')
+        self.terminate_on_cancel = terminate_on_cancel
+        self.jobs = []
+        self.started = False
+        self.cancel_requested = False
+        self._processes = set()
+        self._lock = threading.Lock()
+
+    def track_process(self, process):
+        with self._lock:
+            self._processes.add(process)
+            kill = self.cancel_requested and self.terminate_on_cancel
+        if kill:
+            self._kill(process)
+
+    def untrack_process(self, process):
+        with self._lock:
+            self._processes.discard(process)
+
+    def request_cancel(self):
+        with self._lock:
+            self.cancel_requested = True
+            processes = list(self._processes) if self.terminate_on_cancel else []
+        for process in processes:
+            self._kill(process)
+
+    def _kill(self, process):
+        try:
+            if process.poll() is None:
+                print(f"[DEBUG] JobScheduler: terminating {self.name} (pid {process.pid})")
+                process.kill()
+        except OSError:
+            pass
+
+    def __repr__(self):
+        return f"<Task {self.name} priority={self.priority} repo={self.repo}>"
+
+
+class Job(Future):
+    """
+    A caller's handle on a scheduled task; a concurrent.futures.Future.
+
+    `cancel()` only detaches this caller: its callbacks are not delivered.
+    When the last handle of a task is cancelled the task is dropped, or, if
+    it is already running, marked `cancel_requested` and its child processes
+    are terminated.
+    """
+
+    def __init__(self, scheduler, task, on_result, on_error):
+        super().__init__()
+        self._scheduler = scheduler
+        self._task = task
+        self.on_result = on_result
+        self.on_error = on_error
+
+    @property
+    def name(self):
+        return self._task.name
+
+    @property
+    def repo(self):
+        return self._task.repo
+
+    @property
+    def key(self):
+        return self._task.key
+
+    def cancel(self):
+        if not super().cancel():
+            return False
+        self._scheduler._detach(self)
+        return True
+
+    def __repr__(self):
+        return f"<Job {self._task.name} priority={self._task.priority} repo={self._task.repo}>"
+
+
+class JobSignals(QObject):
+    """Qt bridge: carries (callback, value) pairs from workers to the GUI thread."""
+    deliver = pyqtSignal(object, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.deliver.connect(self._dispatch)
+
+    @pyqtSlot(object, object)
+    def _dispatch(self, callback, value):
+        try:
+            callback(value)
+        except RuntimeError as e:
+            # The widget that asked for the result was deleted meanwhile
+            print(f"[DEBUG] JobScheduler: dropped result for deleted receiver: {e}")
+
+
+class JobScheduler:
+    """
+    Shared worker pool with priorities, per-repository limits and keyed jobs.
+
+    Usage:
+        scheduler = get_job_scheduler()
+        job = scheduler.submit(git_manager.get_status_summary,
+                               priority=PRIORITY_STATUS, repo=repo_path,
+                               key='status', mode=COALESCE,
+                               on_result=self.apply_status)
+        scheduler.submit(git_manager.get_commit_diff_bundle, commit_hash,
+                         priority=PRIORITY_INTERACTIVE, repo=repo_path,
+                         key=('commit-diff', commit_hash), mode=SHARE,
+                         on_result=self.show_diff)
+        job.cancel()
+        scheduler.cancel_repo(repo_path)   # tab closed
+
+    `on_result(value)` and `on_error(exception)` run on the GUI thread;
+    `post(callback, value)` delivers anything else (e.g. progress lines) the
+    same way. The scheduler must be created on the GUI thread. Pass
+    `terminate_on_cancel=False` for operations that must not be killed
+    halfway (pull, commit, clone).
+    """
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, per_repo_limit=DEFAULT_PER_REPO_LIMIT):
+        self.max_workers = max_workers
+        self.per_repo_limit = per_repo_limit
+        self.signals = JobSignals()
+        self._cond = threading.Condition()
+        self._heap = []
+        self._seq = itertools.count()
+        self._keyed = {}
+        self._running = {}
+        self._running_keys = set()
+        self._running_total = 0
+        self._active = set()
+        self._threads = []
+        self._idle = 0             # waiting workers nobody has notified yet
+
+    # ---- submitting ----
+
+    def submit(self, fn, *args, priority=PRIORITY_BACKGROUND, repo=None, key=None, mode=SUPERSEDE,
+               name=None, on_result=None, on_error=None, terminate_on_cancel=True):
+        superseded = None
+        with self._cond:
+            previous = self._keyed.get((repo, key)) if key is not None else None
+            if previous is not None and previous.jobs:
+                if mode == SHARE or (mode == COALESCE and not previous.started):
+                    job = Job(self, previous, on_result, on_error)
+                    if mode == COALESCE:
+                        # The newest request wins; the ones it replaces get no callback
+                        for old in previous.jobs:
+                            Future.cancel(old)
+                        previous.jobs = []
+                        previous.fn, previous.args = fn, args
+                    previous.jobs.append(job)
+                    if not previous.started and priority < previous.priority:
+                        # Promote: a preload the user is now waiting for
+                        previous.priority = priority
+                        heapq.heappush(self._heap, (priority, next(self._seq), previous))
+                        self._wake_worker()
+                    return job
+                if mode == SUPERSEDE:
+                    superseded = list(previous.jobs)
+            task = _Task(fn, args, priority, repo, key, mode, name, terminate_on_cancel)
+            job = Job(self, task, on_result, on_error)
+            task.jobs.append(job)
+            if key is not None:
+                self._keyed[(repo, key)] = task
+            heapq.heappush(self._heap, (priority, next(self._seq), task))
+            if not self._wake_worker() and len(self._threads) < self.max_workers:
+                self._spawn_worker()
+        for old in superseded or ():
+            old.cancel()
+        return job
+
+    def post(self, callback, value=None):
+        """Run `callback(value)` on the GUI thread."""
+        self.signals.deliver.emit(callback, value)
+
+    def cancel_key(self, repo, key):
+        with self._cond:
+            task = self._keyed.get((repo, key))
+            jobs = list(task.jobs) if task else []
+        for job in jobs:
+            job.cancel()
+
+    def cancel_repo(self, repo):
+        """Cancel every pending and running job of a repository."""
+        with self._cond:
+            tasks = {entry[2] for entry in self._heap if entry[2].repo == repo}
+            tasks.update(task for task in self._active if task.repo == repo)
+            jobs = [job for task in tasks for job in task.jobs]
+        for job in jobs:
+            job.cancel()
+
+    def _detach(self, job):
+        task = job._task
+        with self._cond:
+            if job in task.jobs:
+                task.jobs.remove(job)
+            if task.jobs:
+                return
+            if self._keyed.get((task.repo, task.key)) is task:
+                del self._keyed[(task.repo, task.key)]
+            started = task.started
+        # Nobody is waiting any more: a pending task is skipped when popped
+        task.request_cancel()
+        if started:
+            print(f"[DEBUG] JobScheduler: cancelled running {task.name}")
+
+    def stats(self):
+        with self._cond:
+            pending = len({entry[2] for entry in self._heap
+                           if not entry[2].started and not entry[2].cancel_requested})
+            return {'workers': len(self._threads), 'running': self._running_total,
+                    'pending': pending, 'running_by_repo': dict(self._running)}
+
+    # ---- workers ----
+
+    def _spawn_worker(self):
+        thread = threading.Thread(target=self._work, name=f"job-worker-{len(self._threads) + 1}", daemon=True)
+        self._threads.append(thread)
+        thread.start()
+
+    def _wake_worker(self):
+        """Notify one idle worker (lock held); False if none is left to notify.
+
+        A notified worker stops counting as idle right away, not when it wakes up,
+        so a second submit right after the first spawns a worker instead of
+        queueing behind the task the first one is about to take.
+        """
+        if not self._idle:
+            return False
+        self._idle -= 1
+        self._cond.notify()
+        return True
+
+    def _may_start(self, task):
+        if task.priority > PRIORITY_INTERACTIVE and \
+                self._running_total >= self.max_workers - RESERVED_INTERACTIVE:
+            return False
+        if task.mode == COALESCE and (task.repo, task.key) in self._running_keys:
+            return False
+        if task.repo is None:
+            return True
+        # Interactive jobs get one extra slot so a running push + status cannot block a diff
+        limit = self.per_repo_limit + (1 if task.priority <= PRIORITY_INTERACTIVE else 0)
+        return self._running.get(task.repo, 0) < limit
+
+    def _next_task(self):
+        """Pop the most urgent task allowed to start now (lock held)."""
+        deferred = []
+        found = None
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            task = entry[2]
+            # Skip cancelled tasks and stale entries of promoted ones
+            if task.started or task.cancel_requested or entry[0] != task.priority:
+                continue
+            if self._may_start(task):
+                found = task
+                break
+            deferred.append(entry)
+        for entry in deferred:
+            heapq.heappush(self._heap, entry)
+        return found
+
+    def _work(self):
+        while True:
+            with self._cond:
+                task = self._next_task()
+                while task is None:
+                    self._idle += 1
+                    self._cond.wait()
+                    task = self._next_task()
+                task.started = True
+                self._running_total += 1
+                self._active.add(task)
+                if task.repo is not None:
+                    self._running[task.repo] = self._running.get(task.repo, 0) + 1
+                if task.mode == COALESCE:
+                    self._running_keys.add((task.repo, task.key))
+            self._run(task)
+            with self._cond:
+                self._running_total -= 1
+                self._active.discard(task)
+                if task.repo is not None:
+                    count = self._running[task.repo] - 1
+                    if count:
+                        self._running[task.repo] = count
+                    else:
+                        del self._running[task.repo]
+                self._running_keys.discard((task.repo, task.key))
+                if task.key is not None and self._keyed.get((task.repo, task.key)) is task:
+                    del self._keyed[(task.repo, task.key)]
+                # Slots were freed: deferred tasks may be able to start now
+                self._idle = 0
+                self._cond.notify_all()
+
+    def _run(self, task):
+        set_current_job(task)
+        try:
+            result = task.fn(*task.args)
+            error = None
+        except Exception as e:
+            if not task.cancel_requested:
+                print(f"[DEBUG] JobScheduler: {task.name} failed: {e}")
+            result, error = None, e
+        finally:
+            set_current_job(None)
+        with self._cond:
+            jobs = list(task.jobs)
+        for job in jobs:
+            try:
+                if error is None:
+                    job.set_result(result)
+                else:
+                    job.set_exception(error)
+            except InvalidStateError:
+                continue  # cancelled meanwhile
+            callback = job.on_result if error is None else job.on_error
+            if callback is not None:
+                self.post(callback, result if error is None else error)
+
+
+_scheduler = None
+
+
+def get_job_scheduler():
+    """The application-wide scheduler (created on first use, on the GUI thread)."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = JobScheduler()
+    return _scheduler
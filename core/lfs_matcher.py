@@ -0,0 +1,185 @@
+"""
+LFSMatcher - Decides whether a path is handled by Git LFS.
+
+The rules come straight from the `.gitattributes` files (plus
+`.git/info/attributes`) and follow gitattributes semantics: patterns
+without a slash match the file name at any depth below the file that
+declares them, patterns with a slash are anchored to that directory,
+`**` spans directories, and the last matching line wins (so
+`Foo.uasset -filter` overrides an earlier `*.uasset filter=lfs`).
+
+All rules are compiled into one regular expression, so a lookup is a
+single match instead of a loop of fnmatch calls.
+"""
+
+import os
+import re
+
+
+def _unquote(pattern):
+    """Undo the C-style quoting git allows for patterns with spaces."""
+    body = pattern[1:-1]
+    out = []
+    i = 0
+    while i < len(body):
+        ch = body[i]
+        if ch == '\\' and i + 1 < len(body):
+            i += 1
+            ch = {'n': '\n', 't': '\t'}.get(body[i], body[i])
+        out.append(ch)
+        i += 1
+    return ''.join(out)
+
+
+def _split_line(line):
+    line = line.strip()
+    if not line or line.startswith('#') or line.startswith('[attr]'):
+        return None, []
+    if line.startswith('"'):
+        end = 1
+        while end < len(line):
+            if line[end] == '\\':
+                end += 2
+                continue
+            if line[end] == '"':
+                break
+            end += 1
+        return _unquote(line[:end + 1]), line[end + 1:].split()
+    parts = line.split()
+    return parts[0], parts[1:]
+
+
+def _filter_state(attributes):
+    """Return True/False if the line sets/unsets filter=lfs, None if it does not touch filter."""
+    state = None
+    for attr in attributes:
+        if attr == 'filter=lfs':
+            state = True
+        elif attr in ('-filter', '!filter', 'filter') or attr.startswith('filter='):
+            state = False
+    return state
+
+
+def _glob_to_regex(glob):
+    out = []
+    i = 0
+    n = len(glob)
+    while i < n:
+        ch = glob[i]
+        if ch == '*':
+            if glob.startswith('**', i):
+                at_start = i == 0 or glob[i - 1] == '/'
+                after = i + 2
+                if at_start and after < n and glob[after] == '/':
+                    out.append('(?:.*/)?')       # "**/" : zero or more directories
+                    i = after + 1
+                    continue
+                if at_start and after == n:
+                    out.append('.*')             # trailing "/**" : everything inside
+                    i = after
+                    continue
+                while i < n and glob[i] == '*':
+                    i += 1
+                out.append('[^/]*')
+                continue
+            out.append('[^/]*')
+        elif ch == '?':
+            out.append('[^/]')
+        elif ch == '[':
+            start = i + 1
+            if start < n and glob[start] in '!^':
+                start += 1
+            # A ']' right after the opening bracket is part of the set.
+            end = glob.find(']', start + 1)
+            if end == -1:
+                out.append(re.escape(ch))
+            else:
+                body = glob[i + 1:end]
+                if body[:1] in ('!', '^'):
+                    body = '^' + body[1:]
+                out.append('[' + body.replace('\\', '\\\\') + ']')
+                i = end
+        elif ch == '\\' and i + 1 < n:
+            i += 1
+            out.append(re.escape(glob[i]))
+        else:
+            out.append(re.escape(ch))
+        i += 1
+    return ''.join(out)
+
+
+def rule_to_regex(pattern, base=''):
+    """Translate one gitattributes pattern declared in directory `base` to a regex (no anchors)."""
+    if not pattern or pattern.endswith('/'):
+        return None  # directory-only patterns never apply to files
+    prefix = re.escape(base + '/') if base else ''
+    if '/' in pattern:
+        return prefix + _glob_to_regex(pattern.lstrip('/'))
+    return prefix + '(?:.*/)?' + _glob_to_regex(pattern)
+
+
+class LFSMatcher:
+    """
+    Compiled LFS rules for one repository.
+
+    Usage:
+        matcher = LFSMatcher.from_repository(repo_path, ['.gitattributes', 'Content/.gitattributes'])
+        matcher.matches('Content/Maps/Level.umap')
+    """
+
+    def __init__(self, rules, ignore_case=None):
+        """rules: [(pattern, base_dir, is_lfs)], lowest precedence first."""
+        if ignore_case is None:
+            ignore_case = os.name == 'nt'
+        self.rules = list(rules)
+        compiled = []
+        for pattern, base, is_lfs in reversed(self.rules):
+            regex = rule_to_regex(pattern, base)
+            if regex is not None:
+                compiled.append((regex, is_lfs))
+        self._outcomes = [is_lfs for _, is_lfs in compiled]
+        self._regex = None
+        if any(self._outcomes):
+            # One capturing group per rule; the first group that matches is
+            # the highest-precedence rule, and lastindex tells which one.
+            flags = re.IGNORECASE if ignore_case else 0
+            self._regex = re.compile('(?:' + '|'.join(f'({regex})' for regex, _ in compiled) + r')\Z', flags)
+
+    def matches(self, path):
+        if self._regex is None:
+            return False
+        match = self._regex.match(path.replace('\\', '/'))
+        if match is None:
+            return False
+        return self._outcomes[match.lastindex - 1]
+
+    @classmethod
+    def from_repository(cls, repo_path, attribute_files, git_dir=None):
+        """
+        Build a matcher from repository-relative `.gitattributes` paths.
+
+        Deeper files take precedence over shallower ones and
+        `<git_dir>/info/attributes` over all of them.
+        """
+        sources = []
+        for rel in sorted(attribute_files, key=lambda p: p.count('/')):
+            base = rel.rsplit('/', 1)[0] if '/' in rel else ''
+            sources.append((os.path.join(repo_path, rel), base))
+        info = os.path.join(git_dir or os.path.join(repo_path, '.git'), 'info', 'attributes')
+        sources.append((info, ''))
+
+        rules = []
+        for file_path, base in sources:
+            try:
+                with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                    lines = f.readlines()
+            except OSError:
+                continue
+            for line in lines:
+                pattern, attributes = _split_line(line)
+                if pattern is None:
+                    continue
+                state = _filter_state(attributes)
+                if state is not None:
+                    rules.append((pattern, base, state))
+        return cls(rules)
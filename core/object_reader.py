@@ -0,0 +1,152 @@
+"""
+GitObjectReader - Persistent object access through `git cat-file --batch`.
+
+Starting a git process costs tens of milliseconds on Windows, which dominates
+loading blobs, trees and commits one at a time. This module keeps one
+`git cat-file --batch` and one `git cat-file --batch-check` co-process alive
+per repository and answers each request with a single round-trip.
+"""
+
+import os
+import subprocess
+import threading
+
+
+class GitObjectReader:
+    """
+    Long-lived `git cat-file` co-processes for a single repository.
+
+    Usage:
+        reader = GitObjectReader(repo_path)
+        obj_type, data = reader.read("HEAD:Game.uproject")
+        reader.close()
+
+    Object specs accept the full revision syntax (`<rev>:<path>`,
+    `stash@{0}^{tree}`, plain object ids...). The co-processes are started
+    lazily and restarted automatically if they exit.
+    """
+
+    def __init__(self, repo_path):
+        self.repo_path = repo_path
+        self._batch = None
+        self._check = None
+        self._batch_lock = threading.Lock()
+        self._check_lock = threading.Lock()
+
+    def _spawn(self, mode):
+        kwargs = {
+            'cwd': self.repo_path,
+            'stdin': subprocess.PIPE,
+            'stdout': subprocess.PIPE,
+            'stderr': subprocess.DEVNULL
+        }
+        if os.name == 'nt':
+            kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW
+        return subprocess.Popen(['git', 'cat-file', mode], **kwargs)
+
+    @staticmethod
+    def _alive(process):
+        return process is not None and process.poll() is None
+
+    @staticmethod
+    def _terminate(process):
+        if process is None:
+            return
+        try:
+            if process.stdin:
+                process.stdin.close()
+            process.terminate()
+            process.wait(timeout=2)
+        except Exception:
+            try:
+                process.kill()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _read_exact(stream, size):
+        chunks = []
+        remaining = size
+        while remaining > 0:
+            chunk = stream.read(remaining)
+            if not chunk:
+                raise EOFError("cat-file closed its output")
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b''.join(chunks)
+
+    @staticmethod
+    def _read_line(stream):
+        line = stream.readline()
+        if not line.endswith(b'\n'):
+            raise EOFError("cat-file closed its output")
+        return line[:-1]
+
+    @staticmethod
+    def _valid_spec(spec):
+        return bool(spec) and isinstance(spec, str) and '\n' not in spec and '\r' not in spec
+
+    def _request(self, attr, mode, spec):
+        """Send one spec to a co-process and return its header fields."""
+        process = getattr(self, attr)
+        for attempt in range(2):
+            if not self._alive(process):
+                self._terminate(process)
+                process = self._spawn(mode)
+                setattr(self, attr, process)
+            try:
+                process.stdin.write(spec.encode('utf-8') + b'\n')
+                process.stdin.flush()
+                header = self._read_line(process.stdout).decode('utf-8', errors='replace')
+                return process, header
+            except (BrokenPipeError, EOFError, OSError):
+                # The co-process died underneath us; restart once and retry.
+                self._terminate(process)
+                process = None
+                setattr(self, attr, None)
+                if attempt:
+                    raise
+        return None, ''
+
+    def read(self, spec):
+        """Return (type, bytes) for an object, or (None, None) if it is missing."""
+        if not self.repo_path or not self._valid_spec(spec):
+            return None, None
+        with self._batch_lock:
+            try:
+                process, header = self._request('_batch', '--batch', spec)
+                parts = header.split()
+                if len(parts) != 3 or parts[-1] == 'missing':
+                    return None, None
+                size = int(parts[2])
+                data = self._read_exact(process.stdout, size)
+                self._read_exact(process.stdout, 1)  # trailing LF
+                return parts[1], data
+            except (ValueError, EOFError, OSError):
+                self._terminate(self._batch)
+                self._batch = None
+                return None, None
+
+    def info(self, spec):
+        """Return (oid, type, size) for an object, or None if it is missing."""
+        if not self.repo_path or not self._valid_spec(spec):
+            return None
+        with self._check_lock:
+            try:
+                _, header = self._request('_check', '--batch-check', spec)
+                parts = header.split()
+                if len(parts) != 3 or parts[-1] == 'missing':
+                    return None
+                return parts[0], parts[1], int(parts[2])
+            except (ValueError, EOFError, OSError):
+                self._terminate(self._check)
+                self._check = None
+                return None
+
+    def close(self):
+        with self._batch_lock:
+            self._terminate(self._batch)
+            self._batch = None
+        with self._check_lock:
+            self._terminate(self._check)
+            self._check = None
@@ -0,0 +1,239 @@
+"""
+PersistentCache - On-disk cache of immutable per-commit data.
+
+Commit metadata, commit file lists and commit diffs are addressed by the
+commit id, so once computed they stay valid forever and survive restarts.
+They live in one SQLite database per repository under
+`~/.unreal-git-client/cache/<repo-id>/`, each value stored as
+zlib-compressed JSON.
+
+The cache is bounded by size: every read refreshes an entry's access time
+and writes evict the least recently used entries once the total passes
+the cap. Ref tips are remembered between runs; when a ref is rewritten
+(force-push, rebase, reset) the commits that dropped out of it are purged,
+everything else is kept.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Evict down to this fraction of the cap so eviction does not run on every write.
+EVICT_TARGET = 0.9
+
+KIND_COMMIT = 'commit'
+KIND_FILES = 'files'
+# The version suffix changes whenever the stored layout does; entries of
+# any other kind are dropped when the cache is opened.
+KIND_BUNDLE = 'bundle-v3'
+# Kinds whose key is a commit id
+COMMIT_KINDS = (KIND_COMMIT, KIND_FILES, KIND_BUNDLE)
+
+
+def default_cache_root():
+    return Path.home() / '.unreal-git-client' / 'cache'
+
+
+def repo_id(repo_path):
+    """Stable directory name for a repository path."""
+    normalized = os.path.normcase(os.path.realpath(repo_path))
+    name = os.path.basename(normalized.rstrip('\\/')) or 'repo'
+    digest = hashlib.sha1(normalized.encode('utf-8', errors='replace')).hexdigest()[:16]
+    safe = ''.join(c if c.isalnum() or c in '-_.' else '_' for c in name)
+    return f"{safe}-{digest}"
+
+
+class PersistentCache:
+    """
+    SQLite-backed cache for one repository.
+
+    Usage:
+        cache = PersistentCache(repo_path)
+        cache.put('files', commit_hash, [{'status': 'M', 'path': 'a.txt'}])
+        cache.get('files', commit_hash)            # value or None
+        cache.get_many('commit', [hash1, hash2])   # {hash: value} for the ones present
+        rewritten = cache.update_refs({'refs/heads/main': oid})
+        cache.close()
+
+    Values must be JSON-serializable. All methods are thread-safe and never
+    raise: a cache that cannot be opened simply behaves as empty.
+    """
+
+    def __init__(self, repo_path, root=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.repo_path = repo_path
+        self.max_bytes = max_bytes
+        self.directory = Path(root or default_cache_root()) / repo_id(repo_path)
+        self._lock = threading.Lock()
+        self._db = None
+        self._total = 0
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.directory / 'cache.sqlite3'),
+                                       check_same_thread=False, isolation_level=None)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('PRAGMA synchronous=NORMAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS entries ('
+                ' kind TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL,'
+                ' size INTEGER NOT NULL, accessed REAL NOT NULL,'
+                ' PRIMARY KEY (kind, key))')
+            self._db.execute('CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)')
+            self._db.execute('CREATE TABLE IF NOT EXISTS refs (name TEXT PRIMARY KEY, oid TEXT NOT NULL)')
+            self._db.execute(f"DELETE FROM entries WHERE kind NOT IN ({', '.join('?' * len(COMMIT_KINDS))})",
+                             COMMIT_KINDS)
+            self._total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        except (OSError, sqlite3.Error) as e:
+            print(f"[DEBUG] PersistentCache disabled for {repo_path}: {e}")
+            self._db = None
+
+    @property
+    def enabled(self):
+        return self._db is not None
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                try:
+                    self._db.close()
+                except sqlite3.Error:
+                    pass
+                self._db = None
+
+    @staticmethod
+    def _encode(value):
+        return zlib.compress(json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), 6)
+
+    @staticmethod
+    def _decode(blob):
+        return json.loads(zlib.decompress(blob).decode('utf-8'))
+
+    def get(self, kind, key):
+        return self.get_many(kind, [key]).get(key)
+
+    def get_many(self, kind, keys):
+        """Return {key: value} for the keys that are cached."""
+        keys = list(keys)
+        if not keys:
+            return {}
+        with self._lock:
+            if self._db is None:
+                return {}
+            found = {}
+            try:
+                # Stay well below SQLite's bound-parameter limit
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start:start + 500]
+                    marks = ','.join('?' * len(chunk))
+                    rows = self._db.execute(
+                        f'SELECT key, value FROM entries WHERE kind = ? AND key IN ({marks})',
+                        [kind, *chunk]).fetchall()
+                    for key, blob in rows:
+                        try:
+                            found[key] = self._decode(blob)
+                        except (zlib.error, ValueError):
+                            continue
+                if found:
+                    now = time.time()
+                    self._db.executemany('UPDATE entries SET accessed = ? WHERE kind = ? AND key = ?',
+                                         [(now, kind, key) for key in found])
+            except sqlite3.Error as e:
+                print(f"[DEBUG] PersistentCache read failed: {e}")
+            return found
+
+    def put(self, kind, key, value):
+        self.put_many(kind, {key: value})
+
+    def put_many(self, kind, values):
+        if not values:
+            return
+        with self._lock:
+            if self._db is None:
+                return
+            now = time.time()
+            rows = []
+            for key, value in values.items():
+                blob = self._encode(value)
+                rows.append((kind, key, blob, len(blob), now))
+            try:
+                self._db.execute('BEGIN')
+                for row in rows:
+                    old = self._db.execute('SELECT size FROM entries WHERE kind = ? AND key = ?',
+                                           row[:2]).fetchone()
+                    if old:
+                        self._total -= old[0]
+                    self._db.execute('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)', row)
+                    self._total += row[3]
+                self._db.execute('COMMIT')
+                if self._total > self.max_bytes:
+                    self._evict()
+            except sqlite3.Error as e:
+                print(f"[DEBUG] PersistentCache write failed: {e}")
+                try:
+                    self._db.execute('ROLLBACK')
+                except sqlite3.Error:
+                    pass
+                self._total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+
+    def _evict(self):
+        target = self.max_bytes * EVICT_TARGET
+        cursor = self._db.execute('SELECT kind, key, size FROM entries ORDER BY accessed')
+        doomed = []
+        total = self._total
+        for kind, key, size in cursor:
+            if total <= target:
+                break
+            doomed.append((kind, key))
+            total -= size
+        cursor.close()
+        self._db.executemany('DELETE FROM entries WHERE kind = ? AND key = ?', doomed)
+        self._total = total
+
+    def delete_commits(self, commit_hashes):
+        """Forget everything cached for these commits."""
+        commit_hashes = list(commit_hashes)
+        if not commit_hashes:
+            return
+        with self._lock:
+            if self._db is None:
+                return
+            try:
+                self._db.execute('BEGIN')
+                self._db.executemany('DELETE FROM entries WHERE kind = ? AND key = ?',
+                                     [(kind, commit_hash) for commit_hash in commit_hashes for kind in COMMIT_KINDS])
+                self._db.execute('COMMIT')
+                self._total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+            except sqlite3.Error as e:
+                print(f"[DEBUG] PersistentCache delete failed: {e}")
+
+    def update_refs(self, refs):
+        """
+        Record the current ref tips ({refname: oid}).
+
+        Returns [(refname, old_oid, new_oid)] for refs whose tip changed
+        since the last call; the caller decides which of them were rewrites.
+        """
+        with self._lock:
+            if self._db is None:
+                return []
+            try:
+                previous = dict(self._db.execute('SELECT name, oid FROM refs').fetchall())
+                changed = [(name, oid, refs[name]) for name, oid in previous.items()
+                           if name in refs and refs[name] != oid]
+                if previous != refs:
+                    self._db.execute('BEGIN')
+                    self._db.execute('DELETE FROM refs')
+                    self._db.executemany('INSERT INTO refs VALUES (?, ?)', list(refs.items()))
+                    self._db.execute('COMMIT')
+                return changed
+            except sqlite3.Error as e:
+                print(f"[DEBUG] PersistentCache ref update failed: {e}")
+                return []
+
+    def size(self):
+        return self._total
@@ -6,6 +6,9 @@ class PluginInterface(ABC):
     Interfaz base para todos los plugins.
     Define los métodos que deben implementar los plugins para integrarse con la aplicación.
     """
+
+    # El gestor de plugins lo asigna al cargar el plugin
+    plugin_manager = None
     
     @abstractmethod
     def get_name(self) -> str:
@@ -32,8 +35,27 @@ class PluginInterface(ABC):
         Devuelve un indicador para mostrar en la barra superior si el repositorio es relevante para este plugin.
         Debe devolver un diccionario con keys: 'icon', 'text', 'tooltip', 'color', 'plugin_name'.
         O None si no aplica.
+        Se ejecuta en un hilo de trabajo: no debe crear ni tocar widgets.
+        El resultado se guarda en caché (ver get_indicator_options).
         """
         return None
+
+    def invalidate_indicator(self, repo_path: Optional[str] = None) -> None:
+        """
+        Pide que se vuelva a evaluar el indicador (p. ej. desde un evento del plugin).
+        El gestor de plugins la sustituye al cargar el plugin; puede llamarse desde cualquier hilo.
+        """
+        pass
+
+    def get_indicator_options(self) -> Dict[str, Any]:
+        """
+        Cómo se evalúa get_repository_indicator(). Los plugins con plugin.json
+        lo declaran en su clave "indicator"; este método sirve a los que no lo tienen.
+        - 'refresh_seconds': validez del resultado en caché (None = hasta que se invalide).
+        - 'budget_ms': tiempo máximo esperado; si se supera, se consulta con menos frecuencia.
+        - 'watch': patrones de rutas del repositorio cuyo cambio invalida el resultado.
+        """
+        return {}
     
     def get_actions(self, context: str) -> List[Dict[str, Any]]:
         """
@@ -56,6 +78,28 @@ class PluginInterface(ABC):
         """
         return None
 
+    def get_asset_catalog(self, repo_path: str) -> Optional[Any]:
+        """
+        Devuelve el catálogo de assets del repositorio (ver AssetCatalog del plugin
+        de Unreal) o None si no aplica. Se llama desde un hilo de trabajo.
+        """
+        return None
+
+    def on_repository_changed(self, repo_path: str, changes: Dict[str, Any]) -> None:
+        """
+        Recibe los cambios del observador de archivos ({'paths', 'index', 'refs', 'full', ...}).
+        Se llama en el hilo de la interfaz: debe ser inmediato.
+        """
+        pass
+
+    def on_repository_closed(self, repo_path: str) -> None:
+        """
+        La última pestaña que mostraba el repositorio se cerró o pasó a otro:
+        liberar lo que se vigile para él (procesos, catálogos). Se llama en el
+        hilo de la interfaz.
+        """
+        pass
+
     def is_enabled_by_default(self) -> bool:
         """
         Devuelve True si el plugin debe estar activado por defecto.
@@ -1,122 +1,436 @@
+import fnmatch
+import functools
+import json
 import os
 import sys
+import threading
+import time
 import importlib.util
 from pathlib import Path
 
+MANIFEST_FILE = "plugin.json"
+
+# What a plugin can declare in its manifest; the module is imported the first
+# time one of these is needed.
+CAPABILITIES = ('indicator', 'actions', 'lfs_patterns', 'sidebar_widget', 'asset_catalog', 'repository_events')
+
+# Indicator evaluation defaults (overridable per plugin in the manifest's "indicator")
+DEFAULT_INDICATOR_BUDGET_MS = 200
+DEFAULT_INDICATOR_REFRESH = None   # seconds; None = cached until invalidated
+MAX_INDICATOR_BACKOFF = 8          # over-budget plugins are asked up to 8x less often
+
+
 class PluginManager:
+    """
+    Discovers plugins from their plugin.json manifests and imports each
+    plugin module only when one of its capabilities is first used.
+
+    Usage:
+        manager = PluginManager()
+        manager.get_plugins()                        # manifests only, nothing imported
+        manager.get_all_lfs_patterns()               # from manifests
+        manager.get_repository_indicators(repo)      # imports plugins whose predicate matches
+        manager.cached_indicators(repo)              # last known values, never calls plugins
+        for name in manager.indicators_due(repo):    # then, on a worker thread:
+            manager.evaluate_indicator(name, repo)   # True if the value changed
+        manager.invalidate_indicators(repo, paths)   # e.g. on watcher events
+        manager.add_indicator_listener(callback)     # plugins invalidating themselves
+        manager.get_plugins_with('sidebar_widget')   # {name: instance}
+        manager.get_asset_catalog(repo)              # worker thread; None if no plugin applies
+        manager.notify_repository_changed(repo, changes)  # watcher events to loaded plugins
+        manager.get_load_times()                     # {name: seconds spent importing}
+
+    Plugins without a manifest are imported at startup, as before.
+    """
+
     def __init__(self):
         self.plugins = {}
         self.plugins_dir = Path(__file__).parent.parent / "plugins"
+        self._lock = threading.RLock()
+        self._indicators = {}
+        self._indicator_lock = threading.Lock()
+        self._indicator_listeners = []
+        self._open_repositories = {}  # normalized repo path -> tabs showing it
         self.load_plugins()
-    
+
     def load_plugins(self):
         if not self.plugins_dir.exists():
             return
-        
-        for plugin_dir in self.plugins_dir.iterdir():
+
+        for plugin_dir in sorted(self.plugins_dir.iterdir()):
             if not plugin_dir.is_dir() or plugin_dir.name.startswith('_'):
                 continue
-            
+
             plugin_file = plugin_dir / "plugin.py"
             if not plugin_file.exists():
                 continue
-            
+
+            manifest = self._read_manifest(plugin_dir)
+            self.plugins[plugin_dir.name] = {
+                'manifest': manifest or {},
+                'file': plugin_file,
+                'instance': None,
+                'module': None,
+                'enabled': True,
+                'load_time': None,
+                'error': None
+            }
+            if manifest is None:
+                # Legacy plugin: the manifest has to be built from the instance
+                self._import(plugin_dir.name)
+                continue
+
+            self.plugins[plugin_dir.name]['enabled'] = manifest.get('enabled_by_default', True)
+            status = "descubierto" if self.plugins[plugin_dir.name]['enabled'] else "descubierto (desactivado)"
+            print(f"[OK] Plugin {status}: {manifest.get('name', plugin_dir.name)}")
+
+    def _read_manifest(self, plugin_dir):
+        manifest_file = plugin_dir / MANIFEST_FILE
+        if not manifest_file.exists():
+            return None
+        try:
+            with open(manifest_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] Manifiesto inválido en {plugin_dir.name}: {str(e)}")
+            return None
+        unknown = set(manifest.get('capabilities', [])) - set(CAPABILITIES)
+        if unknown:
+            print(f"[DEBUG] PluginManager: {plugin_dir.name} declares unknown capabilities {sorted(unknown)}")
+        return manifest
+
+    def _import(self, name):
+        """Import the plugin module and create its instance; returns it or None."""
+        with self._lock:
+            data = self.plugins[name]
+            if data['instance'] is not None or data['error'] is not None:
+                return data['instance']
+
+            started = time.perf_counter()
             try:
-                spec = importlib.util.spec_from_file_location(
-                    f"plugins.{plugin_dir.name}",
-                    plugin_file
-                )
+                spec = importlib.util.spec_from_file_location(f"plugins.{name}", data['file'])
                 module = importlib.util.module_from_spec(spec)
                 sys.modules[spec.name] = module
                 spec.loader.exec_module(module)
-                
-                if hasattr(module, 'Plugin'):
-                    plugin_instance = module.Plugin()
-                    
-                    # Check if plugin should be enabled by default
-                    enabled_by_default = True
-                    if hasattr(plugin_instance, 'is_enabled_by_default'):
-                        enabled_by_default = plugin_instance.is_enabled_by_default()
-                        
-                    self.plugins[plugin_dir.name] = {
-                        'instance': plugin_instance,
-                        'module': module,
-                        'enabled': enabled_by_default
-                    }
-                    status = "cargado" if enabled_by_default else "cargado (desactivado)"
-                    print(f"[OK] Plugin {status}: {plugin_instance.get_name()}")
+                if not hasattr(module, 'Plugin'):
+                    raise ImportError("plugin.py no define la clase Plugin")
+                plugin_instance = module.Plugin()
             except Exception as e:
-                print(f"[ERROR] Error cargando plugin {plugin_dir.name}: {str(e)}")
-    
+                sys.modules.pop(f"plugins.{name}", None)
+                data['error'] = str(e)
+                print(f"[ERROR] Error cargando plugin {name}: {str(e)}")
+                return None
+
+            data['load_time'] = time.perf_counter() - started
+            data['module'] = module
+            data['instance'] = plugin_instance
+            # Lets event-driven plugins (e.g. editor start/stop) refresh their indicator
+            plugin_instance.invalidate_indicator = functools.partial(self.invalidate_plugin_indicator, name)
+            plugin_instance.plugin_manager = self
+            if not data['manifest']:
+                data['manifest'] = self._manifest_from_instance(plugin_instance)
+                data['enabled'] = data['manifest']['enabled_by_default']
+            print(f"[OK] Plugin cargado: {data['manifest'].get('name', name)} "
+                  f"({data['load_time'] * 1000:.0f} ms)")
+            return plugin_instance
+
+    @staticmethod
+    def _manifest_from_instance(plugin):
+        capabilities = [c for c, method in (('indicator', 'get_repository_indicator'),
+                                            ('actions', 'get_actions'),
+                                            ('lfs_patterns', 'get_lfs_patterns'),
+                                            ('sidebar_widget', 'get_sidebar_widget'),
+                                            ('asset_catalog', 'get_asset_catalog'),
+                                            ('repository_events', 'on_repository_changed'))
+                        if hasattr(plugin, method)]
+        return {
+            'name': plugin.get_name() if hasattr(plugin, 'get_name') else '',
+            'version': plugin.get_version() if hasattr(plugin, 'get_version') else '1.0.0',
+            'description': plugin.get_description() if hasattr(plugin, 'get_description') else '',
+            'icon': plugin.get_icon() if hasattr(plugin, 'get_icon') else '',
+            'enabled_by_default': plugin.is_enabled_by_default() if hasattr(plugin, 'is_enabled_by_default') else True,
+            'capabilities': capabilities,
+            'indicator': plugin.get_indicator_options() if hasattr(plugin, 'get_indicator_options') else {}
+        }
+
+    def _enabled_with(self, capability):
+        return [name for name, data in self.plugins.items()
+                if data['enabled'] and capability in data['manifest'].get('capabilities', [])]
+
     def get_plugin(self, name):
         plugin_data = self.plugins.get(name)
         if plugin_data and plugin_data['enabled']:
-            return plugin_data['instance']
+            return self._import(name)
         return None
-    
+
     def get_all_plugins(self):
-        return {name: data['instance'] for name, data in self.plugins.items() if data['enabled']}
-    
+        """Every enabled plugin instance; imports them all, prefer get_plugins_with()."""
+        plugins = {}
+        for name, data in self.plugins.items():
+            if data['enabled']:
+                instance = self._import(name)
+                if instance is not None:
+                    plugins[name] = instance
+        return plugins
+
+    def get_plugins_with(self, capability):
+        """{name: instance} of the enabled plugins that declare `capability`."""
+        plugins = {}
+        for name in self._enabled_with(capability):
+            instance = self._import(name)
+            if instance is not None:
+                plugins[name] = instance
+        return plugins
+
     def get_plugins(self):
         plugins_info = []
         for name, data in self.plugins.items():
-            plugin = data['instance']
+            manifest = data['manifest']
             plugins_info.append({
                 'name': name,
-                'display_name': plugin.get_name() if hasattr(plugin, 'get_name') else name,
-                'description': plugin.get_description() if hasattr(plugin, 'get_description') else '',
-                'version': plugin.get_version() if hasattr(plugin, 'get_version') else '1.0.0',
-                'enabled': data['enabled']
+                'display_name': manifest.get('name') or name,
+                'description': manifest.get('description', ''),
+                'version': manifest.get('version', '1.0.0'),
+                'enabled': data['enabled'],
+                'loaded': data['instance'] is not None,
+                'load_time': data['load_time']
             })
         return plugins_info
-    
+
+    def get_load_times(self):
+        """{name: seconds} spent importing each plugin loaded so far."""
+        return {name: data['load_time'] for name, data in self.plugins.items()
+                if data['load_time'] is not None}
+
     def is_plugin_enabled(self, name):
         if name in self.plugins:
             return self.plugins[name]['enabled']
         return False
-    
+
     def enable_plugin(self, name):
         if name in self.plugins:
             self.plugins[name]['enabled'] = True
-    
+
     def disable_plugin(self, name):
         if name in self.plugins:
             self.plugins[name]['enabled'] = False
-    
+            with self._indicator_lock:
+                for key in [k for k in self._indicators if k[1] == name]:
+                    del self._indicators[key]
+
     def get_plugin_actions(self, context='repository', repo_path=None):
         actions = []
-        for name, data in self.plugins.items():
-            if data['enabled']:
-                plugin = data['instance']
-                if hasattr(plugin, 'get_actions'):
-                    try:
-                        plugin_actions = plugin.get_actions(context, repo_path=repo_path)
-                    except TypeError:
-                        plugin_actions = plugin.get_actions(context)
-                    if plugin_actions:
-                        for action in plugin_actions:
-                            action['plugin_name'] = name
-                        actions.extend(plugin_actions)
+        for name, plugin in self.get_plugins_with('actions').items():
+            try:
+                plugin_actions = plugin.get_actions(context, repo_path=repo_path)
+            except TypeError:
+                plugin_actions = plugin.get_actions(context)
+            if plugin_actions:
+                for action in plugin_actions:
+                    action['plugin_name'] = name
+                actions.extend(plugin_actions)
         return actions
-    
+
     def get_all_lfs_patterns(self):
         patterns = []
-        for name, data in self.plugins.items():
-            if data['enabled']:
-                plugin = data['instance']
-                if hasattr(plugin, 'get_lfs_patterns'):
-                    plugin_patterns = plugin.get_lfs_patterns()
-                    if plugin_patterns:
-                        patterns.extend(plugin_patterns)
+        for name in self._enabled_with('lfs_patterns'):
+            plugin_patterns = self.plugins[name]['manifest'].get('lfs_patterns')
+            if plugin_patterns is None:
+                # Computed by the plugin itself
+                plugin = self._import(name)
+                plugin_patterns = plugin.get_lfs_patterns() if plugin else []
+            if plugin_patterns:
+                patterns.extend(plugin_patterns)
         return list(set(patterns))
-    
+
+    def indicator_applies(self, name, repo_path):
+        """Evaluate the manifest's indicator predicate without importing the plugin."""
+        predicate = self.plugins[name]['manifest'].get('indicator')
+        if not predicate:
+            return True
+        if predicate.get('always'):
+            return True
+        root_files = predicate.get('root_files')
+        if root_files:
+            try:
+                entries = os.listdir(repo_path)
+            except OSError:
+                return False
+            return any(fnmatch.fnmatch(entry, pattern) for entry in entries for pattern in root_files)
+        # Only budget/refresh options and no rule: the plugin decides for itself
+        return True
+
     def get_repository_indicators(self, repo_path):
+        """Ask every matching plugin now (blocking); the UI uses the cached, off-thread path."""
         indicators = []
-        for name, data in self.plugins.items():
-            if data['enabled']:
-                plugin = data['instance']
-                if hasattr(plugin, 'get_repository_indicator'):
-                    indicator = plugin.get_repository_indicator(repo_path)
-                    if indicator:
-                        indicators.append(indicator)
+        for name in self._enabled_with('indicator'):
+            if not repo_path or not self.indicator_applies(name, repo_path):
+                continue
+            plugin = self._import(name)
+            if plugin is None:
+                continue
+            indicator = plugin.get_repository_indicator(repo_path)
+            if indicator:
+                indicators.append(indicator)
         return indicators
+
+    def get_asset_catalog(self, repo_path):
+        """
+        Asset catalog of the repository from the first plugin whose manifest
+        predicate matches, or None. May import the plugin: call it off the GUI thread.
+        """
+        if not repo_path:
+            return None
+        for name in self._enabled_with('asset_catalog'):
+            if not self.indicator_applies(name, repo_path):
+                continue
+            plugin = self._import(name)
+            catalog = plugin.get_asset_catalog(repo_path) if plugin else None
+            if catalog is not None:
+                return catalog
+        return None
+
+    def notify_repository_changed(self, repo_path, changes):
+        """Forward a file watcher change set to the loaded plugins that listen for it."""
+        for name in self._enabled_with('repository_events'):
+            plugin = self.plugins[name]['instance']
+            if plugin is None:
+                # Not loaded yet: it has nothing to keep up to date
+                continue
+            try:
+                plugin.on_repository_changed(repo_path, changes)
+            except Exception as e:
+                print(f"[ERROR] Evento de repositorio en plugin {name}: {str(e)}")
+
+    def notify_repository_opened(self, repo_path):
+        """Count a tab showing this repository (see notify_repository_closed)."""
+        path = os.path.normcase(os.path.abspath(repo_path))
+        with self._lock:
+            self._open_repositories[path] = self._open_repositories.get(path, 0) + 1
+
+    def notify_repository_closed(self, repo_path):
+        """Tell the loaded `repository_events` plugins that the last tab let go of a repository."""
+        path = os.path.normcase(os.path.abspath(repo_path))
+        with self._lock:
+            count = self._open_repositories.get(path, 0) - 1
+            if count > 0:
+                # Still open in another tab: its watches and catalogs stay
+                self._open_repositories[path] = count
+                return
+            self._open_repositories.pop(path, None)
+        for name in self._enabled_with('repository_events'):
+            plugin = self.plugins[name]['instance']
+            if plugin is None or not hasattr(plugin, 'on_repository_closed'):
+                continue
+            try:
+                plugin.on_repository_closed(repo_path)
+            except Exception as e:
+                print(f"[ERROR] Evento de repositorio en plugin {name}: {str(e)}")
+
+    # ---- cached, off-thread indicators ----
+
+    def _indicator_options(self, name):
+        options = self.plugins[name]['manifest'].get('indicator') or {}
+        return {
+            'budget_ms': options.get('budget_ms', DEFAULT_INDICATOR_BUDGET_MS),
+            'refresh_seconds': options.get('refresh_seconds', DEFAULT_INDICATOR_REFRESH),
+            'watch': options.get('watch', options.get('root_files', []))
+        }
+
+    def cached_indicators(self, repo_path):
+        """Last evaluated indicators of the repository; never calls into plugins."""
+        with self._indicator_lock:
+            return [entry['value'] for name in self._enabled_with('indicator')
+                    for entry in [self._indicators.get((repo_path, name))]
+                    if entry and entry['value']]
+
+    def indicators_due(self, repo_path, now=None):
+        """Plugins whose indicator is missing, invalidated or older than its refresh interval (no I/O)."""
+        if not repo_path:
+            return []
+        now = time.monotonic() if now is None else now
+        due = []
+        for name in self._enabled_with('indicator'):
+            with self._indicator_lock:
+                entry = self._indicators.get((repo_path, name))
+            if entry is None or entry['stale']:
+                due.append(name)
+                continue
+            refresh = self._indicator_options(name)['refresh_seconds']
+            if refresh is not None and now - entry['time'] >= refresh * entry['backoff']:
+                due.append(name)
+        return due
+
+    def evaluate_indicator(self, name, repo_path):
+        """
+        Ask one plugin for its indicator and cache it; returns True if the
+        value changed. Meant for a worker thread: it may import the plugin.
+        A plugin that runs over its time budget is asked less often.
+        """
+        started = time.perf_counter()
+        try:
+            value = None
+            if self.indicator_applies(name, repo_path):
+                plugin = self._import(name)
+                value = plugin.get_repository_indicator(repo_path) if plugin else None
+        except Exception as e:
+            print(f"[ERROR] Indicador del plugin {name}: {str(e)}")
+            value = None
+        duration = time.perf_counter() - started
+
+        budget = self._indicator_options(name)['budget_ms'] / 1000.0
+        with self._indicator_lock:
+            previous = self._indicators.get((repo_path, name))
+            backoff = previous['backoff'] if previous else 1
+            if duration > budget:
+                backoff = min(MAX_INDICATOR_BACKOFF, backoff * 2)
+                print(f"[DEBUG] PluginManager: {name} indicator took {duration * 1000:.0f} ms "
+                      f"(budget {budget * 1000:.0f} ms), backing off x{backoff}")
+            else:
+                backoff = 1
+            self._indicators[(repo_path, name)] = {
+                'value': value,
+                'time': time.monotonic(),
+                'duration': duration,
+                'backoff': backoff,
+                'stale': False
+            }
+            return previous is None or previous['value'] != value
+
+    def invalidate_indicators(self, repo_path, paths=None):
+        """Mark cached indicators stale: all of them, or those watching one of `paths`."""
+        with self._indicator_lock:
+            for (repo, name), entry in self._indicators.items():
+                if repo != repo_path:
+                    continue
+                if paths is None:
+                    entry['stale'] = True
+                    continue
+                watch = self._indicator_options(name)['watch']
+                if any(fnmatch.fnmatch(path, pattern) for path in paths for pattern in watch):
+                    entry['stale'] = True
+
+    def invalidate_plugin_indicator(self, name, repo_path=None):
+        """Called by a plugin (any thread) when its indicator changed; notifies the listeners."""
+        with self._indicator_lock:
+            for (repo, plugin_name), entry in self._indicators.items():
+                if plugin_name == name and (repo_path is None or repo == repo_path):
+                    entry['stale'] = True
+            listeners = list(self._indicator_listeners)
+        for listener in listeners:
+            listener(repo_path)
+
+    def add_indicator_listener(self, callback):
+        """`callback(repo_path or None)` runs on the plugin's thread when an indicator is invalidated."""
+        with self._indicator_lock:
+            self._indicator_listeners.append(callback)
+
+    def remove_indicator_listener(self, callback):
+        with self._indicator_lock:
+            if callback in self._indicator_listeners:
+                self._indicator_listeners.remove(callback)
+
+    def forget_indicators(self, repo_path):
+        with self._indicator_lock:
+            for key in [k for k in self._indicators if k[0] == repo_path]:
+                del self._indicators[key]
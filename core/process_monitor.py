@@ -0,0 +1,486 @@
+"""
+Process monitoring without shelling out.
+
+ProcessMonitor keeps a table of the running processes, read in-process from
+the OS, and reports when processes matching a watch start or stop:
+
+    monitor = get_process_monitor()
+    monitor.watch(uproject_path, is_editor_for_project, on_event)
+    monitor.is_running(uproject_path)   # table lookup, no I/O
+
+`on_event(event, key, process)` is called on the monitor thread with event
+'started' or 'stopped'. Between changes nothing is re-read: each scan lists
+the process ids and only describes (name, command line) the new ones. A
+predicate may answer None ("can't tell yet", e.g. the window has no title
+yet); that process is asked again on the next scans. The thread only runs
+while something is watched. Failing predicates, callbacks and scans are
+recorded as errored spans in the tracer (developer panel), not printed.
+
+Backends:
+    ProcFsBackend    - Linux, /proc
+    WindowsBackend   - Windows, Toolhelp32 snapshot + NtQueryInformationProcess
+    PsBackend        - other POSIX systems, one `ps` call per scan
+"""
+
+import ctypes
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from core.tracing import Span, get_tracer
+
+DEFAULT_INTERVAL = 2.0
+
+
+class ProcessInfo:
+    """A running process; the command line is read on first use."""
+
+    __slots__ = ('pid', 'name', 'started', '_cmdline', '_backend')
+
+    def __init__(self, pid, name, backend, cmdline=None, started=None):
+        self.pid = pid
+        self.name = name
+        self.started = started
+        self._backend = backend
+        self._cmdline = cmdline
+
+    @property
+    def cmdline(self):
+        if self._cmdline is None:
+            self._cmdline = self._backend.cmdline(self.pid)
+        return self._cmdline
+
+    def window_titles(self):
+        """Titles of the process's top-level windows, read now; None where unsupported."""
+        return self._backend.window_titles(self.pid)
+
+    def __repr__(self):
+        return f"<Process {self.pid} {self.name}>"
+
+
+class ProcessBackend:
+    """
+    Enumerates processes: `list()` returns {pid: (name, started)} for every
+    running process, `started` being the start time where the platform gives
+    it cheaply (else None); together with the pid it identifies a process.
+    """
+
+    @classmethod
+    def available(cls):
+        return False
+
+    def list(self):
+        raise NotImplementedError
+
+    def cmdline(self, pid):
+        """Argument list of `pid` ([] if it is gone or not readable)."""
+        return []
+
+    def window_titles(self, pid):
+        """Titles of the visible top-level windows of `pid`; None if the platform can't tell."""
+        return None
+
+
+class ProcFsBackend(ProcessBackend):
+    """Reads /proc/<pid>/stat once per new process and /proc/<pid>/cmdline on demand."""
+
+    @classmethod
+    def available(cls):
+        return sys.platform.startswith('linux') and os.path.isdir('/proc/self')
+
+    def __init__(self):
+        self._known = {}  # pid -> (name, start time)
+
+    def list(self):
+        known = {}
+        for entry in os.listdir('/proc'):
+            if not entry.isdigit():
+                continue
+            pid = int(entry)
+            described = self._known.get(pid)
+            if described is None:
+                described = self._describe(pid)
+                if described is None:
+                    continue  # exited meanwhile
+            known[pid] = described
+        # A pid missing from one listing is read again if it comes back (reused)
+        self._known = known
+        return known
+
+    @staticmethod
+    def _describe(pid):
+        try:
+            with open(f'/proc/{pid}/stat', 'rb') as f:
+                stat = f.read()
+        except OSError:
+            return None
+        # "pid (comm) state ..."; comm may itself contain spaces and parentheses
+        open_paren, close_paren = stat.find(b'('), stat.rfind(b')')
+        fields = stat[close_paren + 2:].split()
+        if open_paren < 0 or close_paren < 0 or len(fields) < 20:
+            return None
+        # Field 22 (start time) tells a reused pid apart from the old process
+        return stat[open_paren + 1:close_paren].decode('utf-8', 'replace'), int(fields[19])
+
+    def cmdline(self, pid):
+        try:
+            with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                raw = f.read()
+        except OSError:
+            return []
+        return [arg.decode('utf-8', 'replace') for arg in raw.split(b'\0') if arg]
+
+
+class WindowsBackend(ProcessBackend):
+    """Toolhelp32 for the process list, NtQueryInformationProcess for command lines, EnumWindows for titles."""
+
+    TH32CS_SNAPPROCESS = 0x2
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    PROCESS_COMMAND_LINE_INFORMATION = 60
+    STATUS_INFO_LENGTH_MISMATCH = 0xC0000004
+    INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
+    @classmethod
+    def available(cls):
+        return os.name == 'nt'
+
+    def __init__(self):
+        from ctypes import wintypes
+
+        class PROCESSENTRY32W(ctypes.Structure):
+            _fields_ = [('dwSize', wintypes.DWORD), ('cntUsage', wintypes.DWORD),
+                        ('th32ProcessID', wintypes.DWORD), ('th32DefaultHeapID', ctypes.c_void_p),
+                        ('th32ModuleID', wintypes.DWORD), ('cntThreads', wintypes.DWORD),
+                        ('th32ParentProcessID', wintypes.DWORD), ('pcPriClassBase', ctypes.c_long),
+                        ('dwFlags', wintypes.DWORD), ('szExeFile', ctypes.c_wchar * 260)]
+
+        class UNICODE_STRING(ctypes.Structure):
+            _fields_ = [('Length', wintypes.USHORT), ('MaximumLength', wintypes.USHORT),
+                        ('Buffer', ctypes.c_void_p)]
+
+        self._entry_type = PROCESSENTRY32W
+        self._unicode_string = UNICODE_STRING
+        self._kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        self._ntdll = ctypes.WinDLL('ntdll')
+        self._user32 = ctypes.WinDLL('user32')
+        self._enum_windows_proc = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+        self._user32.EnumWindows.argtypes = [self._enum_windows_proc, wintypes.LPARAM]
+        self._user32.GetWindowThreadProcessId.argtypes = [wintypes.HWND, ctypes.POINTER(wintypes.DWORD)]
+        self._user32.IsWindowVisible.argtypes = [wintypes.HWND]
+        self._user32.GetWindowTextLengthW.argtypes = [wintypes.HWND]
+        self._user32.GetWindowTextW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+        self._kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+        self._kernel32.CreateToolhelp32Snapshot.argtypes = [wintypes.DWORD, wintypes.DWORD]
+        self._kernel32.Process32FirstW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+        self._kernel32.Process32NextW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+        self._kernel32.OpenProcess.restype = wintypes.HANDLE
+        self._kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+        self._kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+        self._ntdll.NtQueryInformationProcess.restype = ctypes.c_ulong
+        self._ntdll.NtQueryInformationProcess.argtypes = [wintypes.HANDLE, ctypes.c_int, ctypes.c_void_p,
+                                                          wintypes.ULONG, ctypes.POINTER(wintypes.ULONG)]
+
+    def list(self):
+        snapshot = self._kernel32.CreateToolhelp32Snapshot(self.TH32CS_SNAPPROCESS, 0)
+        if not snapshot or snapshot == self.INVALID_HANDLE_VALUE:
+            return {}
+        processes = {}
+        try:
+            entry = self._entry_type()
+            entry.dwSize = ctypes.sizeof(entry)
+            ok = self._kernel32.Process32FirstW(snapshot, ctypes.byref(entry))
+            while ok:
+                processes[entry.th32ProcessID] = (entry.szExeFile, None)
+                ok = self._kernel32.Process32NextW(snapshot, ctypes.byref(entry))
+        finally:
+            self._kernel32.CloseHandle(snapshot)
+        return processes
+
+    def cmdline(self, pid):
+        from ctypes import wintypes
+        handle = self._kernel32.OpenProcess(self.PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return []
+        try:
+            size = wintypes.ULONG(0)
+            status = self._ntdll.NtQueryInformationProcess(handle, self.PROCESS_COMMAND_LINE_INFORMATION,
+                                                           None, 0, ctypes.byref(size))
+            if status != self.STATUS_INFO_LENGTH_MISMATCH or not size.value:
+                return []
+            buffer = ctypes.create_string_buffer(size.value)
+            status = self._ntdll.NtQueryInformationProcess(handle, self.PROCESS_COMMAND_LINE_INFORMATION,
+                                                           buffer, size, ctypes.byref(size))
+            if status != 0:
+                return []
+            text = self._unicode_string.from_buffer(buffer)
+            if not text.Buffer:
+                return []
+            return _split_windows_command_line(ctypes.wstring_at(text.Buffer, text.Length // 2))
+        finally:
+            self._kernel32.CloseHandle(handle)
+
+    def window_titles(self, pid):
+        from ctypes import wintypes
+        titles = []
+
+        def visit(hwnd, _):
+            owner = wintypes.DWORD()
+            self._user32.GetWindowThreadProcessId(hwnd, ctypes.byref(owner))
+            if owner.value == pid and self._user32.IsWindowVisible(hwnd):
+                length = self._user32.GetWindowTextLengthW(hwnd)
+                if length:
+                    buffer = ctypes.create_unicode_buffer(length + 1)
+                    self._user32.GetWindowTextW(hwnd, buffer, length + 1)
+                    titles.append(buffer.value)
+            return True
+        self._user32.EnumWindows(self._enum_windows_proc(visit), 0)
+        return titles
+
+
+class PsBackend(ProcessBackend):
+    """Portable fallback: `ps` once per scan (command lines come with the list)."""
+
+    @classmethod
+    def available(cls):
+        return os.name == 'posix'
+
+    def __init__(self):
+        self._args = {}
+
+    def list(self):
+        try:
+            result = subprocess.run(['ps', '-axo', 'pid=,comm=,args='], capture_output=True,
+                                    text=True, errors='replace', timeout=5)
+        except (OSError, subprocess.SubprocessError):
+            return {}
+        processes = {}
+        args = {}
+        for line in result.stdout.splitlines():
+            parts = line.split(None, 2)
+            if len(parts) < 2 or not parts[0].isdigit():
+                continue
+            pid = int(parts[0])
+            processes[pid] = (os.path.basename(parts[1]), None)
+            args[pid] = parts[2].split() if len(parts) > 2 else []
+        self._args = args
+        return processes
+
+    def cmdline(self, pid):
+        return self._args.get(pid, [])
+
+
+def _split_windows_command_line(text):
+    """Split a Windows command line (CommandLineToArgvW rules, enough for paths)."""
+    args = []
+    current = []
+    quoted = False
+    in_arg = False
+    for ch in text:
+        if ch == '"':
+            quoted = not quoted
+            in_arg = True
+        elif ch in ' \t' and not quoted:
+            if in_arg:
+                args.append(''.join(current))
+                current = []
+                in_arg = False
+        else:
+            current.append(ch)
+            in_arg = True
+    if in_arg:
+        args.append(''.join(current))
+    return args
+
+
+def _record_failure(command, started):
+    get_tracer().record(Span(command, '', started, time.time() - started, 1, 0, ''))
+
+
+def create_backend():
+    for backend in (ProcFsBackend, WindowsBackend, PsBackend):
+        if backend.available():
+            try:
+                return backend()
+            except (OSError, AttributeError) as e:
+                print(f"[DEBUG] ProcessMonitor: {backend.__name__} unavailable: {e}")
+    return None
+
+
+class ProcessMonitor:
+    """
+    Watches for processes matching a predicate and reports start/stop events.
+
+    Usage:
+        monitor = ProcessMonitor()
+        monitor.watch('editor:/work/Game/Game.uproject',
+                      lambda process: process.name == 'UnrealEditor',
+                      lambda event, key, process: print(event, process.pid))
+        monitor.sessions('editor:/work/Game/Game.uproject')   # [ProcessInfo]
+        monitor.unwatch('editor:/work/Game/Game.uproject')
+    """
+
+    def __init__(self, backend=None, interval=DEFAULT_INTERVAL):
+        self.backend = backend or create_backend()
+        self.interval = interval
+        self._lock = threading.RLock()
+        self._processes = {}
+        self._scanned = False
+        self._watches = {}
+        self._sessions = {}
+        self._wake = threading.Event()
+        self._thread = None
+
+    # ---- watches ----
+
+    def watch(self, key, predicate, callback=None):
+        """
+        Track the processes for which `predicate(process)` is true under
+        `key`. Running matches are known immediately (no event is sent for
+        them); later starts and exits call `callback(event, key, process)`.
+        A process the predicate answers None for is asked again each scan.
+        """
+        with self._lock:
+            if not self._scanned:
+                self.scan()
+            watch = self._watches.setdefault(key, {'predicate': predicate, 'callbacks': []})
+            watch['predicate'] = predicate
+            if callback is not None and callback not in watch['callbacks']:
+                watch['callbacks'].append(callback)
+            sessions = {}
+            undecided = set()
+            for pid, process in self._processes.items():
+                matched = self._matches(predicate, process)
+                if matched:
+                    sessions[pid] = process
+                elif matched is None:
+                    undecided.add(pid)
+            self._sessions[key] = sessions
+            watch['undecided'] = undecided
+            self._ensure_thread()
+
+    def unwatch(self, key, callback=None):
+        with self._lock:
+            watch = self._watches.get(key)
+            if watch is None:
+                return
+            if callback is not None and callback in watch['callbacks']:
+                watch['callbacks'].remove(callback)
+            if callback is None or not watch['callbacks']:
+                del self._watches[key]
+                self._sessions.pop(key, None)
+            if not self._watches:
+                self._wake.set()
+
+    def is_watching(self, key):
+        with self._lock:
+            return key in self._watches
+
+    def sessions(self, key):
+        """The running processes matched by watch `key`, oldest pid first."""
+        with self._lock:
+            return [self._sessions[key][pid] for pid in sorted(self._sessions.get(key, {}))]
+
+    def is_running(self, key):
+        with self._lock:
+            return bool(self._sessions.get(key))
+
+    @staticmethod
+    def _matches(predicate, process):
+        """True / False, or None when the predicate can't tell yet."""
+        started = time.time()
+        try:
+            matched = predicate(process)
+            return None if matched is None else bool(matched)
+        except Exception:
+            # Answered False, so a process is not asked (nor recorded) again
+            _record_failure('process-monitor predicate', started)
+            return False
+
+    # ---- scanning ----
+
+    def scan(self):
+        """Refresh the process table once; returns the [(event, key, process)] sent."""
+        if self.backend is None:
+            return []
+        current = self.backend.list()
+        events = []
+        with self._lock:
+            previous = self._processes
+            processes = {}
+            for pid, (name, started) in current.items():
+                known = previous.get(pid)
+                # A reused pid shows up with another name or start time
+                processes[pid] = known if known is not None and (known.name, known.started) == (name, started) else \
+                    ProcessInfo(pid, name, self.backend, started=started)
+            self._processes = processes
+            self._scanned = True
+            for key, watch in self._watches.items():
+                sessions = self._sessions.setdefault(key, {})
+                for pid in [pid for pid, process in sessions.items() if processes.get(pid) is not process]:
+                    events.append(('stopped', key, sessions.pop(pid), watch['callbacks']))
+                undecided = {pid for pid in watch['undecided'] if pid in processes and previous.get(pid) is processes[pid]}
+                watch['undecided'] = undecided
+                for pid, process in processes.items():
+                    if pid in sessions or (previous.get(pid) is process and pid not in undecided):
+                        continue
+                    matched = self._matches(watch['predicate'], process)
+                    if matched is None:
+                        undecided.add(pid)
+                        continue
+                    undecided.discard(pid)
+                    if matched:
+                        sessions[pid] = process
+                        events.append(('started', key, process, watch['callbacks']))
+        for event, key, process, callbacks in events:
+            for callback in list(callbacks):
+                started = time.time()
+                try:
+                    callback(event, key, process)
+                except Exception:
+                    _record_failure('process-monitor callback', started)
+        return [(event, key, process) for event, key, process, _ in events]
+
+    def _ensure_thread(self):
+        if self.backend is None or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._wake.clear()
+        self._thread = threading.Thread(target=self._run, name='ProcessMonitor', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        failing = False
+        while True:
+            self._wake.wait(self.interval)
+            with self._lock:
+                if not self._watches:
+                    # Nothing left to watch: let the thread end, watch() restarts it
+                    self._thread = None
+                    self._scanned = False
+                    self._processes = {}
+                    return
+            self._wake.clear()
+            started = time.time()
+            try:
+                self.scan()
+                failing = False
+            except Exception:
+                if not failing:
+                    # Once per failing streak: a broken backend fails every interval
+                    _record_failure('process-monitor scan', started)
+                failing = True
+
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+def get_process_monitor():
+    """The process-wide monitor (its thread starts with the first watch)."""
+    global _monitor
+    if _monitor is None:
+        with _monitor_lock:
+            if _monitor is None:
+                _monitor = ProcessMonitor()
+    return _monitor
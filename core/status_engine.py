@@ -0,0 +1,219 @@
+"""
+StatusEngine - Incremental `git status` with path-scoped refresh.
+
+The engine keeps the last status snapshot in memory. A full refresh runs
+`git status` over the whole tree; a scoped refresh re-queries only the
+given paths (files or directories, matched recursively) and merges the
+result into the snapshot, so a `git add` of one file in a huge repository
+does not cost a full-tree rescan.
+"""
+
+import bisect
+import os
+import stat
+import threading
+import time
+
+from core.status_parser import parse_porcelain_v2, StatusHeader
+
+# Above this many scoped paths a full rescan is cheaper than a long pathspec.
+MAX_SCOPED_PATHS = 200
+# Index writes made by this process within this window explain watcher
+# index events, so they do not force a full rescan.
+LOCAL_WRITE_WINDOW = 5.0
+
+
+def _empty_summary(error=None):
+    return {
+        'branch': 'unknown',
+        'head': None,
+        'upstream': None,
+        'ahead': 0,
+        'behind': 0,
+        'entries': [],
+        'large_files': [],
+        'error': error
+    }
+
+
+class StatusEngine:
+    """
+    Status snapshot for one repository.
+
+    Usage:
+        engine = StatusEngine(git_manager)
+        summary = engine.refresh()                         # full rescan
+        engine.note_local_change(['Content/Hero.uasset'])  # after git add
+        summary = engine.refresh(paths=set())              # only dirty paths
+        engine.size_hint = catalog.size_hint               # optional: known sizes, no stat
+    """
+
+    def __init__(self, git_manager):
+        self.git_manager = git_manager
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        # Optional callable(path) -> working tree size or None (e.g. the Unreal asset catalog)
+        self.size_hint = None
+        self.reset()
+
+    def reset(self):
+        self._entries = {}
+        self._sorted_paths = []
+        self._header = None
+        self._has_snapshot = False
+        self._dirty = set()
+        self._local_write_ts = 0.0
+        # path -> ((mtime_ns, size, threshold, matcher), large)
+        self._stat_cache = {}
+
+    @staticmethod
+    def _normalize(path):
+        return path.replace('\\', '/').strip('/')
+
+    def mark_dirty(self, paths):
+        """Queue paths (files or directories) for the next scoped refresh."""
+        with self._lock:
+            for path in paths or []:
+                self._dirty.add(self._normalize(path))
+
+    def note_local_change(self, paths):
+        """Record an index write made by this client for the given paths."""
+        self.mark_dirty(paths)
+        self._local_write_ts = time.monotonic()
+
+    def index_change_explained(self):
+        """True if a recent index change was caused by note_local_change()."""
+        return time.monotonic() - self._local_write_ts < LOCAL_WRITE_WINDOW
+
+    def summary(self):
+        """Return the current snapshot without running git (None if empty)."""
+        with self._lock:
+            if not self._has_snapshot:
+                return None
+            return self._build_summary()
+
+    def refresh(self, paths=None, include_sizes=False, size_threshold=100 * 1024 * 1024):
+        """
+        Refresh the snapshot and return a status summary.
+
+        paths=None rescans the whole tree. Otherwise only `paths` plus any
+        paths queued with mark_dirty() are re-queried and merged.
+        """
+        if not self.git_manager.repo_path:
+            return _empty_summary('repository path not set')
+
+        # _refresh_lock keeps refreshes in order; _lock is only held to read and
+        # merge the snapshot, so mark_dirty() (GUI thread) never waits on git.
+        with self._refresh_lock:
+            with self._lock:
+                scope = None
+                dirty, self._dirty = self._dirty, set()
+                if paths is not None and self._has_snapshot:
+                    scope = {self._normalize(p) for p in paths} | dirty
+                    if '' in scope or len(scope) > MAX_SCOPED_PATHS:
+                        scope = None
+                if scope is not None and not scope:
+                    return self._build_summary()
+
+            command = [
+                "git",
+                "-c",
+                "core.quotepath=false",
+                "status",
+                "--branch",
+                "--porcelain=v2",
+                "-z",
+                "-uall"
+            ]
+            if scope is not None:
+                command.append('--')
+                command.extend(f":(literal){p}" for p in sorted(scope))
+
+            success, output = self.git_manager.run_command_raw(command, timeout=10)
+            if not success or output is None:
+                with self._lock:
+                    # Keep the queued paths for the next scoped refresh
+                    self._dirty |= scope if scope is not None else dirty
+                return _empty_summary(output or 'git status failed')
+
+            header, items = parse_porcelain_v2(output)
+            if include_sizes:
+                matcher = self.git_manager.get_lfs_matcher()
+                for entry in items:
+                    entry.large = self._is_large(entry, size_threshold, matcher)
+
+            with self._lock:
+                if scope is None:
+                    self._entries = {}
+                    self._sorted_paths = []
+                    stale = set(self._stat_cache)
+                else:
+                    self._drop_scope(scope)
+                    stale = set()
+
+                for entry in items:
+                    stale.discard(entry.path)
+                    if entry.path not in self._entries:
+                        bisect.insort(self._sorted_paths, entry.path)
+                    self._entries[entry.path] = entry
+
+                for path in stale:
+                    self._stat_cache.pop(path, None)
+
+                self._header = header
+                self._has_snapshot = True
+                return self._build_summary()
+
+    def _drop_scope(self, scope):
+        for prefix in scope:
+            if prefix in self._entries:
+                del self._entries[prefix]
+                index = bisect.bisect_left(self._sorted_paths, prefix)
+                del self._sorted_paths[index]
+            # Everything under prefix/ sorts between "prefix/" and "prefix0".
+            start = bisect.bisect_left(self._sorted_paths, prefix + '/')
+            end = bisect.bisect_left(self._sorted_paths, prefix + '0')
+            if start < end:
+                for path in self._sorted_paths[start:end]:
+                    del self._entries[path]
+                del self._sorted_paths[start:end]
+
+    def _is_large(self, entry, size_threshold, matcher):
+        """
+        Large-file flag for an entry, reusing the last answer while the
+        file's (mtime, size) is unchanged. Costs one stat per call unless
+        size_hint knows the size.
+        """
+        if entry.state.startswith('D') or entry.is_submodule:
+            return False
+        size = self.size_hint(entry.path) if self.size_hint is not None else None
+        if size is not None:
+            return size > size_threshold and not matcher.matches(entry.path)
+        try:
+            st = os.stat(os.path.join(self.git_manager.repo_path, entry.path))
+        except OSError:
+            self._stat_cache.pop(entry.path, None)
+            return False
+        if not stat.S_ISREG(st.st_mode):
+            return False
+        key = (st.st_mtime_ns, st.st_size, size_threshold, matcher)
+        cached = self._stat_cache.get(entry.path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        large = st.st_size > size_threshold and not matcher.matches(entry.path)
+        self._stat_cache[entry.path] = (key, large)
+        return large
+
+    def _build_summary(self):
+        header = self._header or StatusHeader()
+        entries = [self._entries[p] for p in self._sorted_paths]
+        return {
+            'branch': header.head,
+            'head': header.oid,
+            'upstream': header.upstream,
+            'ahead': header.ahead,
+            'behind': header.behind,
+            'entries': entries,
+            'large_files': [e.path for e in entries if e.large],
+            'error': None
+        }
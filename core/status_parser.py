@@ -0,0 +1,160 @@
+"""
+Status parser - Decodes `git status --porcelain=v2 -z --branch` output.
+
+Records are NUL-terminated, so paths never need unquoting and a rename's
+origin arrives as its own field instead of being split on ' -> '. The
+output is walked once as bytes; each path is decoded exactly once.
+"""
+
+# Record kinds as emitted by porcelain v2.
+KIND_ORDINARY = '1'
+KIND_RENAMED = '2'
+KIND_UNMERGED = 'u'
+KIND_UNTRACKED = '?'
+KIND_IGNORED = '!'
+
+NULL_OID = '0' * 40
+
+
+class StatusEntry:
+    """
+    One changed path from `git status`.
+
+    path        repository-relative path (new name for renames/copies)
+    state       short status code, same spelling as porcelain v1 ('M', 'A', 'MM', '??', 'UU'...)
+    xy          raw two-letter v2 code with '.' for unchanged ('.M', 'R.', '??')
+    kind        '1' ordinary, '2' renamed/copied, 'u' unmerged, '?' untracked
+    orig_path   source path of a rename or copy, else None
+    score       rename/copy score such as 'R100', else None
+    submodule   None for plain files, else (commit_changed, modified, untracked)
+    head_oid    object id in HEAD, "ours" for unmerged paths (None if absent)
+    index_oid   object id in the index (None if absent or unmerged)
+    large       set by the status engine when the file exceeds the size threshold
+    """
+    __slots__ = ('path', 'state', 'xy', 'kind', 'orig_path', 'score',
+                 'submodule', 'head_oid', 'index_oid', 'large')
+
+    def __init__(self, path, xy, kind, orig_path=None, score=None, submodule=None,
+                 head_oid=None, index_oid=None, large=False):
+        self.path = path
+        self.xy = xy
+        self.state = xy.replace('.', ' ').strip() or '??'
+        self.kind = kind
+        self.orig_path = orig_path
+        self.score = score
+        self.submodule = submodule
+        self.head_oid = head_oid
+        self.index_oid = index_oid
+        self.large = large
+
+    @property
+    def is_submodule(self):
+        return self.submodule is not None
+
+    def __eq__(self, other):
+        if not isinstance(other, StatusEntry):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f"StatusEntry({self.state!r}, {self.path!r})"
+
+
+class StatusHeader:
+    """Branch information from the `# branch.*` header lines."""
+    __slots__ = ('oid', 'head', 'upstream', 'ahead', 'behind')
+
+    def __init__(self):
+        self.oid = None        # None on an unborn branch
+        self.head = 'unknown'  # 'HEAD' when detached
+        self.upstream = None
+        self.ahead = 0
+        self.behind = 0
+
+
+def _decode(raw):
+    return raw.decode('utf-8', errors='replace')
+
+
+def _oid(raw):
+    oid = raw.decode('ascii', errors='replace')
+    return None if oid == NULL_OID else oid
+
+
+def _submodule(raw):
+    # 'N...' for a plain path, 'S<c><m><u>' for a submodule.
+    if raw[:1] != b'S':
+        return None
+    return (raw[1:2] == b'C', raw[2:3] == b'M', raw[3:4] == b'U')
+
+
+def _parse_header(record, header):
+    key, _, value = record[2:].partition(b' ')
+    if key == b'branch.oid':
+        header.oid = None if value == b'(initial)' else value.decode('ascii', errors='replace')
+    elif key == b'branch.head':
+        header.head = 'HEAD' if value == b'(detached)' else _decode(value)
+    elif key == b'branch.upstream':
+        header.upstream = _decode(value)
+    elif key == b'branch.ab':
+        ahead, _, behind = value.partition(b' ')
+        try:
+            header.ahead = int(ahead.lstrip(b'+'))
+            header.behind = int(behind.lstrip(b'-'))
+        except ValueError:
+            pass
+
+
+def parse_porcelain_v2(data):
+    """
+    Parse `git status --porcelain=v2 -z --branch` bytes.
+
+    Returns (StatusHeader, [StatusEntry]). Ignored ('!') records are skipped.
+    """
+    header = StatusHeader()
+    entries = []
+    fields = data.split(b'\0')
+    count = len(fields)
+    i = 0
+    while i < count:
+        record = fields[i]
+        i += 1
+        if not record:
+            continue
+        kind = record[:1]
+
+        if kind == b'1':
+            # 1 XY sub mH mI mW hH hI path
+            parts = record.split(b' ', 8)
+            if len(parts) != 9:
+                continue
+            entries.append(StatusEntry(
+                _decode(parts[8]), _decode(parts[1]), KIND_ORDINARY,
+                submodule=_submodule(parts[2]),
+                head_oid=_oid(parts[6]), index_oid=_oid(parts[7])))
+        elif kind == b'2':
+            # 2 XY sub mH mI mW hH hI Xscore path NUL origPath
+            parts = record.split(b' ', 9)
+            if len(parts) != 10:
+                continue
+            orig_path = _decode(fields[i]) if i < count else None
+            i += 1
+            entries.append(StatusEntry(
+                _decode(parts[9]), _decode(parts[1]), KIND_RENAMED,
+                orig_path=orig_path, score=_decode(parts[8]),
+                submodule=_submodule(parts[2]),
+                head_oid=_oid(parts[6]), index_oid=_oid(parts[7])))
+        elif kind == b'u':
+            # u XY sub m1 m2 m3 mW h1 h2 h3 path
+            parts = record.split(b' ', 10)
+            if len(parts) != 11:
+                continue
+            entries.append(StatusEntry(
+                _decode(parts[10]), _decode(parts[1]), KIND_UNMERGED,
+                submodule=_submodule(parts[2]),
+                head_oid=_oid(parts[8])))
+        elif kind == b'?':
+            entries.append(StatusEntry(_decode(record[2:]), '??', KIND_UNTRACKED))
+        elif kind == b'#':
+            _parse_header(record, header)
+    return header, entries
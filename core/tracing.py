@@ -0,0 +1,203 @@
+"""
+Tracing - Per-command spans for every git process the client starts.
+
+`GitManager` wraps each git invocation in `trace_command()`, which records
+a Span: the command class (`git show`, `git lfs locks`, ...), repository,
+duration, exit code and bytes of output. Spans go into an in-memory ring
+buffer; an optional JSONL sink appends them to a file so traces can be
+collected from artist machines and compared across versions.
+
+Set UNREAL_GIT_TRACE=<path> to start with the sink enabled, or toggle it
+from the developer panel (Ctrl+Shift+D).
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque, namedtuple
+from contextlib import contextmanager
+from pathlib import Path
+
+from core.job_context import current_job
+
+DEFAULT_CAPACITY = 5000
+TRACE_ENV = 'UNREAL_GIT_TRACE'
+
+Span = namedtuple('Span', 'command repo start duration exit_code bytes_out job')
+
+# Options of `git` itself that take a separate value
+_GIT_VALUE_OPTIONS = frozenset(('-c', '-C', '--git-dir', '--work-tree', '--namespace', '--exec-path'))
+# Commands whose first argument is a subcommand worth keeping apart
+_SUBCOMMAND_GROUPS = frozenset(('lfs', 'stash', 'remote', 'submodule', 'worktree', 'config', 'notes'))
+
+
+def command_class(command):
+    """`['git', '-c', 'x=y', 'lfs', 'locks', '--json']` -> 'git lfs locks'."""
+    argv = command.split() if isinstance(command, str) else list(command)
+    if not argv:
+        return '?'
+    program = os.path.basename(argv[0])
+    if program.lower().endswith('.exe'):
+        program = program[:-4]
+    if program != 'git':
+        return program
+    words = ['git']
+    i = 1
+    while i < len(argv):
+        arg = argv[i]
+        if arg in _GIT_VALUE_OPTIONS:
+            i += 2
+            continue
+        if arg.startswith('-'):
+            i += 1
+            continue
+        words.append(arg)
+        if arg in _SUBCOMMAND_GROUPS and i + 1 < len(argv) and not argv[i + 1].startswith('-'):
+            words.append(argv[i + 1])
+        break
+    return ' '.join(words)
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class _OpenSpan:
+    """Filled in by the caller while the command runs."""
+    __slots__ = ('exit_code', 'bytes_out')
+
+    def __init__(self):
+        self.exit_code = None
+        self.bytes_out = 0
+
+
+class Tracer:
+    """
+    Ring buffer of command spans with an optional JSONL sink.
+
+    Usage:
+        tracer = get_tracer()
+        with tracer.trace(['git', 'status'], repo_path) as span:
+            result = subprocess.run(...)
+            span.exit_code = result.returncode
+            span.bytes_out = len(result.stdout)
+        tracer.summary()          # per command class, slowest total first
+        tracer.set_sink('~/git-trace.jsonl')
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, sink_path=None):
+        self._spans = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._sink = None
+        self.sink_path = None
+        if sink_path:
+            self.set_sink(sink_path)
+
+    @contextmanager
+    def trace(self, command, repo=None):
+        span = _OpenSpan()
+        start = time.time()
+        started = time.perf_counter()
+        try:
+            yield span
+        finally:
+            duration = time.perf_counter() - started
+            job = current_job()
+            self.record(Span(command_class(command), repo or '', start, duration,
+                             -1 if span.exit_code is None else span.exit_code,
+                             span.bytes_out, job.name if job is not None else ''))
+
+    def record(self, span):
+        with self._lock:
+            self._spans.append(span)
+            if self._sink is not None:
+                try:
+                    self._sink.write(json.dumps(span._asdict(), ensure_ascii=False) + '\n')
+                    self._sink.flush()
+                except (OSError, ValueError) as e:
+                    print(f"[DEBUG] Tracer: sink write failed, disabling it: {e}")
+                    self._close_sink()
+
+    def spans(self):
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+
+    def summary(self):
+        """[{command, calls, total, mean, p95, max, errors, bytes_out}] sorted by total time."""
+        groups = {}
+        for span in self.spans():
+            groups.setdefault(span.command, []).append(span)
+        rows = []
+        for command, spans in groups.items():
+            durations = sorted(span.duration for span in spans)
+            total = sum(durations)
+            rows.append({
+                'command': command,
+                'calls': len(spans),
+                'total': total,
+                'mean': total / len(spans),
+                'p95': _percentile(durations, 0.95),
+                'max': durations[-1],
+                'errors': sum(1 for span in spans if span.exit_code != 0),
+                'bytes_out': sum(span.bytes_out for span in spans),
+            })
+        rows.sort(key=lambda row: row['total'], reverse=True)
+        return rows
+
+    # ---- sink ----
+
+    def set_sink(self, path):
+        """Append every new span to `path` as one JSON object per line (None to stop)."""
+        with self._lock:
+            self._close_sink()
+            if not path:
+                return True
+            try:
+                path = Path(path).expanduser()
+                path.parent.mkdir(parents=True, exist_ok=True)
+                self._sink = open(path, 'a', encoding='utf-8')
+                self.sink_path = str(path)
+                return True
+            except OSError as e:
+                print(f"[DEBUG] Tracer: cannot open sink {path}: {e}")
+                return False
+
+    def _close_sink(self):
+        if self._sink is not None:
+            try:
+                self._sink.close()
+            except OSError:
+                pass
+        self._sink = None
+        self.sink_path = None
+
+
+def default_sink_path():
+    return Path.home() / '.unreal-git-client' / 'traces' / f"git-{time.strftime('%Y%m%d')}.jsonl"
+
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer():
+    """The process-wide tracer (the sink starts enabled if UNREAL_GIT_TRACE is set)."""
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = Tracer(sink_path=os.environ.get(TRACE_ENV) or None)
+    return _tracer
+
+
+def trace_command(command, repo=None):
+    """Shorthand for `get_tracer().trace(command, repo)`."""
+    return get_tracer().trace(command, repo)
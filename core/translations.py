@@ -312,6 +312,33 @@ class TranslationManager:
                 'no_repo_loaded': 'No hay repositorio cargado',
                 'no_changes': 'No hay cambios - Todo está actualizado',
                 'select_file_diff': 'Selecciona un archivo para ver sus cambios...',
+                'diff_binary_file': 'archivo binario',
+                'diff_lfs_file': 'Git LFS',
+                'diff_size': 'Tamaño',
+                'diff_lfs_oid': 'Objeto LFS',
+                'diff_lfs_unchanged': 'sin cambios',
+                'diff_locked_by': 'Bloqueado por',
+                'diff_not_present': 'no existe',
+                'diff_load_more': 'Mostrando {shown} de {total} líneas - Cargar más',
+                'dev_panel_title': 'Panel de desarrollo - comandos Git',
+                'dev_panel_command': 'Comando',
+                'dev_panel_calls': 'Llamadas',
+                'dev_panel_total': 'Total',
+                'dev_panel_mean': 'Media',
+                'dev_panel_p95': 'p95',
+                'dev_panel_max': 'Máx.',
+                'dev_panel_errors': 'Errores',
+                'dev_panel_output': 'Salida',
+                'dev_panel_clear': 'Limpiar',
+                'dev_panel_record': 'Grabar en archivo',
+                'dev_panel_stop_recording': 'Detener grabación',
+                'dev_panel_recording_to': 'Grabando en {path}',
+                'dev_panel_jobs': 'Tareas: {running} en curso, {pending} en cola, {workers} hilos',
+                'dev_panel_plugins': 'Plugins importados: {loaded} · sin importar: {pending}',
+                'referenced_by_count': 'usado por {count}',
+                'referenced_by': 'Referenciado por:',
+                'referenced_by_more': '… y {count} más',
+                'soft_reference': '(referencia suave)',
                 
                 'unreal_project': 'Proyecto Unreal',
                 'project_type': 'Tipo',
@@ -895,6 +922,33 @@ class TranslationManager:
                 'no_repo_loaded': 'No repository loaded',
                 'no_changes': 'No changes - Everything is up to date',
                 'select_file_diff': 'Select a file to view its changes...',
+                'diff_binary_file': 'binary file',
+                'diff_lfs_file': 'Git LFS',
+                'diff_size': 'Size',
+                'diff_lfs_oid': 'LFS object',
+                'diff_lfs_unchanged': 'unchanged',
+                'diff_locked_by': 'Locked by',
+                'diff_not_present': 'not present',
+                'diff_load_more': 'Showing {shown} of {total} lines - Load more',
+                'dev_panel_title': 'Developer panel - Git commands',
+                'dev_panel_command': 'Command',
+                'dev_panel_calls': 'Calls',
+                'dev_panel_total': 'Total',
+                'dev_panel_mean': 'Mean',
+                'dev_panel_p95': 'p95',
+                'dev_panel_max': 'Max',
+                'dev_panel_errors': 'Errors',
+                'dev_panel_output': 'Output',
+                'dev_panel_clear': 'Clear',
+                'dev_panel_record': 'Record to file',
+                'dev_panel_stop_recording': 'Stop recording',
+                'dev_panel_recording_to': 'Recording to {path}',
+                'dev_panel_jobs': 'Jobs: {running} running, {pending} queued, {workers} threads',
+                'dev_panel_plugins': 'Plugins imported: {loaded} · not imported yet: {pending}',
+                'referenced_by_count': 'used by {count}',
+                'referenced_by': 'Referenced by:',
+                'referenced_by_more': '… and {count} more',
+                'soft_reference': '(soft reference)',
                 
                 'unreal_project': 'Unreal Project',
                 'project_type': 'Type',
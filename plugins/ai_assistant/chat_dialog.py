@@ -14,6 +14,7 @@ from PyQt6.QtGui import QFont, QIcon, QTextCursor
 from ui.theme import get_current_theme
 from ui.icon_manager import IconManager
 from core.translations import get_translation_manager
+from core.job_scheduler import get_job_scheduler, PRIORITY_BACKGROUND, SHARE
 from PyQt6.QtWidgets import QApplication
 from llama_cpp import llama_cpp
 
@@ -117,9 +118,11 @@ class Worker(QThread):
             self.finished.emit()
 
 class ChatWidget(QWidget):
-    def __init__(self, repo_path, parent=None):
+    def __init__(self, repo_path, parent=None, plugin_manager=None):
         super().__init__(parent)
         self.repo_path = repo_path
+        self.plugin_manager = plugin_manager
+        self.asset_catalog = None
         self.icon_manager = IconManager()
         self.llm = None
 
@@ -140,6 +143,7 @@ class ChatWidget(QWidget):
                 pass
 
         repo_context = self._build_repo_context(include_size=False)
+        self._load_asset_catalog()
 
         app_name = self._get_application_name()
         repo_name, repo_remote = self._get_repo_info(repo_path)
@@ -722,6 +726,7 @@ class ChatWidget(QWidget):
 
     def set_repo_path(self, repo_path: str):
         self.repo_path = repo_path
+        self._load_asset_catalog()
         repo_context = self._build_repo_context(include_size=False)
         repo_name, repo_remote = self._get_repo_info(repo_path)
         system_intro = f"You are the AI Assistant for the '{self._get_application_name()}' application. Current repository: {repo_name} ({repo_remote or 'no remote'})"
@@ -860,6 +865,27 @@ class ChatWidget(QWidget):
 
         return "\n".join(lines)
 
+    def _load_asset_catalog(self):
+        """Get the repository's asset catalog (Unreal plugin) up to date in the background."""
+        self.asset_catalog = None
+        repo_path = self.repo_path
+        plugin_manager = self.plugin_manager
+        if not plugin_manager or not repo_path:
+            return
+
+        def task():
+            catalog = plugin_manager.get_asset_catalog(repo_path)
+            if catalog is not None:
+                catalog.refresh()
+            return repo_path, catalog
+        get_job_scheduler().submit(task, priority=PRIORITY_BACKGROUND, repo=repo_path, key='asset-catalog-ai',
+                                   mode=SHARE, name='asset-catalog', on_result=self._on_asset_catalog)
+
+    def _on_asset_catalog(self, result):
+        repo_path, catalog = result
+        if repo_path == self.repo_path:
+            self.asset_catalog = catalog
+
     def _find_uproject(self, repo_path: str) -> str | None:
         try:
             for entry in os.scandir(repo_path):
@@ -868,11 +894,18 @@ class ChatWidget(QWidget):
         except Exception:
             pass
 
+        # Nested project: ask the index instead of walking the tree
         try:
-            for root, dirs, files in os.walk(repo_path):
-                for f in files:
-                    if f.lower().endswith('.uproject'):
-                        return os.path.join(root, f)
+            result = subprocess.run(
+                ["git", "-C", repo_path, "ls-files", "-z", "--cached", "--others", "--exclude-standard",
+                 "--", ":(glob,icase)**/*.uproject"],
+                capture_output=True,
+                timeout=3,
+            )
+            if result.returncode == 0:
+                for rel in result.stdout.decode("utf-8", errors="replace").split("\0"):
+                    if rel:
+                        return os.path.join(repo_path, rel)
         except Exception:
             return None
 
@@ -936,32 +969,38 @@ class ChatWidget(QWidget):
                     text=True,
                     timeout=3,
                 )
-                if result.returncode == 0:
-                    git_dir = result.stdout.strip()
-                    if not os.path.isabs(git_dir):
-                        git_dir = os.path.join(repo_path, git_dir)
-                    git_dir_size = self._safe_directory_size(git_dir, time_limit_s=5.0, file_limit=200000)
-                # Try to get git object size estimate via git count-objects
+                # Git object size estimate via git count-objects; walk .git only without it
                 try:
                     co = subprocess.run(["git", "-C", repo_path, "count-objects", "-vH"], capture_output=True, text=True, timeout=2)
                     if co.returncode == 0 and co.stdout:
                         for line in co.stdout.splitlines():
                             if line.lower().startswith("size-pack:") or line.lower().startswith("size:"):
                                 pack_est = line.split(':', 1)[1].strip()
-                                git_dir_size = git_dir_size or 0
                                 git_dir_size = f"{pack_est} (git objects estimate)"
                                 break
                 except Exception:
                     pass
+                if git_dir_size is None and result.returncode == 0:
+                    git_dir = result.stdout.strip()
+                    if not os.path.isabs(git_dir):
+                        git_dir = os.path.join(repo_path, git_dir)
+                    git_dir_size = self._safe_directory_size(git_dir, time_limit_s=5.0, file_limit=200000)
             except Exception:
                 pass
 
-        try:
-            worktree_size = self._safe_directory_size(repo_path, time_limit_s=5.0, file_limit=200000, exclude_dirs={".git"})
-        except Exception:
-            pass
+        # Unreal projects: the asset catalog already knows every package and its size
+        assets = self.asset_catalog.summary() if self.asset_catalog is not None else None
+        if assets is None:
+            try:
+                worktree_size = self._safe_directory_size(repo_path, time_limit_s=5.0, file_limit=200000, exclude_dirs={".git"})
+            except Exception:
+                pass
 
         parts = []
+        if assets is not None:
+            parts.append(
+                f"Unreal assets: {assets['assets']} packages ({assets['maps']} maps) ~{self._format_bytes(assets['total_size'])}, "
+                f"{assets['lfs']} in LFS, {assets['locked']} locked")
         if worktree_size is not None:
             if isinstance(worktree_size, str):
                 parts.append(f"working tree ~{worktree_size}")
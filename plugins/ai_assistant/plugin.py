@@ -3,14 +3,21 @@ import os
 import sys
 import importlib.util
 
-# Manually load chat_dialog module to avoid relative import issues with plugin loader
-current_dir = os.path.dirname(os.path.abspath(__file__))
-chat_dialog_path = os.path.join(current_dir, "chat_dialog.py")
 
-spec = importlib.util.spec_from_file_location("ai_assistant_chat_dialog", chat_dialog_path)
-chat_dialog_module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(chat_dialog_module)
-ChatWidget = chat_dialog_module.ChatWidget
+def _load_chat_widget_class():
+    """Import chat_dialog (requests, llama_cpp) only when a chat widget is first needed."""
+    module = sys.modules.get("ai_assistant_chat_dialog")
+    if module is None:
+        # Manually load chat_dialog module to avoid relative import issues with plugin loader
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        chat_dialog_path = os.path.join(current_dir, "chat_dialog.py")
+
+        spec = importlib.util.spec_from_file_location("ai_assistant_chat_dialog", chat_dialog_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules["ai_assistant_chat_dialog"] = module
+    return module.ChatWidget
+
 
 class Plugin(PluginInterface):
     def __init__(self):
@@ -38,7 +45,7 @@ class Plugin(PluginInterface):
         return []
     
     def get_sidebar_widget(self, repo_path):
-        widget = ChatWidget(repo_path)
+        widget = _load_chat_widget_class()(repo_path, plugin_manager=self.plugin_manager)
         key = f"{repo_path or '__no_repo__'}-{id(widget)}"
         self.chat_widgets[key] = widget
         return widget
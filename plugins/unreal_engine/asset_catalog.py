@@ -0,0 +1,503 @@
+"""
+AssetCatalog - Indexed list of the Unreal packages (.uasset/.umap) of a repository.
+
+The catalog answers "which assets exist, how big are they, are they in LFS,
+who holds the lock" without walking the tree. It is built once from
+`git ls-files -s` (tracked) and `git ls-files -o` (untracked), stored in a
+SQLite database next to the persistent commit cache
+(`~/.unreal-git-client/cache/<repo-id>/assets.sqlite3`), and kept current
+incrementally:
+
+- file watcher events mark individual assets dirty; only those are
+  re-stat'ed on the next refresh;
+- index/ref changes (commit, checkout, pull) re-run `git ls-files -s` and
+  only describe assets whose blob id changed;
+- on the first refresh of a session `git diff-files` finds the assets
+  modified while the client was closed.
+
+LFS pointer files report the size of the real object. When a
+`package_reader` is set (see package_reader.read_package) every described
+asset also has its header read: the real asset class and the packages it
+references go into a reverse-dependency table, so "what references this
+asset" is one indexed query. Without it, or for assets the reader can't
+decode (LFS pointers, cooked packages), the class comes from the naming
+convention prefix (BP_, M_, SM_, ...).
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from core.git_manager import GitManager
+from core.persistent_cache import default_cache_root, repo_id
+
+ASSET_EXTENSIONS = ('.uasset', '.umap')
+ASSET_PATHSPECS = [':(glob,icase)**/*.uasset', ':(glob,icase)**/*.umap']
+CATALOG_VERSION = 2
+LOCKS_MAX_AGE = 120.0
+LFS_POINTER_MAX_SIZE = 1024
+LFS_POINTER_PREFIX = b'version https://git-lfs'
+
+# Unreal naming convention prefixes -> asset class
+CLASS_PREFIXES = {
+    'BP': 'Blueprint', 'ABP': 'AnimBlueprint', 'WBP': 'WidgetBlueprint', 'BPI': 'BlueprintInterface',
+    'M': 'Material', 'MI': 'MaterialInstanceConstant', 'MF': 'MaterialFunction',
+    'MPC': 'MaterialParameterCollection', 'PM': 'PhysicalMaterial',
+    'T': 'Texture2D', 'TC': 'TextureCube', 'RT': 'TextureRenderTarget2D',
+    'SM': 'StaticMesh', 'SK': 'SkeletalMesh', 'SKEL': 'Skeleton', 'PHYS': 'PhysicsAsset',
+    'AM': 'AnimMontage', 'AS': 'AnimSequence', 'BS': 'BlendSpace',
+    'A': 'SoundWave', 'SC': 'SoundCue', 'NS': 'NiagaraSystem', 'NE': 'NiagaraEmitter',
+    'P': 'ParticleSystem', 'DT': 'DataTable', 'DA': 'DataAsset', 'CT': 'CurveTable',
+    'E': 'UserDefinedEnum', 'F': 'UserDefinedStruct', 'LS': 'LevelSequence',
+}
+UNKNOWN_CLASS = 'Unknown'
+
+Asset = namedtuple('Asset', 'path folder name asset_class size lfs pointer oid locked_by')
+
+_COLUMNS = 'path, folder, name, asset_class, size, lfs, pointer, oid, mtime_ns, stat_size'
+
+
+def is_asset_path(path):
+    return path.lower().endswith(ASSET_EXTENSIONS)
+
+
+def package_name(path):
+    """
+    Long package name of an asset path ('Content/Maps/L1.umap' -> '/Game/Maps/L1'),
+    or None outside a Content folder. Plugin content mounts under the plugin's name.
+    """
+    parts = os.path.splitext(path.replace('\\', '/'))[0].split('/')
+    lowered = [part.lower() for part in parts[:-1]]
+    if 'content' not in lowered:
+        return None
+    index = len(lowered) - 1 - lowered[::-1].index('content')
+    owner = parts[:index]
+    if 'plugins' in (part.lower() for part in owner):
+        mount = owner[-1]
+    elif owner and owner[-1].lower() == 'engine':
+        mount = 'Engine'
+    else:
+        mount = 'Game'
+    return '/' + '/'.join([mount] + parts[index + 1:])
+
+
+def guess_asset_class(path):
+    """Asset class from the extension and the naming convention prefix."""
+    name = os.path.basename(path)
+    if name.lower().endswith('.umap'):
+        return 'World'
+    prefix = name.split('_', 1)[0] if '_' in name else ''
+    return CLASS_PREFIXES.get(prefix.upper(), UNKNOWN_CLASS)
+
+
+def _lfs_pointer_size(data):
+    """Declared object size of an LFS pointer file, or None if `data` is not one."""
+    if not data.startswith(LFS_POINTER_PREFIX):
+        return None
+    for line in data.splitlines():
+        if line.startswith(b'size '):
+            try:
+                return int(line[5:].strip())
+            except ValueError:
+                return None
+    return None
+
+
+class AssetCatalog:
+    """
+    Incremental, persisted catalog of the Unreal packages of one repository.
+
+    Usage:
+        catalog = AssetCatalog(repo_path)
+        catalog.refresh()                                   # worker thread
+        catalog.query(folder='Content/Maps', min_size=100 * 1024 * 1024)
+        catalog.query(asset_class='Blueprint', locked=True)
+        catalog.note_changes(watcher_changes)               # any thread, cheap
+        catalog.size_hint('Content/Maps/L1.umap')           # working tree size or None
+        catalog.referencers('Content/Meshes/SM_Rock.uasset')  # needs a package_reader
+        catalog.close()
+
+    `refresh()`, `query()` and `summary()` may run git and read files: call
+    them off the GUI thread. All methods are thread-safe.
+    """
+
+    def __init__(self, repo_path, root=None, package_reader=None):
+        self.repo_path = repo_path
+        self.package_reader = package_reader
+        self.git_manager = GitManager()
+        self.git_manager.set_repository(repo_path)
+        self.directory = (root or default_cache_root()) / repo_id(repo_path)
+        self._db_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._rows = {}            # path -> (oid, mtime_ns, stat_size)
+        self._dirty = {}           # path -> note sequence, kept until its row is written
+        self._dirty_seq = 0
+        self._dirty_dirs = set()
+        self._index_dirty = True
+        self._session_synced = False
+        self._built = False
+        self._locks_time = 0.0
+        self._db = None
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.directory / 'assets.sqlite3'),
+                                       check_same_thread=False, isolation_level=None)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('PRAGMA synchronous=NORMAL')
+            self._db.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+            version = self._db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if version is None or version[0] != str(CATALOG_VERSION):
+                self._db.execute('DROP TABLE IF EXISTS assets')
+                self._db.execute('DROP TABLE IF EXISTS locks')
+                self._db.execute('DROP TABLE IF EXISTS dependencies')
+                self._db.execute('DELETE FROM meta')
+                self._db.execute("INSERT INTO meta VALUES ('version', ?)", (str(CATALOG_VERSION),))
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS assets ('
+                ' path TEXT PRIMARY KEY, folder TEXT NOT NULL, name TEXT NOT NULL,'
+                ' asset_class TEXT NOT NULL, size INTEGER NOT NULL, lfs INTEGER NOT NULL,'
+                ' pointer INTEGER NOT NULL, oid TEXT, mtime_ns INTEGER NOT NULL, stat_size INTEGER NOT NULL)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS assets_folder ON assets (folder)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS assets_class ON assets (asset_class)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS assets_size ON assets (size)')
+            self._db.execute('CREATE TABLE IF NOT EXISTS locks (path TEXT PRIMARY KEY, owner TEXT, locked_at TEXT)')
+            # source asset path -> long package name it references
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS dependencies ('
+                ' source TEXT NOT NULL, target TEXT NOT NULL, soft INTEGER NOT NULL, PRIMARY KEY (source, target))')
+            self._db.execute('CREATE INDEX IF NOT EXISTS dependencies_target ON dependencies (target COLLATE NOCASE)')
+            for path, oid, mtime_ns, stat_size in self._db.execute(
+                    'SELECT path, oid, mtime_ns, stat_size FROM assets'):
+                self._rows[path] = (oid, mtime_ns, stat_size)
+            self._built = self._db.execute("SELECT 1 FROM meta WHERE key = 'built'").fetchone() is not None
+        except (OSError, sqlite3.Error) as e:
+            print(f"[DEBUG] AssetCatalog: persistence disabled for {repo_path}: {e}")
+            self._db = None
+
+    def close(self):
+        with self._db_lock:
+            if self._db is not None:
+                try:
+                    self._db.close()
+                except sqlite3.Error:
+                    pass
+                self._db = None
+        self.git_manager.close()
+
+    @property
+    def built(self):
+        return self._built
+
+    # ---- change tracking ----
+
+    def note_changes(self, changes):
+        """Feed a RepositoryWatcher change set; the work happens on the next refresh()."""
+        with self._state_lock:
+            if changes.get('full') or changes.get('index') or changes.get('refs'):
+                self._index_dirty = True
+            for path in changes.get('paths', ()):
+                if is_asset_path(path):
+                    self._dirty_seq += 1
+                    self._dirty[path] = self._dirty_seq
+                elif '.' not in os.path.basename(path):
+                    # Possibly a directory that was moved or deleted as a whole
+                    self._dirty_dirs.add(path)
+
+    def size_hint(self, path):
+        """Working tree size of an asset the catalog knows to be current, else None."""
+        with self._state_lock:
+            if path in self._dirty or self._index_dirty and not self._session_synced:
+                return None
+            row = self._rows.get(path)
+        return row[2] if row is not None else None
+
+    # ---- refreshing ----
+
+    def refresh(self):
+        """Bring the catalog up to date; returns the number of assets re-described."""
+        with self._refresh_lock:
+            with self._state_lock:
+                # Dirty paths stay in self._dirty (size_hint keeps answering None for
+                # them) until _describe_paths has replaced their rows
+                noted = dict(self._dirty)
+                dirty_dirs, self._dirty_dirs = self._dirty_dirs, set()
+                index_dirty = self._index_dirty or not self._session_synced
+                self._index_dirty = False
+            dirty = set(noted)
+            if dirty_dirs:
+                prefixes = tuple(d.rstrip('/') + '/' for d in dirty_dirs)
+                moved = {path for path in self._rows if path.startswith(prefixes)}
+                if moved:
+                    dirty |= moved
+                    index_dirty = True
+            try:
+                if index_dirty:
+                    count = self._sync_index(dirty, noted)
+                else:
+                    count = self._describe_paths(dirty, {}, noted=noted) if dirty else 0
+            except Exception:
+                with self._state_lock:
+                    self._dirty_dirs |= dirty_dirs
+                    self._index_dirty = self._index_dirty or index_dirty
+                raise
+            return count
+
+    def _list(self, args):
+        success, output = self.git_manager.run_command_raw(['git'] + args + ['--'] + ASSET_PATHSPECS, timeout=300)
+        if not success:
+            raise RuntimeError(output)
+        return [p for p in output.split(b'\0') if p]
+
+    def _sync_index(self, dirty, noted):
+        tracked = {}
+        for record in self._list(['ls-files', '-s', '-z']):
+            meta, _, path = record.partition(b'\t')
+            parts = meta.split()
+            path = path.decode('utf-8', errors='replace')
+            if len(parts) >= 2 and path not in tracked:
+                tracked[path] = parts[1].decode('ascii')
+        current = dict(tracked)
+        for path in self._list(['ls-files', '-o', '--exclude-standard', '-z']):
+            current.setdefault(path.decode('utf-8', errors='replace'), None)
+
+        todo = set(dirty)
+        if not self._session_synced:
+            # Modified while the client was closed (uses the index stat data)
+            todo.update(p.decode('utf-8', errors='replace') for p in self._list(['diff-files', '--name-only', '-z']))
+        rows = self._rows
+        for path, oid in current.items():
+            known = rows.get(path)
+            if known is None or known[0] != oid:
+                todo.add(path)
+        removed = [path for path in rows if path not in current]
+        todo.intersection_update(current)
+
+        count = self._describe_paths(todo, current, removed, noted)
+        self._session_synced = True
+        if not self._built:
+            self._built = True
+            self._execute("INSERT OR REPLACE INTO meta VALUES ('built', ?)", (str(time.time()),))
+        return count
+
+    def _describe_paths(self, paths, oids, removed=(), noted=None):
+        """Stat and describe `paths`; paths that no longer exist are dropped.
+
+        `noted` is the refresh's snapshot of self._dirty: those paths stop being dirty
+        together with the row update, unless note_changes() saw them again meanwhile.
+        """
+        matcher = self.git_manager.get_lfs_matcher()
+        new_rows = []
+        dependencies = []
+        gone = list(removed)
+        for path in paths:
+            oid = oids.get(path, self._rows.get(path, (None,))[0])
+            described = self._describe(path, oid, matcher)
+            if described is None:
+                gone.append(path)
+            else:
+                new_rows.append(described[0])
+                dependencies.extend((path, target, int(soft)) for target, soft in described[1])
+
+        with self._state_lock:
+            for path in gone:
+                self._rows.pop(path, None)
+            for row in new_rows:
+                self._rows[row[0]] = (row[7], row[8], row[9])
+            for path, seq in (noted or {}).items():
+                if self._dirty.get(path) == seq:
+                    del self._dirty[path]
+        self._write(new_rows, gone, dependencies)
+        return len(new_rows)
+
+    def _describe(self, path, oid, matcher):
+        full = os.path.join(self.repo_path, path)
+        try:
+            st = os.stat(full)
+        except OSError:
+            return None
+        lfs = matcher.matches(path)
+        size = st.st_size
+        pointer = False
+        if lfs and st.st_size < LFS_POINTER_MAX_SIZE:
+            try:
+                with open(full, 'rb') as f:
+                    declared = _lfs_pointer_size(f.read(LFS_POINTER_MAX_SIZE))
+            except OSError:
+                declared = None
+            if declared is not None:
+                size, pointer = declared, True
+        asset_class = None
+        dependencies = []
+        if self.package_reader is not None and not pointer:
+            try:
+                header = self.package_reader(full)
+                asset_class = header.asset_class
+                dependencies = header.package_dependencies()
+            except (OSError, ValueError) as e:
+                print(f"[DEBUG] AssetCatalog: can't read package header of {path}: {e}")
+        folder, _, name = path.rpartition('/')
+        row = (path, folder, name, asset_class or guess_asset_class(path), size,
+               int(lfs), int(pointer), oid, st.st_mtime_ns, st.st_size)
+        return row, dependencies
+
+    # ---- storage ----
+
+    def _execute(self, sql, params=()):
+        with self._db_lock:
+            if self._db is None:
+                return []
+            try:
+                return self._db.execute(sql, params).fetchall()
+            except sqlite3.Error as e:
+                print(f"[DEBUG] AssetCatalog query failed: {e}")
+                return []
+
+    def _write(self, rows, removed, dependencies=()):
+        if not rows and not removed:
+            return
+        with self._db_lock:
+            if self._db is None:
+                return
+            try:
+                self._db.execute('BEGIN')
+                sources = [(path,) for path in removed] + [(row[0],) for row in rows]
+                self._db.executemany('DELETE FROM assets WHERE path = ?', [(path,) for path in removed])
+                self._db.executemany('DELETE FROM dependencies WHERE source = ?', sources)
+                self._db.executemany(f'INSERT OR REPLACE INTO assets ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                     rows)
+                self._db.executemany('INSERT OR REPLACE INTO dependencies VALUES (?, ?, ?)', dependencies)
+                self._db.execute('COMMIT')
+            except sqlite3.Error as e:
+                print(f"[DEBUG] AssetCatalog write failed: {e}")
+                try:
+                    self._db.execute('ROLLBACK')
+                except sqlite3.Error:
+                    pass
+
+    # ---- locks ----
+
+    def update_locks(self, locks):
+        """Replace the lock table with `git lfs locks --json` output."""
+        rows = [(lock.get('path'), (lock.get('owner') or {}).get('name'), lock.get('locked_at'))
+                for lock in locks if lock.get('path')]
+        with self._db_lock:
+            if self._db is None:
+                return
+            try:
+                self._db.execute('BEGIN')
+                self._db.execute('DELETE FROM locks')
+                self._db.executemany('INSERT OR REPLACE INTO locks VALUES (?, ?, ?)', rows)
+                self._db.execute('COMMIT')
+            except sqlite3.Error as e:
+                print(f"[DEBUG] AssetCatalog lock update failed: {e}")
+                try:
+                    self._db.execute('ROLLBACK')
+                except sqlite3.Error:
+                    pass
+        self._locks_time = time.monotonic()
+
+    def refresh_locks(self, max_age=LOCKS_MAX_AGE):
+        """Ask the LFS server for locks if the known ones are older than `max_age` seconds."""
+        if time.monotonic() - self._locks_time < max_age:
+            return False
+        self.update_locks(self.git_manager.get_lfs_locks())
+        return True
+
+    # ---- queries ----
+
+    def query(self, folder=None, recursive=True, asset_class=None, min_size=None, max_size=None,
+              lfs=None, locked=None, paths=None, order='path', limit=None):
+        """Assets matching every given filter; `locked` uses the last known LFS locks."""
+        where = []
+        params = []
+        if folder is not None:
+            folder = folder.strip('/')
+            if recursive and folder:
+                where.append('(a.folder = ? OR substr(a.folder, 1, ?) = ?)')
+                params += [folder, len(folder) + 1, folder + '/']
+            else:
+                where.append('a.folder = ?')
+                params.append(folder)
+        if asset_class is not None:
+            where.append('a.asset_class = ?')
+            params.append(asset_class)
+        if min_size is not None:
+            where.append('a.size >= ?')
+            params.append(min_size)
+        if max_size is not None:
+            where.append('a.size <= ?')
+            params.append(max_size)
+        if lfs is not None:
+            where.append('a.lfs = ?')
+            params.append(int(bool(lfs)))
+        if locked is not None:
+            where.append('l.path IS NOT NULL' if locked else 'l.path IS NULL')
+        sql = ('SELECT a.path, a.folder, a.name, a.asset_class, a.size, a.lfs, a.pointer, a.oid, l.owner'
+               ' FROM assets a LEFT JOIN locks l ON l.path = a.path')
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += {'path': ' ORDER BY a.path', 'size': ' ORDER BY a.size DESC'}.get(order, '')
+        if paths is not None:
+            # Filter in Python: the path list may exceed SQLite's parameter limit
+            wanted = set(paths)
+            rows = [row for row in self._execute(sql, params) if row[0] in wanted]
+            rows = rows[:limit] if limit is not None else rows
+        else:
+            if limit is not None:
+                sql += ' LIMIT ?'
+                params.append(limit)
+            rows = self._execute(sql, params)
+        return [Asset(path, folder, name, asset_class, size, bool(lfs), bool(pointer), oid, owner)
+                for path, folder, name, asset_class, size, lfs, pointer, oid, owner in rows]
+
+    def referencers(self, path, soft=True):
+        """[(asset path, soft)] of the assets that reference `path` (hard references first)."""
+        target = package_name(path)
+        if target is None:
+            return []
+        sql = 'SELECT source, soft FROM dependencies WHERE target = ? COLLATE NOCASE AND source != ?'
+        if not soft:
+            sql += ' AND soft = 0'
+        rows = self._execute(sql + ' ORDER BY soft, source', (target, path))
+        return [(source, bool(is_soft)) for source, is_soft in rows]
+
+    def referencers_of(self, paths, soft=True):
+        """{path: referencers(path)} for the asset paths among `paths` that are referenced."""
+        result = {}
+        for path in paths:
+            if is_asset_path(path):
+                found = self.referencers(path, soft)
+                if found:
+                    result[path] = found
+        return result
+
+    def dependencies(self, path):
+        """[(long package name, soft)] referenced by the asset at `path`, as of the last refresh."""
+        rows = self._execute('SELECT target, soft FROM dependencies WHERE source = ? ORDER BY soft, target', (path,))
+        return [(target, bool(is_soft)) for target, is_soft in rows]
+
+    def summary(self):
+        """{assets, maps, total_size, lfs, pointers, locked, classes} or None before the first build."""
+        if not self._built:
+            return None
+        totals = self._execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(asset_class = 'World'), 0),"
+            " COALESCE(SUM(lfs), 0), COALESCE(SUM(pointer), 0) FROM assets")
+        locked = self._execute('SELECT COUNT(*) FROM locks l JOIN assets a ON a.path = l.path')
+        classes = self._execute(
+            'SELECT asset_class, COUNT(*), SUM(size) FROM assets GROUP BY asset_class ORDER BY COUNT(*) DESC')
+        if not totals:
+            return None
+        count, total_size, maps, lfs, pointers = totals[0]
+        return {
+            'assets': count,
+            'maps': maps,
+            'total_size': total_size,
+            'lfs': lfs,
+            'pointers': pointers,
+            'locked': locked[0][0] if locked else 0,
+            'classes': [{'class': name, 'count': n, 'size': size} for name, n, size in classes],
+        }
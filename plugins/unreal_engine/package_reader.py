@@ -0,0 +1,346 @@
+"""
+PackageReader - Reads the header of Unreal packages (.uasset/.umap) without the editor.
+
+Only the package summary, the name table, the import table and the export
+table are decoded; they sit at the start of the file, and the file is
+memory-mapped, so only the header pages are ever read from disk whatever
+the size of the package. From that the reader answers:
+
+- which class the package's main asset is (Blueprint, World, Material, ...);
+- which other packages it references, hard (imports) and soft (soft package
+  references), e.g. "/Game/Characters/Hero".
+
+Supports editor-saved (versioned) packages from UE 4.x (object version 384+)
+up to UE 5.5 (UE5 object version 1016). Newer layouts, unversioned (cooked)
+packages and anything that does not decode cleanly raise PackageFormatError.
+"""
+
+import mmap
+import os
+import struct
+from collections import namedtuple
+
+PACKAGE_FILE_TAG = 0x9E2A83C1
+PACKAGE_FILE_TAG_SWAPPED = 0xC1832A9E
+PKG_FILTER_EDITOR_ONLY = 0x80000000
+
+# Object versions (EUnrealEngineObjectUE4Version / UE5Version) that change the layout
+VER_UE4_ADD_STRING_ASSET_REFERENCES_MAP = 384
+VER_UE4_LOAD_FOR_EDITOR_GAME = 365
+VER_UE4_SERIALIZE_TEXT_IN_PACKAGES = 459
+VER_UE4_COOKED_ASSETS_IN_EDITOR_SUPPORT = 485
+VER_UE4_NAME_HASHES_SERIALIZED = 504
+VER_UE4_PRELOAD_DEPENDENCIES_IN_COOKED_EXPORTS = 507
+VER_UE4_TEMPLATE_INDEX_IN_COOKED_EXPORTS = 508
+VER_UE4_ADDED_SEARCHABLE_NAMES = 510
+VER_UE4_64BIT_EXPORTMAP_SERIALSIZES = 511
+VER_UE4_ADDED_SOFT_OBJECT_PATH = 514
+VER_UE4_ADDED_PACKAGE_SUMMARY_LOCALIZATION_ID = 516
+VER_UE4_NON_OUTER_PACKAGE_IMPORT = 520
+VER_UE5_OPTIONAL_RESOURCES = 1003
+VER_UE5_REMOVE_OBJECT_EXPORT_PACKAGE_GUID = 1005
+VER_UE5_TRACK_OBJECT_EXPORT_IS_INHERITED = 1006
+VER_UE5_ADD_SOFTOBJECTPATH_LIST = 1008
+VER_UE5_SCRIPT_SERIALIZATION_OFFSET = 1010
+VER_UE5_METADATA_SERIALIZATION_OFFSET = 1014
+VER_UE5_VERSE_CELLS = 1015
+VER_UE5_PACKAGE_SAVED_HASH = 1016
+
+MIN_UE4_VERSION = VER_UE4_ADD_STRING_ASSET_REFERENCES_MAP
+# Later versions may move summary fields this reader does not know about
+MAX_UE5_VERSION = VER_UE5_PACKAGE_SAVED_HASH
+# Sanity limits: a corrupt or non-package file must fail fast, not allocate
+MAX_STRING_LENGTH = 64 * 1024
+MAX_TABLE_ENTRIES = 1 << 20
+
+# Long package names that never live in the repository
+NATIVE_PACKAGE_PREFIXES = ('/Script/', '/Memory/', '/Temp/')
+
+Import = namedtuple('Import', 'class_package class_name outer_index object_name package_name')
+Export = namedtuple('Export', 'class_index outer_index object_name is_asset')
+
+
+class PackageFormatError(ValueError):
+    """The file is not a package this reader understands."""
+
+
+class _Reader:
+    """Little-endian cursor over a buffer; every read is bounds-checked."""
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.size = len(buffer)
+        self.pos = 0
+
+    def _unpack(self, fmt, size):
+        if self.pos + size > self.size:
+            raise PackageFormatError(f"truncated header at offset {self.pos}")
+        value = struct.unpack_from(fmt, self.buffer, self.pos)
+        self.pos += size
+        return value
+
+    def int32(self):
+        return self._unpack('<i', 4)[0]
+
+    def uint32(self):
+        return self._unpack('<I', 4)[0]
+
+    def int64(self):
+        return self._unpack('<q', 8)[0]
+
+    def skip(self, size):
+        if self.pos + size > self.size:
+            raise PackageFormatError(f"truncated header at offset {self.pos}")
+        self.pos += size
+
+    def seek(self, offset):
+        if offset < 0 or offset > self.size:
+            raise PackageFormatError(f"offset {offset} outside the file")
+        self.pos = offset
+
+    def fstring(self):
+        length = self.int32()
+        if length == 0:
+            return ''
+        if abs(length) > MAX_STRING_LENGTH:
+            raise PackageFormatError(f"string of length {length} at offset {self.pos - 4}")
+        if length > 0:
+            data = self._unpack(f'<{length}s', length)[0]
+            return data.rstrip(b'\0').decode('latin-1')
+        data = self._unpack(f'<{-length * 2}s', -length * 2)[0]
+        return data.decode('utf-16-le', errors='replace').rstrip('\0')
+
+    def count(self):
+        value = self.int32()
+        if value < 0 or value > MAX_TABLE_ENTRIES:
+            raise PackageFormatError(f"implausible table size {value}")
+        return value
+
+
+class PackageHeader:
+    """
+    Decoded header of one package.
+
+    Usage:
+        header = read_package('Content/Characters/BP_Hero.uasset')
+        header.asset_class                 # 'Blueprint'
+        header.package_dependencies()      # [('/Game/Characters/SK_Hero', False), ...]
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.legacy_version = 0
+        self.ue4_version = 0
+        self.ue5_version = 0
+        self.licensee_version = 0
+        self.package_flags = 0
+        self.total_header_size = 0
+        self.names = []
+        self.imports = []
+        self.exports = []
+        self.soft_package_references = []
+
+    def resolve(self, index):
+        """Object name of a package index (negative = import, positive = export, 0 = none)."""
+        if index < 0 and -index <= len(self.imports):
+            return self.imports[-index - 1].object_name
+        if 0 < index <= len(self.exports):
+            return self.exports[index - 1].object_name
+        return None
+
+    @property
+    def main_export(self):
+        top_level = [e for e in self.exports if e.outer_index == 0]
+        for export in top_level:
+            if export.object_name.lower() == self.name.lower():
+                return export
+        for export in top_level:
+            if export.is_asset:
+                return export
+        return top_level[0] if top_level else None
+
+    @property
+    def asset_class(self):
+        export = self.main_export
+        return self.resolve(export.class_index) if export else None
+
+    def package_dependencies(self, include_native=False):
+        """[(long package name, soft)] of the other packages this one references."""
+        hard = set()
+        for entry in self.imports:
+            if entry.outer_index == 0 and entry.class_name == 'Package':
+                hard.add(entry.object_name)
+            if entry.package_name and entry.package_name != 'None':
+                hard.add(entry.package_name)
+        soft = set(self.soft_package_references) - hard
+        dependencies = [(name, False) for name in sorted(hard)] + [(name, True) for name in sorted(soft)]
+        if include_native:
+            return dependencies
+        return [(name, is_soft) for name, is_soft in dependencies
+                if name.startswith('/') and not name.startswith(NATIVE_PACKAGE_PREFIXES)]
+
+
+def read_package(path):
+    """Decode the header of the package at `path`; raises PackageFormatError or OSError."""
+    name = os.path.splitext(os.path.basename(path))[0]
+    with open(path, 'rb') as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise PackageFormatError("empty file")
+        try:
+            return parse_package(buffer, name)
+        finally:
+            buffer.close()
+
+
+def parse_package(buffer, name=''):
+    """Decode a package header from any buffer (bytes, mmap)."""
+    try:
+        return _parse(_Reader(buffer), PackageHeader(name))
+    except struct.error as e:
+        raise PackageFormatError(str(e))
+
+
+def _parse(r, header):
+    tag = r.uint32()
+    if tag == PACKAGE_FILE_TAG_SWAPPED:
+        raise PackageFormatError("big-endian packages are not supported")
+    if tag != PACKAGE_FILE_TAG:
+        raise PackageFormatError("not an Unreal package")
+
+    header.legacy_version = legacy = r.int32()
+    if legacy >= 0 or legacy < -9:
+        raise PackageFormatError(f"unsupported legacy file version {legacy}")
+    if legacy != -4:
+        r.int32()  # LegacyUE3Version
+    header.ue4_version = r.int32()
+    if legacy <= -8:
+        header.ue5_version = r.int32()
+    header.licensee_version = r.int32()
+    if header.ue4_version == 0 and header.ue5_version == 0:
+        raise PackageFormatError("unversioned (cooked) package")
+    if header.ue4_version < MIN_UE4_VERSION:
+        raise PackageFormatError(f"package version {header.ue4_version} is too old")
+    if header.ue5_version > MAX_UE5_VERSION:
+        raise PackageFormatError(f"package version {header.ue5_version} is too new")
+    ue4, ue5 = header.ue4_version, header.ue5_version
+
+    if ue5 >= VER_UE5_PACKAGE_SAVED_HASH:
+        r.skip(20)      # saved hash
+        header.total_header_size = r.int32()
+    if legacy <= -2:
+        for _ in range(r.count()):
+            if legacy == -2:
+                r.skip(8)           # enum tag + version
+            elif legacy >= -5:
+                r.skip(20)          # guid + version
+                r.fstring()         # friendly name
+            else:
+                r.skip(20)          # guid + version
+
+    if ue5 < VER_UE5_PACKAGE_SAVED_HASH:
+        header.total_header_size = r.int32()
+    r.fstring()  # package (folder) name
+    header.package_flags = r.uint32()
+    editor_only_filtered = bool(header.package_flags & PKG_FILTER_EDITOR_ONLY)
+    name_count, name_offset = r.count(), r.int32()
+    if ue5 >= VER_UE5_ADD_SOFTOBJECTPATH_LIST:
+        r.skip(8)       # soft object paths count + offset
+    if not editor_only_filtered and ue4 >= VER_UE4_ADDED_PACKAGE_SUMMARY_LOCALIZATION_ID:
+        r.fstring()     # localization id
+    if ue4 >= VER_UE4_SERIALIZE_TEXT_IN_PACKAGES:
+        r.skip(8)       # gatherable text data count + offset
+    export_count, export_offset = r.count(), r.int32()
+    import_count, import_offset = r.count(), r.int32()
+    if ue5 >= VER_UE5_VERSE_CELLS:
+        r.skip(16)      # cell export/import counts + offsets
+    if ue5 >= VER_UE5_METADATA_SERIALIZATION_OFFSET:
+        r.skip(4)       # metadata offset
+    r.skip(4)           # depends offset
+    soft_count, soft_offset = r.count(), r.int32()
+
+    header.names = _read_names(r, name_offset, name_count, ue4)
+    header.imports = _read_imports(r, header, import_offset, import_count, editor_only_filtered)
+    header.exports = _read_exports(r, header, export_offset, export_count)
+    if soft_count:
+        header.soft_package_references = _read_soft_references(r, header, soft_offset, soft_count)
+    return header
+
+
+def _read_names(r, offset, count, ue4):
+    r.seek(offset)
+    names = []
+    for _ in range(count):
+        names.append(r.fstring())
+        if ue4 >= VER_UE4_NAME_HASHES_SERIALIZED:
+            r.skip(4)   # non-case / case preserving hashes
+    return names
+
+
+def _fname(r, names):
+    index, number = r.int32(), r.int32()
+    if index < 0 or index >= len(names):
+        raise PackageFormatError(f"name index {index} outside the name table")
+    return f"{names[index]}_{number - 1}" if number else names[index]
+
+
+def _read_imports(r, header, offset, count, editor_only_filtered):
+    ue4, ue5, names = header.ue4_version, header.ue5_version, header.names
+    r.seek(offset)
+    imports = []
+    for _ in range(count):
+        class_package = _fname(r, names)
+        class_name = _fname(r, names)
+        outer_index = r.int32()
+        object_name = _fname(r, names)
+        package_name = None
+        if not editor_only_filtered and ue4 >= VER_UE4_NON_OUTER_PACKAGE_IMPORT:
+            package_name = _fname(r, names)
+        if ue5 >= VER_UE5_OPTIONAL_RESOURCES:
+            r.skip(4)   # bImportOptional
+        imports.append(Import(class_package, class_name, outer_index, object_name, package_name))
+    return imports
+
+
+def _read_exports(r, header, offset, count):
+    ue4, ue5, names = header.ue4_version, header.ue5_version, header.names
+    r.seek(offset)
+    exports = []
+    for _ in range(count):
+        class_index = r.int32()
+        r.skip(4)       # super index
+        if ue4 >= VER_UE4_TEMPLATE_INDEX_IN_COOKED_EXPORTS:
+            r.skip(4)   # template index
+        outer_index = r.int32()
+        object_name = _fname(r, names)
+        r.skip(4)       # object flags
+        r.skip(16 if ue4 >= VER_UE4_64BIT_EXPORTMAP_SERIALSIZES else 8)   # serial size + offset
+        r.skip(12)      # forced export, not for client, not for server
+        if ue5 < VER_UE5_REMOVE_OBJECT_EXPORT_PACKAGE_GUID:
+            r.skip(16)  # package guid
+        if ue5 >= VER_UE5_TRACK_OBJECT_EXPORT_IS_INHERITED:
+            r.skip(4)   # is inherited instance
+        r.skip(4)       # package flags
+        if ue4 >= VER_UE4_LOAD_FOR_EDITOR_GAME:
+            r.skip(4)   # not always loaded for editor game
+        is_asset = False
+        if ue4 >= VER_UE4_COOKED_ASSETS_IN_EDITOR_SUPPORT:
+            is_asset = bool(r.int32())
+        if ue5 >= VER_UE5_OPTIONAL_RESOURCES:
+            r.skip(4)   # generate public hash
+        if ue4 >= VER_UE4_PRELOAD_DEPENDENCIES_IN_COOKED_EXPORTS:
+            r.skip(20)  # first export dependency + 4 dependency counts
+        if ue5 >= VER_UE5_SCRIPT_SERIALIZATION_OFFSET:
+            r.skip(16)  # script serialization start + end
+        if not (-len(header.imports) <= class_index <= count and -len(header.imports) <= outer_index <= count):
+            raise PackageFormatError(f"export {object_name} has an index outside the tables")
+        exports.append(Export(class_index, outer_index, object_name, is_asset))
+    return exports
+
+
+def _read_soft_references(r, header, offset, count):
+    r.seek(offset)
+    if header.ue4_version < VER_UE4_ADDED_SOFT_OBJECT_PATH:
+        return [r.fstring() for _ in range(count)]
+    return [_fname(r, header.names) for _ in range(count)]
@@ -1,4 +1,9 @@
+import importlib.util
+import json
 import os
+import signal
+import sys
+import threading
 from pathlib import Path
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import (
@@ -14,9 +19,30 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 from core.plugin_interface import PluginInterface
+from core.process_monitor import get_process_monitor
 from core.translations import tr
 
+
+def _load_module(name):
+    """Import a sibling module by file (the plugin loader gives us no package for relative imports)."""
+    module_name = f"unreal_engine_{name}"
+    module = sys.modules.get(module_name)
+    if module is None:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), f"{name}.py")
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules[module_name] = module
+    return module
+
+
 class Plugin(PluginInterface):
+    def __init__(self):
+        self.asset_catalogs = {}
+        self._catalog_lock = threading.Lock()
+        self._editor_watches = {}  # process monitor key -> repo paths whose indicator follows it
+        self._editor_lock = threading.Lock()
+
     def get_name(self):
         return "Unreal Engine"
     
@@ -71,63 +97,82 @@ class Plugin(PluginInterface):
                 }
         return None
     
-    _unreal_status_cache = {}
-    _unreal_status_cache_time = {}
-    
+    EDITOR_NAMES = ('unrealeditor', 'unrealeditor.exe', 'ue4editor', 'ue4editor.exe')
+
+    @staticmethod
+    def _editor_key(uproject):
+        return f"unreal-editor:{os.path.normcase(os.path.abspath(uproject))}"
+
+    def _editor_predicate(self, uproject):
+        target = os.path.normcase(os.path.abspath(uproject))
+        target_name = os.path.basename(target)
+        project_name = os.path.splitext(target_name)[0].lower()
+
+        def is_editor_for_project(process):
+            if process.name.lower() not in self.EDITOR_NAMES:
+                return False
+            projects = [os.path.normcase(arg) for arg in process.cmdline[1:] if arg.lower().endswith('.uproject')]
+            if projects:
+                # Relative paths are relative to the editor's cwd: compare the file name only
+                return any(os.path.normpath(arg) == target if os.path.isabs(arg) else os.path.basename(arg) == target_name
+                           for arg in projects)
+            # Started from the Epic launcher: no project on the command line, but the main
+            # window is titled "<Project> - Unreal Editor" once the project is loaded
+            titles = process.window_titles()
+            if titles is None:
+                return False
+            titles = [title.lower() for title in titles]
+            if any(title.split(' - ', 1)[0].strip() == project_name for title in titles):
+                return True
+            if any('unreal editor' in title for title in titles):
+                return False
+            return None  # still on the splash screen: ask again on the next scan
+        return is_editor_for_project
+
+    def _watch_editor(self, repo_path, uproject):
+        """Start tracking editor sessions of this project; start/stop refreshes the indicator."""
+        monitor = get_process_monitor()
+        key = self._editor_key(uproject)
+        with self._editor_lock:
+            self._editor_watches.setdefault(key, set()).add(repo_path)
+            if not monitor.is_watching(key):
+                monitor.watch(key, self._editor_predicate(uproject), self._on_editor_event)
+        return monitor, key
+
+    def _on_editor_event(self, event, key, process):
+        with self._editor_lock:
+            repo_paths = list(self._editor_watches.get(key, ()))
+        for repo_path in repo_paths:
+            self.invalidate_indicator(repo_path)
+
     def is_unreal_running(self, repo_path):
-        """Check if Unreal Engine is running with this specific project (cached)"""
-        import subprocess
-        import time
-        
+        """Check if Unreal Engine is running with this specific project (process monitor lookup)"""
         uproject = self.get_uproject_file(repo_path)
         if not uproject:
             return False, None
-        
+
         project_name = os.path.basename(uproject).replace('.uproject', '')
-        cache_key = repo_path
-        
-        now = time.time()
-        if cache_key in self._unreal_status_cache:
-            if now - self._unreal_status_cache_time.get(cache_key, 0) < 5:
-                return self._unreal_status_cache[cache_key], project_name
-        
-        try:
-            kwargs = {
-                'capture_output': True,
-                'text': True,
-                'encoding': 'utf-8',
-                'errors': 'replace',
-                'timeout': 2
-            }
-            
-            if os.name == 'nt':
-                kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW
-                
-            result = subprocess.run(
-                ['tasklist', '/FI', f'WINDOWTITLE eq {project_name}*'],
-                **kwargs
-            )
-            
-            is_running = 'UnrealEditor.exe' in result.stdout
-            self._unreal_status_cache[cache_key] = is_running
-            self._unreal_status_cache_time[cache_key] = now
-            return is_running, project_name
-        except Exception:
-            self._unreal_status_cache[cache_key] = False
-            self._unreal_status_cache_time[cache_key] = now
-            return False, None
-    
+        monitor, key = self._watch_editor(repo_path, uproject)
+        return monitor.is_running(key), project_name
+
     def close_unreal(self, repo_path):
-        """Close Unreal Engine"""
+        """Close the Unreal Editor sessions of this project"""
         import subprocess
+        uproject = self.get_uproject_file(repo_path)
+        if not uproject:
+            return False, "No se encontró el archivo .uproject"
+        monitor, key = self._watch_editor(repo_path, uproject)
+        sessions = monitor.sessions(key)
+        if not sessions:
+            return False, "Unreal Engine no está abierto con este proyecto"
         try:
-            kwargs = {
-                'capture_output': True
-            }
-            if os.name == 'nt':
-                kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW
-                
-            subprocess.run(['taskkill', '/IM', 'UnrealEditor.exe', '/F'], **kwargs)
+            for process in sessions:
+                if os.name == 'nt':
+                    subprocess.run(['taskkill', '/PID', str(process.pid), '/F'], capture_output=True,
+                                   creationflags=subprocess.CREATE_NO_WINDOW)
+                else:
+                    os.kill(process.pid, signal.SIGTERM)
+            monitor.scan()
             return True, "Unreal Engine cerrado"
         except Exception as e:
             return False, f"Error al cerrar Unreal: {str(e)}"
@@ -294,18 +339,49 @@ class Plugin(PluginInterface):
         except Exception as e:
             return False, f"Error al configurar LFS: {str(e)}"
     
+    def get_asset_catalog(self, repo_path):
+        if not self.is_unreal_project(repo_path):
+            return None
+        with self._catalog_lock:
+            catalog = self.asset_catalogs.get(repo_path)
+            if catalog is None:
+                # Package headers give the real asset classes and the reverse-dependency index
+                catalog = _load_module('asset_catalog').AssetCatalog(
+                    repo_path, package_reader=_load_module('package_reader').read_package)
+                self.asset_catalogs[repo_path] = catalog
+        return catalog
+
+    def on_repository_changed(self, repo_path, changes):
+        catalog = self.asset_catalogs.get(repo_path)
+        if catalog is not None:
+            catalog.note_changes(changes)
+
+    def on_repository_closed(self, repo_path):
+        # Only called once the last tab showing the repository let go of it; other
+        # tabs may have spelled the path differently
+        target = os.path.normcase(os.path.abspath(repo_path))
+
+        def is_closed(path):
+            return os.path.normcase(os.path.abspath(path)) == target
+
+        with self._editor_lock:
+            unwatched = []
+            for key, repo_paths in list(self._editor_watches.items()):
+                repo_paths.difference_update([path for path in repo_paths if is_closed(path)])
+                if not repo_paths:
+                    del self._editor_watches[key]
+                    unwatched.append(key)
+        for key in unwatched:
+            get_process_monitor().unwatch(key)
+        with self._catalog_lock:
+            catalogs = [self.asset_catalogs.pop(path) for path in list(self.asset_catalogs) if is_closed(path)]
+        for catalog in catalogs:
+            catalog.close()
+
     def get_lfs_patterns(self):
-        return [
-            "*.uasset", "*.umap", "*.ubulk", "*.upk",
-            "*.uproject", "*.uplugin", "*.blend", "*.blend1",
-            "*.fbx", "*.3ds", "*.obj", "*.dae",
-            "*.jpg", "*.jpeg", "*.png", "*.tga", "*.bmp",
-            "*.tif", "*.gif", "*.iff", "*.pict", "*.dds",
-            "*.xcf", "*.exr", "*.wav", "*.mp3", "*.ogg",
-            "*.flac", "*.aiff", "*.aif", "*.mod", "*.it",
-            "*.s3m", "*.xm", "*.psd", "*.mov", "*.avi",
-            "*.mp4", "*.wmv"
-        ]
+        # Kept in plugin.json so the plugin manager can read them without importing us
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'plugin.json'), 'r', encoding='utf-8') as f:
+            return list(json.load(f).get('lfs_patterns', []))
 
 
 class EngineInfoDialog(QDialog):
@@ -133,7 +133,7 @@ class AIChatPopup(QFrame):
             self._show_no_plugin_message()
             return
         
-        plugins = self.plugin_manager.get_all_plugins()
+        plugins = self.plugin_manager.get_plugins_with('sidebar_widget')
         for name, plugin in plugins.items():
             if hasattr(plugin, 'get_sidebar_widget'):
                 widget = plugin.get_sidebar_widget(self.repo_path)
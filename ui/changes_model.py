@@ -0,0 +1,323 @@
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, pyqtSignal
+from PyQt6.QtGui import QFont, QColor, QPalette
+from ui.theme import get_current_theme
+from core.translations import tr
+
+PATH_ROLE = Qt.ItemDataRole.UserRole
+STATE_ROLE = Qt.ItemDataRole.UserRole + 1
+LARGE_ROLE = Qt.ItemDataRole.UserRole + 2
+PLACEHOLDER_ROLE = Qt.ItemDataRole.UserRole + 3
+REFERENCERS_ROLE = Qt.ItemDataRole.UserRole + 4
+
+# Referencing assets listed in a row's tooltip
+MAX_TOOLTIP_REFERENCERS = 10
+
+PLACEHOLDER_EMPTY = 'empty'
+PLACEHOLDER_ERROR = 'error'
+
+
+def state_style(state, large=False):
+    """Return (badge, icon_name, color, tooltip) for a git status code."""
+    if 'U' in state:
+        style = ("C", "warning", "#d16969", tr('conflicted'))
+    elif 'R' in state:
+        style = ("R", "file-plus", "#569cd6", tr('renamed'))
+    elif 'A' in state:
+        style = ("A", "file-plus", "#4ec9b0", tr('added'))
+    elif 'D' in state:
+        style = ("D", "file-x", "#f48771", tr('deleted'))
+    elif 'M' in state:
+        style = ("M", "file-text", "#dcdcaa", tr('modified'))
+    else:
+        style = ("?", "file", "#858585", tr('untracked'))
+    if large:
+        badge, _, color, tooltip = style
+        style = (badge, "warning", color, f"{tooltip} - LARGE FILE (>100MB)")
+    return style
+
+
+class ChangesModel(QAbstractListModel):
+    """
+    Working tree changes for the changes list.
+
+    set_entries() diffs the new status entries against the current rows and
+    emits only the row inserts, removals and data changes needed, so the
+    view keeps its selection and scroll position and large lists do not get
+    rebuilt on every refresh. Check state lives here, keyed by path, and so
+    do the assets referencing each changed file (set_referencers()).
+    """
+    check_state_changed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._paths = []
+        self._entries = {}
+        self._rows = {}
+        self._unchecked = set()
+        self._placeholder = None
+        self._styles = {}
+        self._referencers = {}
+
+    # --- Qt model API -------------------------------------------------
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        if self._placeholder is not None:
+            return 1
+        return len(self._paths)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        if self._placeholder is not None:
+            if self._placeholder[0] == PLACEHOLDER_ERROR:
+                return Qt.ItemFlag.ItemIsEnabled
+            return Qt.ItemFlag.NoItemFlags
+        return (Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable |
+                Qt.ItemFlag.ItemIsUserCheckable)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if self._placeholder is not None:
+            kind, text, tooltip = self._placeholder
+            if role == Qt.ItemDataRole.DisplayRole:
+                return text
+            if role == Qt.ItemDataRole.ToolTipRole:
+                return tooltip
+            if role == PLACEHOLDER_ROLE:
+                return kind
+            return None
+
+        row = index.row()
+        if row < 0 or row >= len(self._paths):
+            return None
+        path = self._paths[row]
+
+        if role == PATH_ROLE:
+            return path
+        if role == Qt.ItemDataRole.CheckStateRole:
+            return Qt.CheckState.Unchecked if path in self._unchecked else Qt.CheckState.Checked
+        if role == STATE_ROLE:
+            return self._entries[path].state
+        if role == LARGE_ROLE:
+            return self._entries[path].large
+        if role == REFERENCERS_ROLE:
+            return self._referencers.get(path, [])
+        if role == Qt.ItemDataRole.DisplayRole:
+            badge = self.style_for(path)[0]
+            referencers = self._referencers.get(path)
+            if referencers:
+                return f"[{badge}] {path}  ({tr('referenced_by_count', count=len(referencers))})"
+            return f"[{badge}] {path}"
+        if role == Qt.ItemDataRole.ToolTipRole:
+            entry = self._entries[path]
+            if entry.orig_path:
+                tooltip = f"{self.style_for(path)[3]}: {entry.orig_path} -> {path} ({entry.state})"
+            else:
+                tooltip = f"{self.style_for(path)[3]}: {path} ({entry.state})"
+            referencers = self._referencers.get(path)
+            if referencers:
+                lines = [f"{source} {tr('soft_reference')}" if soft else source
+                         for source, soft in referencers[:MAX_TOOLTIP_REFERENCERS]]
+                if len(referencers) > MAX_TOOLTIP_REFERENCERS:
+                    lines.append(tr('referenced_by_more', count=len(referencers) - MAX_TOOLTIP_REFERENCERS))
+                tooltip += "\n" + tr('referenced_by') + "\n" + "\n".join(lines)
+            return tooltip
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.CheckStateRole or not index.isValid() or self._placeholder is not None:
+            return False
+        path = self._paths[index.row()]
+        if Qt.CheckState(value) == Qt.CheckState.Checked:
+            self._unchecked.discard(path)
+        else:
+            self._unchecked.add(path)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+        self.check_state_changed.emit()
+        return True
+
+    # --- Rows ---------------------------------------------------------
+
+    def style_for(self, path):
+        entry = self._entries[path]
+        key = (entry.state, bool(entry.large))
+        style = self._styles.get(key)
+        if style is None:
+            style = state_style(*key)
+            self._styles[key] = style
+        return style
+
+    def set_referencers(self, referencers):
+        """Replace the {path: [(asset, soft)]} referencing data; repaints only rows that changed."""
+        old = self._referencers
+        self._referencers = referencers
+        if self._placeholder is not None:
+            return
+        for path in set(old) | set(referencers):
+            if old.get(path) != referencers.get(path):
+                row = self.row_of(path)
+                if row >= 0:
+                    index = self.index(row)
+                    self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole])
+
+    def is_placeholder(self):
+        return self._placeholder is not None
+
+    def set_placeholder(self, kind, text, tooltip=None):
+        """Replace all rows with a single non-file row (no changes / error)."""
+        self.beginResetModel()
+        self._paths = []
+        self._entries = {}
+        self._rows = {}
+        self._unchecked = set()
+        self._placeholder = (kind, text, tooltip)
+        self.endResetModel()
+
+    def set_entries(self, entries):
+        """Apply a new list of StatusEntry records."""
+        new_paths = [e.path for e in entries]
+        new_entries = {e.path: e for e in entries}
+
+        if self._placeholder is not None or not self._paths or len(new_entries) != len(new_paths):
+            self._reset_entries(new_paths, new_entries)
+            return
+
+        old_entries = self._entries
+        # Rows are only moved by remove + insert; if the surviving rows
+        # changed their relative order, a reset is simpler and as cheap.
+        kept_old = [p for p in self._paths if p in new_entries]
+        kept_new = [p for p in new_paths if p in old_entries]
+        if kept_old != kept_new:
+            self._reset_entries(new_paths, new_entries)
+            return
+
+        # Removals, bottom-up so earlier row numbers stay valid.
+        for start, end in reversed(self._runs(self._paths, lambda p: p not in new_entries)):
+            self.beginRemoveRows(QModelIndex(), start, end)
+            for path in self._paths[start:end + 1]:
+                self._unchecked.discard(path)
+            del self._paths[start:end + 1]
+            self.endRemoveRows()
+
+        # Insertions, top-down: self._paths[:i] already matches new_paths[:i].
+        for start, end in self._runs(new_paths, lambda p: p not in old_entries):
+            self.beginInsertRows(QModelIndex(), start, end)
+            self._paths[start:start] = new_paths[start:end + 1]
+            self._entries.update((p, new_entries[p]) for p in new_paths[start:end + 1])
+            self.endInsertRows()
+
+        def changed(path):
+            old = old_entries.get(path)
+            return old is not None and old != new_entries[path]
+
+        changed_runs = self._runs(new_paths, changed)
+        self._entries = new_entries
+        self._rows = {}
+        for start, end in changed_runs:
+            self.dataChanged.emit(self.index(start), self.index(end))
+
+    def _reset_entries(self, new_paths, new_entries):
+        self.beginResetModel()
+        self._placeholder = None
+        self._unchecked &= set(new_entries)
+        self._paths = list(dict.fromkeys(new_paths))
+        self._entries = new_entries
+        self._rows = {}
+        self.endResetModel()
+
+    @staticmethod
+    def _runs(paths, predicate):
+        """Return inclusive (start, end) row ranges where predicate(path) holds."""
+        runs = []
+        start = None
+        for row, path in enumerate(paths):
+            if predicate(path):
+                if start is None:
+                    start = row
+            elif start is not None:
+                runs.append((start, row - 1))
+                start = None
+        if start is not None:
+            runs.append((start, len(paths) - 1))
+        return runs
+
+    # --- Lookups ------------------------------------------------------
+
+    def path_at(self, row):
+        if self._placeholder is not None or row < 0 or row >= len(self._paths):
+            return None
+        return self._paths[row]
+
+    def row_of(self, path):
+        if not self._rows and self._paths:
+            self._rows = {p: i for i, p in enumerate(self._paths)}
+        return self._rows.get(path, -1)
+
+    def paths(self):
+        return list(self._paths)
+
+    def checked_paths(self):
+        return [p for p in self._paths if p not in self._unchecked]
+
+    def checked_count(self):
+        return len(self._paths) - len(self._unchecked)
+
+    def checkable_count(self):
+        return len(self._paths)
+
+    def set_all_checked(self, checked):
+        if self._placeholder is not None or not self._paths:
+            return
+        self._unchecked = set() if checked else set(self._paths)
+        self.dataChanged.emit(self.index(0), self.index(len(self._paths) - 1),
+                              [Qt.ItemDataRole.CheckStateRole])
+        self.check_state_changed.emit()
+
+
+class ChangesDelegate(QStyledItemDelegate):
+    """Paints change rows with shared fonts, colors and icons instead of per-item copies."""
+
+    def __init__(self, icon_manager, parent=None):
+        super().__init__(parent)
+        self.icon_manager = icon_manager
+        self.file_font = QFont("Consolas", 11)
+        self.placeholder_font = QFont("Segoe UI", 11)
+        self.placeholder_font.setBold(True)
+        self._icons = {}
+        self._colors = {}
+
+    def _icon(self, name):
+        icon = self._icons.get(name)
+        if icon is None:
+            icon = self.icon_manager.get_icon(name, size=16)
+            self._icons[name] = icon
+        return icon
+
+    def _color(self, value):
+        color = self._colors.get(value)
+        if color is None:
+            color = QColor(value)
+            self._colors[value] = color
+        return color
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        model = index.model()
+        placeholder = index.data(PLACEHOLDER_ROLE)
+        if placeholder is not None:
+            if placeholder == PLACEHOLDER_ERROR:
+                icon_name, color = "warning", "#d16969"
+            else:
+                icon_name, color = "check", get_current_theme().colors['primary']
+            option.font = self.placeholder_font
+        else:
+            path = index.data(PATH_ROLE)
+            _, icon_name, color, _ = model.style_for(path)
+            option.font = self.file_font
+        option.icon = self._icon(icon_name)
+        option.features |= QStyleOptionViewItem.ViewItemFeature.HasDecoration
+        option.palette.setColor(QPalette.ColorRole.Text, self._color(color))
@@ -1,18 +1,23 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QScrollArea, QLabel
-from PyQt6.QtCore import Qt, pyqtSignal, QPoint, QRect
-from PyQt6.QtGui import QPainter, QPen, QColor, QBrush, QFont, QPainterPath, QPixmap
+from PyQt6.QtCore import Qt, pyqtSignal, QPoint, QPointF, QRect
+from PyQt6.QtGui import (QPainter, QPen, QColor, QBrush, QFont, QFontMetrics, QPainterPath,
+                         QPixmap, QStaticText, QTransform)
 from ui.theme import get_current_theme
 import math
 
+# Per-row text layouts kept across repaints; dropped wholesale past this size.
+TEXT_CACHE_LIMIT = 4000
+
+
 class CommitGraphWidget(QWidget):
     commit_clicked = pyqtSignal(str)
     commit_context_menu = pyqtSignal(str)
-    
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setMouseTracking(True)
         self.commits = []
-        
+
         theme = get_current_theme()
         self.colors = [QColor(c) for c in theme.colors.get('graph_colors', [])]
         if not self.colors:
@@ -20,118 +25,214 @@ class CommitGraphWidget(QWidget):
                 QColor("#007acc"), QColor("#4ec9b0"), QColor("#dcdcaa"), QColor("#ce9178"),
                 QColor("#c586c0"), QColor("#9cdcfe"), QColor("#b5cea8"), QColor("#f48771")
             ]
-            
-        self.branch_colors = {}
+
         self.node_radius = 6
         self.row_height = 55
         self.left_margin = 20
-        self.graph_width = 130
+        self.lane_width = 24
+        self.min_graph_width = 130
+        self.graph_width = self.min_graph_width
         self.avatar_size = 36
+        self.connected = True
         self.selected_commit = None
         self.current_head_hash = None
         self.hovered_commit = None
         self.avatars = {}
-        
+        self._rows_by_hash = {}
+
+        self.message_font = QFont("Segoe UI", 10, QFont.Weight.Bold)
+        self.meta_font = QFont("Segoe UI", 9)
+        self.hash_font = QFont("Consolas", 9)
+        self.initials_font = QFont('Segoe UI', 10, QFont.Weight.Bold)
+        self.message_metrics = QFontMetrics(self.message_font)
+        self.meta_metrics = QFontMetrics(self.meta_font)
+        self.hash_metrics = QFontMetrics(self.hash_font)
+        # hash -> prepared QStaticText layouts for that row
+        self._text_cache = {}
+
     def set_current_head(self, commit_hash):
+        old = self.current_head_hash
         self.current_head_hash = commit_hash
-        self.update()
-        
-    def set_commits(self, commits):
+        self._update_commit_rows(old, commit_hash)
+
+    def set_commits(self, commits, connected=True):
+        """Show commits; connected=False (e.g. a filtered list) hides the lane edges."""
         self.commits = commits
-        self.branch_colors = {}
+        self.connected = connected
+        self._text_cache = {}
+        self._update_rows()
+
+    def append_commits(self, commits):
+        """Add a page of commits below the current ones."""
+        self.commits = self.commits + commits
+        self._update_rows()
+
+    def prepend_commits(self, commits):
+        """Add a page of commits above the current ones. Returns the added height."""
+        self.commits = commits + self.commits
+        self._update_rows()
+        return len(commits) * self.row_height
+
+    def drop_commits(self, count, from_top):
+        """Remove `count` rows from one end. Returns the removed height."""
+        count = min(count, len(self.commits))
+        if from_top:
+            dropped = self.commits[:count]
+            self.commits = self.commits[count:]
+        else:
+            dropped = self.commits[len(self.commits) - count:]
+            self.commits = self.commits[:len(self.commits) - count]
+        for commit in dropped:
+            self._text_cache.pop(commit.get('hash'), None)
+        self._update_rows()
+        return count * self.row_height
+
+    def row_y(self, row):
+        return 30 + row * self.row_height
+
+    def row_rect(self, row):
+        """Area a row's background, node and text occupy."""
+        y = self.row_y(row)
+        return QRect(0, int(y - self.row_height / 2), self.width(), self.row_height)
+
+    def row_at(self, y):
+        return int((y - 30 + self.row_height / 2) / self.row_height)
+
+    def select_commit(self, commit_hash):
+        old = self.selected_commit
+        self.selected_commit = commit_hash
+        self._update_commit_rows(old, commit_hash)
+
+    def _update_commit_rows(self, *hashes):
+        """Repaint only the rows showing the given commits."""
+        for commit_hash in hashes:
+            row = self._rows_by_hash.get(commit_hash)
+            if row is not None:
+                self.update(self.row_rect(row))
+
+    def _update_rows(self):
         self.calculate_positions()
-        
+        if len(self._text_cache) > TEXT_CACHE_LIMIT:
+            self._text_cache = {}
+
         height = max(400, len(self.commits) * self.row_height + 60)
         self.setMinimumHeight(height)
         self.setMaximumHeight(height)
-        
+
         self.update()
-    
+
     def set_avatar(self, email, pixmap):
         if pixmap and not pixmap.isNull():
-            scaled = pixmap.scaled(self.avatar_size, self.avatar_size, 
+            scaled = pixmap.scaled(self.avatar_size, self.avatar_size,
                                   Qt.AspectRatioMode.KeepAspectRatio,
                                   Qt.TransformationMode.SmoothTransformation)
             self.avatars[email] = scaled
             self.update()
-        
+
     def calculate_positions(self):
-        columns = {}
-        next_column = 0
-        
+        # Lanes come precomputed from core.graph_layout (commit['graph']);
+        # commits without a layout fall back to a single lane.
+        lanes = 1
+        rows_by_hash = {}
         for i, commit in enumerate(self.commits):
-            branch = commit.get('branch', 'main')
-            
-            if branch not in columns:
-                if branch not in self.branch_colors:
-                    color_index = len(self.branch_colors) % len(self.colors)
-                    self.branch_colors[branch] = self.colors[color_index]
-                columns[branch] = next_column
-                next_column += 1
-            
-            commit['column'] = columns[branch]
+            graph = commit.get('graph')
+            commit['column'] = graph.column if graph and self.connected else 0
             commit['row'] = i
-            
+            rows_by_hash[commit.get('hash')] = i
+            if graph and self.connected:
+                lanes = max(lanes, graph.width)
+        self._rows_by_hash = rows_by_hash
+        avatar_space = self.avatar_size + 20
+        graph_width = max(self.min_graph_width, self.left_margin + lanes * self.lane_width + avatar_space)
+        if graph_width != self.graph_width:
+            self.graph_width = graph_width
+            self._text_cache = {}
+
+    def lane_x(self, lane):
+        return self.left_margin + lane * self.lane_width
+
+    def lane_color(self, color_index):
+        return self.colors[color_index % len(self.colors)]
+
     def mouseMoveEvent(self, event):
-        y = event.pos().y()
-        # Calculate row based on y position
-        # y = 30 + row * row_height
-        # row = (y - 30 + row_height/2) / row_height
-        row = int((y - 30 + self.row_height / 2) / self.row_height)
-        
+        row = self.row_at(event.pos().y())
+
         hovered = None
         if 0 <= row < len(self.commits):
             hovered = self.commits[row].get('hash')
-            
+
         if self.hovered_commit != hovered:
+            old = self.hovered_commit
             self.hovered_commit = hovered
-            self.update()
+            self._update_commit_rows(old, hovered)
         super().mouseMoveEvent(event)
 
     def leaveEvent(self, event):
+        old = self.hovered_commit
         self.hovered_commit = None
-        self.update()
+        self._update_commit_rows(old)
         super().leaveEvent(event)
 
+    def resizeEvent(self, event):
+        if event.oldSize().width() != event.size().width():
+            self._text_cache = {}  # message elision depends on the width
+        super().resizeEvent(event)
+
+    def visible_rows(self, rect):
+        """Row range (first, last) whose painting can touch `rect`."""
+        first = max(0, self.row_at(rect.top()))
+        # Edges of row r+1 are drawn upwards into row r's area
+        last = min(len(self.commits) - 1, self.row_at(rect.bottom()) + 1)
+        return first, last
+
     def paintEvent(self, event):
         if not self.commits:
             return
-            
+        first, last = self.visible_rows(event.rect())
+        if first > last:
+            return
+
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
+        theme = get_current_theme()
+        rows = range(first, last + 1)
+
         # Draw backgrounds first
-        for i, commit in enumerate(self.commits):
-            self.draw_row_background(painter, commit, i)
+        for i in rows:
+            self.draw_row_background(painter, self.commits[i], i, theme)
 
         # Draw graph lines
-        for i, commit in enumerate(self.commits):
-            self.draw_graph_lines(painter, commit, i)
+        for i in rows:
+            self.draw_graph_lines(painter, self.commits[i], i)
 
         # Draw nodes and content
-        for i, commit in enumerate(self.commits):
-            self.draw_commit_node(painter, commit, i)
-            self.draw_commit_content(painter, commit, i)
-            
-    def draw_row_background(self, painter, commit, index):
+        text_color = self.palette().color(self.palette().ColorRole.WindowText)
+        secondary_color = self.palette().color(self.palette().ColorRole.Text)
+        secondary_color.setAlpha(180) # Make it slightly dimmer
+        hash_color = QColor(theme.colors.get('text_link', '#4ec9b0'))
+        for i in rows:
+            self.draw_commit_node(painter, self.commits[i], i)
+            self.draw_commit_content(painter, self.commits[i], i, text_color, secondary_color, hash_color)
+
+    def draw_row_background(self, painter, commit, index, theme=None):
         row = commit.get('row', index)
         y = 30 + row * self.row_height
         rect = QRect(0, int(y - self.row_height/2), self.width(), self.row_height)
-        
-        theme = get_current_theme()
+
+        theme = theme or get_current_theme()
         # Use theme colors for selection/hover
-        
+
         # Highlighting for current HEAD (where we are checked out)
         if self.current_head_hash == commit.get('hash'):
             # Use success color with low opacity? or accent
             c = QColor(theme.colors['success'])
             c.setAlpha(30)
             painter.fillRect(rect, c)
-            
+
             # Add a left border/indicator
             painter.setPen(QPen(QColor(theme.colors['success']), 4))
             painter.drawLine(0, int(y - self.row_height/2 + 2), 0, int(y + self.row_height/2 - 2))
-            
+
         if self.selected_commit == commit.get('hash'):
             # Use surface_selected color with transparency
             c = QColor(theme.colors['surface_selected'])
@@ -144,153 +245,153 @@ class CommitGraphWidget(QWidget):
             painter.fillRect(rect, c)
 
     def draw_graph_lines(self, painter, commit, index):
-        column = commit.get('column', 0)
+        graph = commit.get('graph')
+        if not graph or not self.connected:
+            return
         row = commit.get('row', index)
-        branch = commit.get('branch', 'main')
-        
-        x = self.left_margin + column * 24  # Reduced spacing between lines
         y = 30 + row * self.row_height
-        
-        color = self.branch_colors.get(branch, self.colors[0])
-        
-        if index < len(self.commits) - 1:
-            next_commit = self.commits[index + 1]
-            next_column = next_commit.get('column', 0)
-            next_y = 30 + (index + 1) * self.row_height
-            
-            pen = QPen(color, 2)
-            painter.setPen(pen)
-            
-            if column == next_column:
-                painter.drawLine(int(x), int(y), int(x), int(next_y))
+        prev_y = y - self.row_height
+
+        # Segments from the previous row into this one
+        for from_lane, to_lane, color_index in graph.edges:
+            painter.setPen(QPen(self.lane_color(color_index), 2))
+            x1 = self.lane_x(from_lane)
+            x2 = self.lane_x(to_lane)
+            if x1 == x2:
+                painter.drawLine(int(x1), int(prev_y), int(x2), int(y))
             else:
-                next_x = self.left_margin + next_column * 24
                 path = QPainterPath()
-                path.moveTo(x, y)
-                
-                ctrl_y = y + (next_y - y) / 2
-                path.cubicTo(x, ctrl_y, next_x, ctrl_y, next_x, next_y)
+                path.moveTo(x1, prev_y)
+                ctrl_y = prev_y + (y - prev_y) / 2
+                path.cubicTo(x1, ctrl_y, x2, ctrl_y, x2, y)
+                painter.setBrush(Qt.BrushStyle.NoBrush)
                 painter.drawPath(path)
 
     def draw_commit_node(self, painter, commit, index):
         column = commit.get('column', 0)
         row = commit.get('row', index)
-        branch = commit.get('branch', 'main')
-        
-        x = self.left_margin + column * 24
+        graph = commit.get('graph')
+
+        x = self.lane_x(column)
         y = 30 + row * self.row_height
-        
-        color = self.branch_colors.get(branch, self.colors[0])
+
+        color = self.lane_color(graph.color) if graph else self.colors[0]
         is_selected = self.selected_commit == commit.get('hash', '')
-        
+        is_merge = len(commit.get('parents', [])) > 1
+        radius = self.node_radius - 1 if is_merge else self.node_radius
+
         if is_selected:
             painter.setPen(QPen(Qt.GlobalColor.white, 2))
             painter.setBrush(QBrush(color))
-            painter.drawEllipse(QPoint(int(x), int(y)), self.node_radius + 1, self.node_radius + 1)
+            painter.drawEllipse(QPoint(int(x), int(y)), radius + 1, radius + 1)
         else:
             painter.setPen(QPen(color.darker(120), 2))
             painter.setBrush(QBrush(color))
-            painter.drawEllipse(QPoint(int(x), int(y)), self.node_radius, self.node_radius)
+            painter.drawEllipse(QPoint(int(x), int(y)), radius, radius)
 
-    def draw_commit_content(self, painter, commit, index):
+    def _static_text(self, text, font):
+        static = QStaticText(text)
+        static.setTextFormat(Qt.TextFormat.PlainText)
+        static.setPerformanceHint(QStaticText.PerformanceHint.AggressiveCaching)
+        static.prepare(QTransform(), font)
+        return static
+
+    def _row_texts(self, commit):
+        """Prepared text layouts for a row, built once per commit and width."""
+        commit_hash = commit.get('hash', '')
+        texts = self._text_cache.get(commit_hash)
+        if texts is not None:
+            return texts
+
+        text_x = self.graph_width + 10
+        message = commit.get('message', 'No message')
+        # Simple truncation
+        elided_message = self.message_metrics.elidedText(
+            message, Qt.TextElideMode.ElideRight, self.width() - text_x - 20)
+        author = commit.get('author', 'Unknown')
+        date = commit.get('date', '')
+
+        colors = ['#4ec9b0', '#007acc', '#c586c0', '#dcdcaa', '#ce9178', '#4fc1ff', '#b5cea8']
+        texts = {
+            'message': self._static_text(elided_message, self.message_font),
+            'author': self._static_text(author, self.meta_font),
+            'date': self._static_text(date, self.meta_font),
+            'dot': self._static_text("•", self.meta_font),
+            'hash': self._static_text(commit_hash[:7], self.hash_font),
+            'initials': self._static_text(self.get_initials(author), self.initials_font),
+            'author_width': self.meta_metrics.horizontalAdvance(author),
+            'date_width': self.meta_metrics.horizontalAdvance(date),
+            'avatar_color': QColor(colors[sum(ord(c) for c in author) % len(colors)])
+        }
+        self._text_cache[commit_hash] = texts
+        return texts
+
+    def draw_commit_content(self, painter, commit, index, text_color=None, secondary_color=None, hash_color=None):
         row = commit.get('row', index)
         y = 30 + row * self.row_height
-        
+        texts = self._row_texts(commit)
+
         # Avatar
         email = commit.get('email', '')
         avatar_x = self.graph_width - self.avatar_size - 10
         avatar_y = int(y - self.avatar_size / 2)
-        
+
         if email in self.avatars:
             painter.save()
             path = QPainterPath()
             path.addEllipse(avatar_x, avatar_y, self.avatar_size, self.avatar_size)
-            painter.setClipPath(path)
+            painter.setClipPath(path, Qt.ClipOperation.IntersectClip)
             painter.drawPixmap(avatar_x, avatar_y, self.avatars[email])
             painter.restore()
         else:
-            painter.save()
-            author = commit.get('author', 'Unknown')
-            colors = ['#4ec9b0', '#007acc', '#c586c0', '#dcdcaa', '#ce9178', '#4fc1ff', '#b5cea8']
-            color_index = sum(ord(c) for c in author) % len(colors)
-            bg_color = QColor(colors[color_index])
-            
-            painter.setBrush(QBrush(bg_color))
+            painter.setBrush(QBrush(texts['avatar_color']))
             painter.setPen(Qt.PenStyle.NoPen)
             painter.drawEllipse(avatar_x, avatar_y, self.avatar_size, self.avatar_size)
-            
-            initials = self.get_initials(author)
+
+            initials = texts['initials']
+            size = initials.size()
             painter.setPen(QColor('#ffffff'))
-            font = QFont('Segoe UI', 10, QFont.Weight.Bold)
-            painter.setFont(font)
-            painter.drawText(avatar_x, avatar_y, self.avatar_size, self.avatar_size, 
-                           Qt.AlignmentFlag.AlignCenter, initials)
-            painter.restore()
-        
+            painter.drawStaticText(QPointF(avatar_x + (self.avatar_size - size.width()) / 2,
+                                           avatar_y + (self.avatar_size - size.height()) / 2), initials)
+
         # Text Content
         text_x = self.graph_width + 10
-        
-        # Message
-        text_color = self.palette().color(self.palette().ColorRole.WindowText)
+        if text_color is None:
+            text_color = self.palette().color(self.palette().ColorRole.WindowText)
+        if secondary_color is None:
+            secondary_color = self.palette().color(self.palette().ColorRole.Text)
+            secondary_color.setAlpha(180)
+        if hash_color is None:
+            hash_color = QColor(get_current_theme().colors.get('text_link', '#4ec9b0'))
+
+        # Message (baseline at y - 5)
         painter.setPen(QPen(text_color))
-        font = QFont("Segoe UI", 10, QFont.Weight.Bold)
-        painter.setFont(font)
-        
-        message = commit.get('message', 'No message')
-        # Simple truncation
-        metrics = painter.fontMetrics()
-        elided_message = metrics.elidedText(message, Qt.TextElideMode.ElideRight, self.width() - text_x - 20)
-        painter.drawText(text_x, int(y - 5), elided_message)
-        
-        # Meta info (Author, Date, Hash)
-        secondary_color = self.palette().color(self.palette().ColorRole.Text)
-        secondary_color.setAlpha(180) # Make it slightly dimmer
+        painter.drawStaticText(QPointF(text_x, y - 5 - self.message_metrics.ascent()), texts['message'])
+
+        # Meta info (Author, Date, Hash) on the baseline y + 15
         painter.setPen(QPen(secondary_color))
-        font = QFont("Segoe UI", 9)
-        painter.setFont(font)
-        
-        author = commit.get('author', 'Unknown')
-        date = commit.get('date', '')
-        hash_short = commit.get('hash', '')[:7]
-        
-        # Draw author
-        author_rect = metrics.boundingRect(author)
-        painter.drawText(text_x, int(y + 15), author)
-        
-        # Draw dot separator
-        dot_x = text_x + metrics.horizontalAdvance(author) + 8
-        painter.drawText(dot_x, int(y + 15), "•")
-        
-        # Draw date
+        meta_top = y + 15 - self.meta_metrics.ascent()
+        painter.drawStaticText(QPointF(text_x, meta_top), texts['author'])
+
+        # Dot separator
+        dot_x = text_x + texts['author_width'] + 8
+        painter.drawStaticText(QPointF(dot_x, meta_top), texts['dot'])
+
+        # Date
         date_x = dot_x + 12
-        painter.drawText(date_x, int(y + 15), date)
-        
-        # Draw hash (right aligned or after date)
-        # Let's put hash at the end with a different style maybe?
-        # Or keep the current format but cleaner
-        
-        hash_x = date_x + metrics.horizontalAdvance(date) + 12
-        painter.drawText(hash_x, int(y + 15), "•")
-        
-        hash_final_x = hash_x + 12
-        
-        # Draw hash with monospace font
-        painter.save()
-        mono_font = QFont("Consolas", 9)
-        painter.setFont(mono_font)
-        
-        # Use theme primary color or a specific hash color
-        theme = get_current_theme()
-        hash_color = QColor(theme.colors.get('text_link', '#4ec9b0'))
-        painter.setPen(QPen(hash_color)) 
-        
-        painter.drawText(hash_final_x, int(y + 15), hash_short)
-        painter.restore()
+        painter.drawStaticText(QPointF(date_x, meta_top), texts['date'])
+
+        hash_x = date_x + texts['date_width'] + 12
+        painter.drawStaticText(QPointF(hash_x, meta_top), texts['dot'])
+
+        # Hash with monospace font
+        painter.setPen(QPen(hash_color))
+        painter.drawStaticText(QPointF(hash_x + 12, y + 15 - self.hash_metrics.ascent()), texts['hash'])
 
     def draw_commit(self, painter, commit, index):
         # Legacy method kept for compatibility if needed, but paintEvent now calls specific methods
         pass
-    
+
     def get_initials(self, name):
         parts = name.strip().split()
         if len(parts) >= 2:
@@ -298,29 +399,26 @@ class CommitGraphWidget(QWidget):
         elif len(parts) == 1 and len(parts[0]) > 0:
             return parts[0][0].upper()
         return "?"
-        
+
     def mousePressEvent(self, event):
-        y = event.pos().y()
-        row = int((y - 30 + self.row_height / 2) / self.row_height)
-        
+        row = self.row_at(event.pos().y())
+
         if 0 <= row < len(self.commits):
             commit = self.commits[row]
             commit_hash = commit.get('hash', '')
-            
+
             if event.button() == Qt.MouseButton.LeftButton:
-                self.selected_commit = commit_hash
+                self.select_commit(commit_hash)
                 self.commit_clicked.emit(commit_hash)
-                self.update()
             elif event.button() == Qt.MouseButton.RightButton:
-                self.selected_commit = commit_hash
+                self.select_commit(commit_hash)
                 self.commit_context_menu.emit(commit_hash)
-                self.update()
-    
+
     def sizeHint(self):
         from PyQt6.QtCore import QSize
         height = max(400, len(self.commits) * self.row_height + 60)
         return QSize(self.width(), height)
-    
+
     def minimumSizeHint(self):
         from PyQt6.QtCore import QSize
         height = max(400, len(self.commits) * self.row_height + 60)
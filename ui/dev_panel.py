@@ -0,0 +1,176 @@
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView)
+from PyQt6.QtCore import Qt, QTimer
+from ui.theme import get_current_theme
+from core.translations import tr
+from core.tracing import get_tracer, default_sink_path
+from core.job_scheduler import get_job_scheduler
+
+REFRESH_INTERVAL = 1000
+
+
+class _NumberItem(QTableWidgetItem):
+    """Shows formatted text but sorts by the numeric value."""
+
+    def __init__(self, value, text):
+        super().__init__(text)
+        self.value = value
+
+    def __lt__(self, other):
+        return self.value < getattr(other, 'value', 0)
+
+
+class DevPanel(QDialog):
+    """Git command statistics from the tracer: where the time goes, per command class."""
+
+    COLUMNS = ('dev_panel_command', 'dev_panel_calls', 'dev_panel_total', 'dev_panel_mean',
+               'dev_panel_p95', 'dev_panel_max', 'dev_panel_errors', 'dev_panel_output')
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.tracer = get_tracer()
+        self.setWindowTitle(tr('dev_panel_title'))
+        self.setMinimumSize(760, 420)
+        self.setup_ui()
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(REFRESH_INTERVAL)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh()
+
+    def setup_ui(self):
+        theme = get_current_theme()
+        self.setStyleSheet(f"""
+            QDialog {{
+                background-color: {theme.colors['background']};
+            }}
+            QLabel {{
+                color: {theme.colors['text_secondary']};
+                font-size: 11px;
+            }}
+            QTableWidget {{
+                background-color: {theme.colors['surface']};
+                color: {theme.colors['text']};
+                border: 1px solid {theme.colors['border']};
+                gridline-color: {theme.colors['border']};
+                font-size: 11px;
+            }}
+            QHeaderView::section {{
+                background-color: {theme.colors['background']};
+                color: {theme.colors['text_secondary']};
+                border: none;
+                border-bottom: 1px solid {theme.colors['border']};
+                padding: 4px;
+            }}
+            QPushButton {{
+                background-color: {theme.colors['surface']};
+                color: {theme.colors['text']};
+                border: 1px solid {theme.colors['border']};
+                border-radius: 4px;
+                padding: 5px 12px;
+            }}
+            QPushButton:hover {{
+                background-color: {theme.colors['surface_hover']};
+                border-color: {theme.colors['primary']};
+            }}
+        """)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(12, 12, 12, 12)
+        layout.setSpacing(8)
+
+        self.jobs_label = QLabel()
+        layout.addWidget(self.jobs_label)
+        self.plugins_label = QLabel()
+        self.plugins_label.setWordWrap(True)
+        layout.addWidget(self.plugins_label)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels([tr(key) for key in self.COLUMNS])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        for column in range(1, len(self.COLUMNS)):
+            self.table.horizontalHeader().setSectionResizeMode(column, QHeaderView.ResizeMode.ResizeToContents)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(2, Qt.SortOrder.DescendingOrder)
+        layout.addWidget(self.table, 1)
+
+        buttons = QHBoxLayout()
+        self.sink_label = QLabel()
+        buttons.addWidget(self.sink_label, 1)
+        self.record_btn = QPushButton()
+        self.record_btn.clicked.connect(self.toggle_recording)
+        buttons.addWidget(self.record_btn)
+        clear_btn = QPushButton(tr('dev_panel_clear'))
+        clear_btn.clicked.connect(self.clear)
+        buttons.addWidget(clear_btn)
+        layout.addLayout(buttons)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh_timer.start()
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    @staticmethod
+    def _number_item(value, text):
+        item = _NumberItem(value, text)
+        item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        return item
+
+    def refresh(self):
+        rows = self.tracer.summary()
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(rows))
+        for row, stats in enumerate(rows):
+            self.table.setItem(row, 0, QTableWidgetItem(stats['command']))
+            self.table.setItem(row, 1, self._number_item(stats['calls'], str(stats['calls'])))
+            for column, key in ((2, 'total'), (3, 'mean'), (4, 'p95'), (5, 'max')):
+                millis = round(stats[key] * 1000, 1)
+                self.table.setItem(row, column, self._number_item(millis, f"{millis:.1f} ms"))
+            self.table.setItem(row, 6, self._number_item(stats['errors'], str(stats['errors'])))
+            self.table.setItem(row, 7, self._number_item(stats['bytes_out'], self._format_bytes(stats['bytes_out'])))
+        self.table.setSortingEnabled(True)
+
+        jobs = get_job_scheduler().stats()
+        self.jobs_label.setText(tr('dev_panel_jobs', running=jobs['running'], pending=jobs['pending'],
+                                   workers=jobs['workers']))
+        self.plugins_label.setText(self._plugins_text())
+        if self.tracer.sink_path:
+            self.sink_label.setText(tr('dev_panel_recording_to', path=self.tracer.sink_path))
+            self.record_btn.setText(tr('dev_panel_stop_recording'))
+        else:
+            self.sink_label.setText('')
+            self.record_btn.setText(tr('dev_panel_record'))
+
+    def _plugins_text(self):
+        plugin_manager = getattr(self.parent(), 'plugin_manager', None)
+        if plugin_manager is None:
+            return ''
+        loaded = []
+        pending = []
+        for plugin in plugin_manager.get_plugins():
+            if plugin['load_time'] is not None:
+                loaded.append(f"{plugin['name']} {plugin['load_time'] * 1000:.0f} ms")
+            elif plugin['enabled']:
+                pending.append(plugin['name'])
+        return tr('dev_panel_plugins', loaded=', '.join(loaded) or '-', pending=', '.join(pending) or '-')
+
+    @staticmethod
+    def _format_bytes(size):
+        for unit in ('B', 'KB', 'MB'):
+            if size < 1024:
+                return f"{size:.0f} {unit}"
+            size /= 1024
+        return f"{size:.1f} GB"
+
+    def toggle_recording(self):
+        self.tracer.set_sink(None if self.tracer.sink_path else default_sink_path())
+        self.refresh()
+
+    def clear(self):
+        self.tracer.clear()
+        self.refresh()
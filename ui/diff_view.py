@@ -0,0 +1,416 @@
+import re
+from array import array
+
+from PyQt6.QtWidgets import QAbstractScrollArea, QApplication
+from PyQt6.QtCore import Qt, pyqtSignal, QEvent
+from PyQt6.QtGui import QPainter, QColor, QFont, QFontMetrics, QKeySequence
+from ui.theme import get_current_theme
+from core.job_scheduler import get_job_scheduler, PRIORITY_INTERACTIVE
+from core.diff_classifier import render_summaries
+from core.translations import tr
+
+# Line kinds, precomputed once per line while indexing.
+KIND_CTX = 0
+KIND_ADD = 1
+KIND_DEL = 2
+KIND_HUNK = 3
+KIND_FILE = 4
+KIND_META = 5
+KIND_MARKER = 6
+KIND_COMMIT = 7
+KIND_AUTHOR = 8
+
+# The first batch is small so the first screen paints right away.
+FIRST_BATCH_LINES = 2000
+BATCH_LINES = 100000
+# Characters painted per line; minified or generated lines can be megabytes long.
+MAX_PAINTED_CHARS = 2000
+# Lines indexed per load; past it a "load more" row indexes the next budget.
+DEFAULT_LINE_BUDGET = 1000000
+
+_META_PREFIXES = ('index ', 'new file mode', 'deleted file mode', 'similarity index',
+                  'rename from', 'rename to', 'old mode', 'new mode', 'Binary files')
+_RGBA = re.compile(r'rgba?\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*(?:,\s*([\d.]+)\s*)?\)')
+
+def classify_at(text, pos):
+    """Kind of the diff line starting at text[pos]."""
+    first = text[pos:pos + 1]
+    if first == '+':
+        return KIND_MARKER if text.startswith('+++', pos) else KIND_ADD
+    if first == '-':
+        return KIND_MARKER if text.startswith('---', pos) else KIND_DEL
+    if first == '@' and text.startswith('@@', pos):
+        return KIND_HUNK
+    if first in (' ', '\n', ''):
+        return KIND_CTX
+    if text.startswith('diff ', pos):
+        return KIND_FILE
+    if text.startswith(_META_PREFIXES, pos):
+        return KIND_META
+    if text.startswith('commit ', pos):
+        return KIND_COMMIT
+    if text.startswith(('Author: ', 'Date:   ', 'Merge: '), pos):
+        return KIND_AUTHOR
+    return KIND_CTX
+
+
+def index_lines(text, start, max_lines):
+    """
+    Index up to `max_lines` lines of `text` from offset `start`.
+
+    Returns (offsets, kinds, next_start, longest) where next_start is None
+    once the end of the text was reached.
+    """
+    offsets = array('Q')
+    kinds = bytearray()
+    longest = 0
+    length = len(text)
+    find = text.find
+    pos = start
+    for _ in range(max_lines):
+        if pos >= length:
+            return offsets, kinds, None, longest
+        end = find('\n', pos)
+        if end < 0:
+            end = length
+        offsets.append(pos)
+        kinds.append(classify_at(text, pos))
+        if end - pos > longest:
+            longest = end - pos
+        pos = end + 1
+    return offsets, kinds, (pos if pos < length else None), longest
+
+
+def parse_color(value):
+    """QColor from '#rrggbb', a color name or a CSS 'rgba(r, g, b, a)' string."""
+    match = _RGBA.fullmatch(value.strip()) if isinstance(value, str) else None
+    if match:
+        r, g, b, a = match.groups()
+        alpha = float(a) if a is not None else 1.0
+        if alpha <= 1.0:
+            alpha *= 255
+        return QColor(int(r), int(g), int(b), int(min(255, alpha)))
+    return QColor(value)
+
+
+def diff_palette(theme, compact=False):
+    """(background, foreground) per line kind; None keeps the view's default."""
+    colors = theme.colors
+    if compact:
+        return {
+            KIND_ADD: (QColor('#2d4a3e'), QColor('#4ec9b0')),
+            KIND_DEL: (QColor('#4a2d2d'), QColor('#f48771')),
+            KIND_HUNK: (QColor('#2d3a4a'), QColor('#569cd6')),
+            KIND_FILE: (None, QColor('#858585')),
+            KIND_META: (None, QColor('#858585')),
+        }
+    secondary = parse_color(colors['text_secondary'])
+    return {
+        KIND_ADD: (parse_color(colors['diff_add_bg']), parse_color(colors['diff_add_text'])),
+        KIND_DEL: (parse_color(colors['diff_del_bg']), parse_color(colors['diff_del_text'])),
+        KIND_HUNK: (parse_color(colors['surface']), parse_color(colors['secondary'])),
+        KIND_FILE: (parse_color(colors['surface']), parse_color(colors['primary'])),
+        KIND_META: (None, secondary),
+        KIND_MARKER: (None, secondary),
+        KIND_COMMIT: (None, parse_color(colors['warning'])),
+        KIND_AUTHOR: (None, secondary),
+    }
+
+
+class DiffView(QAbstractScrollArea):
+    """
+    Read-only diff viewer that only paints the visible lines.
+
+    The diff text is kept as is, plus an array of line start offsets and one
+    kind byte per line; both are built on a worker thread in batches, so the
+    first screen shows while a multi-megabyte diff is still being indexed.
+    Memory is the text plus 9 bytes per line, and painting costs the same
+    for a 10-line and a 1M-line diff. Indexing stops after `line_budget`
+    lines; a "load more" row below the last line indexes the next budget.
+    """
+    text_ready = pyqtSignal(int, object)
+    lines_ready = pyqtSignal(int, object, object, int)
+    budget_reached = pyqtSignal(int, object, int)
+
+    def __init__(self, compact=False, parent=None, line_budget=DEFAULT_LINE_BUDGET):
+        super().__init__(parent)
+        self.compact = compact
+        self.line_budget = line_budget
+        self.generation = 0
+        self.placeholder_text = ''
+        self.empty_text = ''
+        self._text = ''
+        self._offsets = array('Q')
+        self._kinds = bytearray()
+        self._longest = 0
+        self._loading = False
+        self._has_diff = False  # False shows the placeholder, True the empty text
+        self._selection = None  # (anchor_row, current_row)
+        self._more = None       # (text offset, total lines) once the budget is reached
+        self._repo = None
+
+        font = QFont('Cascadia Code', 9 if compact else 10)
+        font.setStyleHint(QFont.StyleHint.Monospace)
+        font.setFixedPitch(True)
+        self.setFont(font)
+        self._update_metrics()
+        self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        self.viewport().setCursor(Qt.CursorShape.IBeamCursor)
+
+        self.text_ready.connect(self._on_text_ready)
+        self.lines_ready.connect(self._on_lines_ready)
+        self.budget_reached.connect(self._on_budget_reached)
+        self.apply_theme()
+
+    def changeEvent(self, event):
+        # Style sheets set fonts too, so metrics follow the font change itself
+        if event.type() == QEvent.Type.FontChange:
+            self._update_metrics()
+        super().changeEvent(event)
+
+    def _update_metrics(self):
+        metrics = QFontMetrics(self.font())
+        self._line_height = metrics.height() + (2 if self.compact else 4)
+        self._ascent = metrics.ascent() + (1 if self.compact else 2)
+        self._char_width = max(1, metrics.horizontalAdvance('M'))
+        self._update_scrollbars()
+
+    def apply_theme(self):
+        theme = get_current_theme()
+        self._palette = diff_palette(theme, self.compact)
+        self._text_color = QColor('#d4d4d4') if self.compact else parse_color(theme.colors['text'])
+        self._muted_color = parse_color(theme.colors['text_secondary'])
+        self._selection_color = parse_color(theme.colors['surface_selected'])
+        self._selection_color.setAlpha(90)
+        self.viewport().update()
+
+    def setPlaceholderText(self, text):
+        self.placeholder_text = text
+        self.viewport().update()
+
+    # ---- content ----
+
+    def clear(self):
+        self.generation += 1
+        self._text = ''
+        self._offsets = array('Q')
+        self._kinds = bytearray()
+        self._longest = 0
+        self._loading = False
+        self._has_diff = False
+        self._selection = None
+        self._more = None
+        self.verticalScrollBar().setValue(0)
+        self.horizontalScrollBar().setValue(0)
+        self._update_scrollbars()
+        self.viewport().update()
+
+    def set_diff(self, diff_text):
+        self.load(lambda: diff_text)
+
+    def load(self, fetch, repo=None):
+        """Run `fetch()` on a worker (e.g. a git diff) and show the text it returns."""
+        self.clear()
+        self._loading = True
+        self._has_diff = True
+        self._repo = repo
+        # Keyed per view: a newer load supersedes one that has not started yet
+        get_job_scheduler().submit(self._index, self.generation, fetch, priority=PRIORITY_INTERACTIVE,
+                                   repo=repo, key=('diff-view', id(self)), name='diff-index')
+
+    def load_more(self):
+        """Index the next `line_budget` lines after the "load more" row."""
+        if not self._more or self._loading:
+            return
+        start, _ = self._more
+        self._more = None
+        self._loading = True
+        get_job_scheduler().submit(self._index_range, self.generation, self._text, start, self.line_count(),
+                                   BATCH_LINES, priority=PRIORITY_INTERACTIVE, repo=self._repo,
+                                   key=('diff-view', id(self)), name='diff-index')
+
+    def _index(self, generation, fetch):
+        try:
+            text = render_summaries(fetch() or '')
+            if generation != self.generation:
+                return
+            self.text_ready.emit(generation, text)
+            self._index_range(generation, text, 0, 0, FIRST_BATCH_LINES)
+        except Exception as e:
+            print(f"[DEBUG] Diff indexing failed: {e}")
+            self.lines_ready.emit(generation, array('Q'), bytearray(), -1)
+
+    def _index_range(self, generation, text, start, indexed, batch):
+        budget_end = indexed + self.line_budget
+        while start is not None:
+            if generation != self.generation:
+                return
+            offsets, kinds, start, longest = index_lines(text, start, min(batch, budget_end - indexed))
+            indexed += len(offsets)
+            if start is not None and indexed >= budget_end:
+                self.lines_ready.emit(generation, offsets, kinds, -1 - longest)
+                remaining = text.count('\n', start) + (0 if text.endswith('\n') else 1)
+                self.budget_reached.emit(generation, start, indexed + remaining)
+                return
+            self.lines_ready.emit(generation, offsets, kinds, longest if start is not None else -1 - longest)
+            batch = BATCH_LINES
+
+    def _on_text_ready(self, generation, text):
+        if generation == self.generation:
+            self._text = text
+
+    def _on_budget_reached(self, generation, start, total):
+        if generation == self.generation:
+            self._more = (start, total)
+            self._update_scrollbars()
+            self.viewport().update()
+
+    def _on_lines_ready(self, generation, offsets, kinds, longest):
+        if generation != self.generation:
+            return
+        if longest < 0:
+            # Last batch
+            longest = -1 - longest
+            self._loading = False
+        self._offsets.extend(offsets)
+        self._kinds.extend(kinds)
+        self._longest = max(self._longest, longest)
+        self._update_scrollbars()
+        self.viewport().update()
+
+    def line_count(self):
+        return len(self._offsets)
+
+    def is_loading(self):
+        return self._loading
+
+    def line_text(self, row):
+        start = self._offsets[row]
+        end = self._text.find('\n', start)
+        if end < 0:
+            end = len(self._text)
+        return self._text[start:end].rstrip('\r')
+
+    def _row_count(self):
+        # Lines plus the "load more" row
+        return self.line_count() + (1 if self._more else 0)
+
+    def content_height(self):
+        return self._row_count() * self._line_height + 2 * self.frameWidth()
+
+    # ---- scrolling ----
+
+    def _visible_rows(self):
+        return max(1, self.viewport().height() // self._line_height)
+
+    def _update_scrollbars(self):
+        visible = self._visible_rows()
+        vbar = self.verticalScrollBar()
+        vbar.setRange(0, max(0, self._row_count() - visible))
+        vbar.setPageStep(visible)
+        vbar.setSingleStep(3)
+        hbar = self.horizontalScrollBar()
+        width = min(self._longest, MAX_PAINTED_CHARS) * self._char_width + 16
+        hbar.setRange(0, max(0, width - self.viewport().width()))
+        hbar.setPageStep(self.viewport().width())
+        hbar.setSingleStep(self._char_width * 4)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_scrollbars()
+
+    def scrollContentsBy(self, dx, dy):
+        self.viewport().update()
+
+    # ---- painting ----
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        painter.setFont(self.font())
+        rect = event.rect()
+        count = self.line_count()
+        if count == 0:
+            if not self._loading:
+                text = self.empty_text if self._has_diff else self.placeholder_text
+                painter.setPen(self._muted_color)
+                painter.drawText(self.viewport().rect().adjusted(8, 6, -8, -6),
+                                 Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop | Qt.TextFlag.TextWordWrap,
+                                 text)
+            return
+
+        first = self.verticalScrollBar().value() + rect.top() // self._line_height
+        last = min(self._row_count() - 1, self.verticalScrollBar().value() + rect.bottom() // self._line_height)
+        top = self.verticalScrollBar().value()
+        x = 8 - self.horizontalScrollBar().value()
+        width = self.viewport().width()
+        selection = None
+        if self._selection:
+            selection = (min(self._selection), max(self._selection))
+
+        for row in range(first, last + 1):
+            y = (row - top) * self._line_height
+            if row == count:
+                painter.setPen(self._palette.get(KIND_HUNK, (None, None))[1] or self._muted_color)
+                painter.drawText(8, y + self._ascent,
+                                 tr('diff_load_more', shown=f"{count:,}", total=f"{self._more[1]:,}"))
+                continue
+            background, foreground = self._palette.get(self._kinds[row], (None, None))
+            if background is not None:
+                painter.fillRect(0, y, width, self._line_height, background)
+            if selection and selection[0] <= row <= selection[1]:
+                painter.fillRect(0, y, width, self._line_height, self._selection_color)
+            painter.setPen(foreground or self._text_color)
+            text = self.line_text(row)
+            if len(text) > MAX_PAINTED_CHARS:
+                text = text[:MAX_PAINTED_CHARS] + '…'
+            painter.drawText(x, y + self._ascent, text.expandtabs(4))
+
+    # ---- selection and copy ----
+
+    def _row_at(self, y):
+        return min(self.line_count() - 1, self.verticalScrollBar().value() + max(0, y) // self._line_height)
+
+    def mousePressEvent(self, event):
+        if (event.button() == Qt.MouseButton.LeftButton and self._more
+                and self.verticalScrollBar().value() + event.pos().y() // self._line_height == self.line_count()):
+            self.load_more()
+            return
+        if event.button() == Qt.MouseButton.LeftButton and self.line_count():
+            row = self._row_at(event.pos().y())
+            if event.modifiers() & Qt.KeyboardModifier.ShiftModifier and self._selection:
+                self._selection = (self._selection[0], row)
+            else:
+                self._selection = (row, row)
+            self.viewport().update()
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if event.buttons() & Qt.MouseButton.LeftButton and self._selection:
+            row = self._row_at(event.pos().y())
+            if row != self._selection[1]:
+                self._selection = (self._selection[0], row)
+                self.viewport().update()
+        super().mouseMoveEvent(event)
+
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.StandardKey.Copy):
+            self.copy_selection()
+            return
+        if event.matches(QKeySequence.StandardKey.SelectAll) and self.line_count():
+            self._selection = (0, self.line_count() - 1)
+            self.viewport().update()
+            return
+        super().keyPressEvent(event)
+
+    def selected_text(self):
+        if not self._selection:
+            return ''
+        first, last = min(self._selection), max(self._selection)
+        start = self._offsets[first]
+        end = self._offsets[last + 1] - 1 if last + 1 < self.line_count() else len(self._text)
+        return self._text[start:end]
+
+    def copy_selection(self):
+        text = self.selected_text()
+        if text:
+            QApplication.clipboard().setText(text)
@@ -6,16 +6,23 @@ from PyQt6.QtGui import QFont, QCursor
 from ui.theme import get_current_theme
 from ui.icon_manager import IconManager
 from core.translations import tr
+from core.job_scheduler import get_job_scheduler, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
 import os
 
+# Assets at least this big that are not in LFS are suggested from the asset catalog
+LARGE_ASSET_SIZE = 100 * 1024 * 1024
+MAX_CATALOG_SUGGESTIONS = 200
+
+
 class LFSTrackingDialog(QDialog):
     def __init__(self, git_manager, plugin_manager, parent=None, suggested_files=None):
         super().__init__(parent)
         self.git_manager = git_manager
         self.plugin_manager = plugin_manager
-        self.suggested_files = suggested_files or []
+        self.suggested_files = list(suggested_files or [])
         self.icon_manager = IconManager()
         self.drag_position = QPoint()
+        self.catalog_job = None
         
         # Frameless window setup
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.Dialog)
@@ -287,6 +294,47 @@ class LFSTrackingDialog(QDialog):
             item.setIcon(self.icon_manager.get_icon("plus", size=14, color=theme.colors['text_secondary']))
             item.setToolTip(tr('lfs_pattern_tooltip', pattern=pattern))
             self.suggestions_list.addItem(item)
+
+        self.load_catalog_suggestions()
+
+    def load_catalog_suggestions(self):
+        """Add the large assets that are not in LFS yet, queried from the plugin asset catalog."""
+        repo_path = self.git_manager.repo_path
+        plugin_manager = self.plugin_manager
+        if not plugin_manager or not repo_path:
+            return
+
+        def task():
+            catalog = plugin_manager.get_asset_catalog(repo_path)
+            if catalog is None:
+                return []
+            catalog.refresh()
+            return catalog.query(lfs=False, min_size=LARGE_ASSET_SIZE, order='size', limit=MAX_CATALOG_SUGGESTIONS)
+
+        if self.catalog_job:
+            self.catalog_job.cancel()
+        self.catalog_job = get_job_scheduler().submit(
+            task, priority=PRIORITY_INTERACTIVE, repo=repo_path, name='lfs-catalog-suggestions',
+            on_result=self._add_catalog_suggestions)
+
+    def _add_catalog_suggestions(self, assets):
+        theme = get_current_theme()
+        shown = {self.suggestions_list.item(i).text() for i in range(self.suggestions_list.count())}
+        for asset in assets:
+            if asset.path in shown:
+                continue
+            self.suggested_files.append(asset.path)
+            item = QListWidgetItem(asset.path)
+            item.setIcon(self.icon_manager.get_icon("warning", size=14, color=theme.colors['warning']))
+            item.setToolTip(f"{tr('lfs_large_file_tooltip')} ({self.git_manager.format_size(asset.size)})")
+            self.suggestions_list.addItem(item)
+        if assets:
+            self.add_all_btn.setVisible(True)
+
+    def done(self, result):
+        if self.catalog_job:
+            self.catalog_job.cancel()
+        super().done(result)
             
     def add_pattern(self):
         pattern = self.pattern_input.text().strip()
@@ -344,9 +392,10 @@ class LFSTrackingDialog(QDialog):
 
 
 class LFSLocksDialog(QDialog):
-    def __init__(self, git_manager, parent=None):
+    def __init__(self, git_manager, parent=None, plugin_manager=None):
         super().__init__(parent)
         self.git_manager = git_manager
+        self.plugin_manager = plugin_manager
         self.icon_manager = IconManager()
         self.drag_position = QPoint()
         
@@ -469,6 +518,7 @@ class LFSLocksDialog(QDialog):
     def load_locks(self):
         self.locks_list.clear()
         locks = self.git_manager.get_lfs_locks()
+        self._store_locks(locks)
         
         if not locks:
             item = QListWidgetItem(tr('no_locks'))
@@ -486,6 +536,19 @@ class LFSLocksDialog(QDialog):
             item.setIcon(self.icon_manager.get_icon("lock", size=16))
             self.locks_list.addItem(item)
     
+    def _store_locks(self, locks):
+        """Hand the fresh lock list to the asset catalog so lock queries don't ask the server."""
+        repo_path = self.git_manager.repo_path
+        plugin_manager = self.plugin_manager
+        if not plugin_manager or not repo_path:
+            return
+
+        def task():
+            catalog = plugin_manager.get_asset_catalog(repo_path)
+            if catalog is not None:
+                catalog.update_locks(locks)
+        get_job_scheduler().submit(task, priority=PRIORITY_BACKGROUND, repo=repo_path, name='asset-catalog-locks')
+
     def unlock_selected(self):
         item = self.locks_list.currentItem()
         if not item:
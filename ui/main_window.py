@@ -4,7 +4,7 @@ from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QSystemTrayIcon, QApplication, QProgressDialog, QToolButton, QTabBar)
 from PyQt6.QtCore import Qt, QSize, QTimer, QPoint, QRect, QEvent
 from PyQt6.QtGui import QAction, QIcon, QKeySequence, QShortcut, QCursor
-from ui.repository_tab import RepositoryTab
+from ui.repository_tab import RepositoryTab, TAB_ACTIVE, TAB_BACKGROUND, TAB_SUSPENDED
 from ui.clone_dialog import CloneDialog
 from ui.theme import get_current_theme
 from core.git_manager import GitManager
@@ -394,7 +394,11 @@ class MainWindow(QMainWindow):
                 current_tab.clone_repository(url, path)
                 
     def close_tab(self, index):
+        tab = self.tab_widget.widget(index)
         self.tab_widget.removeTab(index)
+        if isinstance(tab, RepositoryTab):
+            tab.close()
+            tab.deleteLater()
         
         if self.tab_widget.count() == 0:
             self.add_empty_tab()
@@ -413,7 +417,28 @@ class MainWindow(QMainWindow):
         prev_index = (current - 1) % self.tab_widget.count()
         self.tab_widget.setCurrentIndex(prev_index)
         
+    def apply_tab_activity(self):
+        """Only the visible tab refreshes in real time; a minimized or tray window suspends all."""
+        suspended = not self.isVisible() or self.isMinimized()
+        current = self.tab_widget.currentWidget()
+        for i in range(self.tab_widget.count()):
+            tab = self.tab_widget.widget(i)
+            if isinstance(tab, RepositoryTab):
+                if suspended:
+                    tab.set_activity(TAB_SUSPENDED)
+                else:
+                    tab.set_activity(TAB_ACTIVE if tab is current else TAB_BACKGROUND)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.apply_tab_activity()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.apply_tab_activity()
+
     def on_tab_changed(self, index):
+        self.apply_tab_activity()
         if index >= 0:
             tab = self.tab_widget.widget(index)
             if isinstance(tab, RepositoryTab) and tab.repo_path:
@@ -421,6 +446,14 @@ class MainWindow(QMainWindow):
             else:
                 self.status_bar.showMessage(tr('ready'))
     
+    def show_dev_panel(self):
+        from ui.dev_panel import DevPanel
+        if getattr(self, '_dev_panel', None) is None:
+            self._dev_panel = DevPanel(self)
+        self._dev_panel.show()
+        self._dev_panel.raise_()
+        self._dev_panel.activateWindow()
+    
     def open_settings(self):
         from ui.accounts_dialog import AccountsDialog
         dialog = AccountsDialog(self.account_manager, self.plugin_manager, self)
@@ -571,6 +604,9 @@ class MainWindow(QMainWindow):
         
         quit_shortcut = QShortcut(QKeySequence("Ctrl+Q"), self)
         quit_shortcut.activated.connect(self.close)
+        
+        dev_panel_shortcut = QShortcut(QKeySequence("Ctrl+Shift+D"), self)
+        dev_panel_shortcut.activated.connect(self.show_dev_panel)
 
     def show_update_dialog(self, version, url, notes):
         msg = QMessageBox(self)
@@ -624,4 +660,5 @@ class MainWindow(QMainWindow):
                     current_widget.refresh_status()
         if event.type() == QEvent.Type.WindowStateChange:
             self.update_window_control_icons()
+            self.apply_tab_activity()
         super().changeEvent(event)
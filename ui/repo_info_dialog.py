@@ -1,19 +1,28 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                              QPushButton, QFrame, QApplication)
-from PyQt6.QtCore import Qt, QPoint, QTimer, QThread, pyqtSignal
+from PyQt6.QtCore import Qt, QPoint, QTimer, QObject, pyqtSignal
 from PyQt6.QtGui import QFont, QCursor
 from ui.theme import get_current_theme
 from ui.icon_manager import IconManager
 from core.translations import tr
+from core.job_scheduler import get_job_scheduler, PRIORITY_STATUS
 import os
 
 
-class RepoInfoWorker(QThread):
+class RepoInfoWorker(QObject):
     finished = pyqtSignal(dict)
     
     def __init__(self, git_manager, parent=None):
         super().__init__(parent)
         self.git_manager = git_manager
+        self.job = None
+    
+    def start(self):
+        self.job = get_job_scheduler().submit(self.run, priority=PRIORITY_STATUS,
+                                              repo=self.git_manager.repo_path, name='repo-info')
+    
+    def isRunning(self):
+        return self.job is not None and not self.job.done()
         
     def run(self):
         info = self.git_manager.get_repository_info()
@@ -4,14 +4,17 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QSplitter,
                              QProgressDialog, QScrollArea, QFrame, QCheckBox, QStackedWidget,
                              QProgressBar, QComboBox, QFileDialog,
                              QSizePolicy, QMenu, QInputDialog, QApplication, QDialog,
-                             QTableWidget, QTableWidgetItem, QHeaderView, QGridLayout)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QSize, QPoint, QByteArray, QUrl, QTimer, QObject
+                             QTableWidget, QTableWidgetItem, QHeaderView, QGridLayout,
+                             QListView, QAbstractItemView)
+from PyQt6.QtCore import Qt, pyqtSignal, QSize, QPoint, QByteArray, QUrl, QTimer, QObject
 from PyQt6.QtGui import QFont, QIcon, QCursor, QAction, QColor, QPixmap, QPainter, QBrush
 from PyQt6.QtNetwork import QNetworkAccessManager, QNetworkRequest
-from concurrent.futures import ThreadPoolExecutor
 from ui.home_view import HomeView
 from ui.icon_manager import IconManager
 from ui.commit_graph_widget import CommitGraphWidget
+from ui.diff_view import DiffView, DEFAULT_LINE_BUDGET
+from ui.changes_model import (ChangesModel, ChangesDelegate, PATH_ROLE,
+                              PLACEHOLDER_EMPTY, PLACEHOLDER_ERROR)
 from ui.lfs_tracking_dialog import LFSTrackingDialog, LFSLocksDialog
 from ui.stash_dialog import StashDialog
 from ui.repo_info_dialog import RepoInfoPopup
@@ -19,19 +22,30 @@ from ui.ai_chat_popup import AIChatPopup
 from ui.theme import get_current_theme
 from core.translations import tr
 from core.git_worker import GitWorker
+from core.fs_watcher import RepositoryWatcher
+from core.diff_cache import get_diff_cache, repo_key
+from core.job_scheduler import (get_job_scheduler, PRIORITY_INTERACTIVE, PRIORITY_STATUS,
+                                PRIORITY_PRELOAD, PRIORITY_BACKGROUND, SHARE, COALESCE)
 import os
 import sys
+import threading
 import hashlib
 import fnmatch
 import re
 
-class StatusWorkerSignals(QObject):
-    finished = pyqtSignal(object)
+# Tab lifecycle (set by the main window): the tab on screen refreshes in real
+# time, hidden tabs poll slowly (or just collect watcher events) and catch up
+# when activated, and nothing runs while the window is minimized or in the tray.
+TAB_ACTIVE = 'active'
+TAB_BACKGROUND = 'background'
+TAB_SUSPENDED = 'suspended'
+ACTIVE_REFRESH_INTERVAL = 2000
+BACKGROUND_REFRESH_INTERVAL = 60000
 
-class HistoryWorkerSignals(QObject):
-    finished = pyqtSignal(object)
+class WatcherSignals(QObject):
+    changed = pyqtSignal(object)
 
-class CloneThread(QThread):
+class CloneJob(QObject):
     progress = pyqtSignal(str)
     finished = pyqtSignal(bool, str)
     
@@ -40,6 +54,10 @@ class CloneThread(QThread):
         self.git_manager = git_manager
         self.url = url
         self.path = path
+    
+    def start(self):
+        get_job_scheduler().submit(self.run, priority=PRIORITY_INTERACTIVE, repo=self.path, name='clone',
+                                   terminate_on_cancel=False)
         
     def run(self):
         success, message = self.git_manager.clone_repository(
@@ -49,13 +67,17 @@ class CloneThread(QThread):
         )
         self.finished.emit(success, message)
 
-class PushThread(QThread):
+class PushJob(QObject):
     finished = pyqtSignal(bool, str)
     progress = pyqtSignal(str)
     
     def __init__(self, git_manager):
         super().__init__()
         self.git_manager = git_manager
+    
+    def start(self):
+        get_job_scheduler().submit(self.run, priority=PRIORITY_INTERACTIVE,
+                                   repo=self.git_manager.repo_path, name='push', terminate_on_cancel=False)
         
     def run(self):
         success, message = self.git_manager.push(progress_callback=self.progress.emit)
@@ -200,7 +222,7 @@ class PushPopup(QFrame):
         else:
             self.push_dialog.show() # Fallback
         
-        self.push_thread = PushThread(self.git_manager)
+        self.push_thread = PushJob(self.git_manager)
         self.push_thread.progress.connect(self.on_push_progress)
         self.push_thread.finished.connect(self.on_push_finished)
         self.push_thread.start()
@@ -252,20 +274,20 @@ class CommitFileItem(QFrame):
         diff_layout.setContentsMargins(0, 0, 0, 0)
         diff_layout.setSpacing(0)
         
-        self.diff_view = QTextEdit()
-        self.diff_view.setReadOnly(True)
+        self.diff_view = DiffView(compact=True)
+        self.diff_view.empty_text = tr('no_changes')
         self.diff_view.setMinimumHeight(80)
         self.diff_view.setMaximumHeight(300)
         self.diff_view.setStyleSheet(f"""
-            QTextEdit {{
+            DiffView {{
                 background-color: {self.theme.colors['background']};
                 border: none;
                 font-family: 'Cascadia Code', 'Consolas', monospace;
                 font-size: 11px;
-                padding: 6px 8px;
             }}
         """)
         diff_layout.addWidget(self.diff_view)
+        self.diff_loaded = False
         
         self.main_layout.addWidget(self.diff_container)
         
@@ -338,38 +360,13 @@ class CommitFileItem(QFrame):
         self._update_icons()
         self.update_style()
         
-        if self.is_expanded and self.diff_view.toPlainText() == "":
+        if self.is_expanded and not self.diff_loaded:
             self.load_diff()
             
     def load_diff(self):
-        if self.diff_content:
-            formatted = self.format_diff_simple(self.diff_content)
-            self.diff_view.setHtml(formatted)
-        else:
-            self.diff_view.setPlainText(tr('no_changes'))
+        self.diff_loaded = True
+        self.diff_view.set_diff(self.diff_content)
         
-    def format_diff_simple(self, diff_text):
-        if not diff_text:
-            return "<p style='color: #858585;'>No diff available</p>"
-            
-        lines = diff_text.split('\n')
-        html_parts = ["<pre style='margin:0; font-family: Consolas, monospace; font-size: 11px; line-height: 1.4;'>"]
-        
-        for line in lines:
-            escaped = line.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-            if line.startswith('+') and not line.startswith('+++'):
-                html_parts.append(f"<div style='background-color: #2d4a3e; color: #4ec9b0;'>{escaped}</div>")
-            elif line.startswith('-') and not line.startswith('---'):
-                html_parts.append(f"<div style='background-color: #4a2d2d; color: #f48771;'>{escaped}</div>")
-            elif line.startswith('@@'):
-                html_parts.append(f"<div style='background-color: #2d3a4a; color: #569cd6;'>{escaped}</div>")
-            elif line.startswith('diff ') or line.startswith('index '):
-                html_parts.append(f"<div style='color: #858585;'>{escaped}</div>")
-            else:
-                html_parts.append(f"<div style='color: #d4d4d4;'>{escaped}</div>")
-                
-        html_parts.append("</pre>")
-        return ''.join(html_parts)
 
 
 class RepositoryTab(QWidget):
@@ -381,26 +378,35 @@ class RepositoryTab(QWidget):
         self.parent_window = parent_window
         self.plugin_manager = plugin_manager
         self.avatar_cache = {}
-        self.diff_cache = {}
-        self.diff_cache_max_size = 50
+        self.diff_cache = get_diff_cache()
         self.network_manager = QNetworkAccessManager()
         self.network_manager.finished.connect(self.on_avatar_downloaded)
         self.icon_manager = IconManager()
         self.large_files = []
+        self.asset_catalog = None
         self.status_worker = None
-        self.status_worker_pending = False
         self.history_worker = None
         self.history_worker_pending = False
         self.repo_splitter = None
         self.auto_refresh_timer = QTimer(self)
-        self.auto_refresh_timer.setInterval(2000)
+        self.auto_refresh_timer.setInterval(ACTIVE_REFRESH_INTERVAL)
         self.auto_refresh_timer.timeout.connect(self._auto_refresh_tick)
+        self.activity = TAB_ACTIVE
+        self.catch_up_pending = False
+        self.history_stale = False
         self.scan_large_files = True
         self.current_branch_name = ""
         self.last_status_summary = {}
         self.status_future = None
         self.history_future = None
-        self.history_branch_requested = ""
+        self.commits = []
+        # Pages of the pager currently shown in the graph (a sliding window)
+        self.history_first_page = 0
+        self.history_last_page = -1
+        self.history_exhausted = False
+        self.history_page_future = None
+        self.history_jump_text = None
+        self.history_generation = 0
         self.git_op_future = None
         self.diff_future = None
         self.pending_diff_commit = None
@@ -408,21 +414,34 @@ class RepositoryTab(QWidget):
         self.diff_debounce_timer.setSingleShot(True)
         self.diff_debounce_timer.setInterval(100)
         self.diff_debounce_timer.timeout.connect(self._load_pending_diff)
-        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.scheduler = get_job_scheduler()
+        if self.plugin_manager:
+            self.plugin_manager.add_indicator_listener(self._indicator_invalidated)
         self.busy_timer = QTimer(self)
         self.busy_timer.setSingleShot(True)
         self.busy_timer.setInterval(300)
         self.busy_timer.timeout.connect(self._show_busy)
         self.busy_message = ""
-        self.status_signals = StatusWorkerSignals()
-        self.status_signals.finished.connect(self._on_status_future)
+        self.repo_watcher = None
+        self.head_dirty = True
+        self.status_scope = set()
+        self.status_scope_full = True
+        self.status_scope_lock = threading.Lock()
+        self.watcher_signals = WatcherSignals()
+        self.watcher_signals.changed.connect(self._on_watcher_changes)
         self.init_ui()
 
     def closeEvent(self, event):
         self.auto_refresh_timer.stop()
         self.busy_timer.stop()
-        if self.executor:
-            self.executor.shutdown(wait=False, cancel_futures=True)
+        self._stop_watcher()
+        if self.repo_path:
+            self.scheduler.cancel_repo(self.repo_path)
+        if self.plugin_manager:
+            self.plugin_manager.remove_indicator_listener(self._indicator_invalidated)
+            if self.repo_path:
+                self.plugin_manager.notify_repository_closed(self.repo_path)
+        self.git_manager.close()
         super().closeEvent(event)
 
     def _show_busy(self):
@@ -1386,19 +1405,23 @@ class RepositoryTab(QWidget):
         
         changes_layout.addLayout(selection_row)
         
-        self.changes_list = QListWidget()
+        self.changes_model = ChangesModel(self)
+        self.changes_model.check_state_changed.connect(self.on_item_check_changed)
+        self.changes_list = QListView()
+        self.changes_list.setModel(self.changes_model)
+        self.changes_list.setItemDelegate(ChangesDelegate(self.icon_manager, self.changes_list))
+        self.changes_list.setUniformItemSizes(True)
         self.changes_list.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         self.changes_list.setMinimumHeight(200)
         self.changes_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.changes_list.customContextMenuRequested.connect(self.show_changes_context_menu)
-        self.changes_list.itemChanged.connect(self.on_item_check_changed)
         
         # Get path to checkmark icon for stylesheet
         import os
         checkmark_path = os.path.join(os.path.dirname(__file__), "Icons", "checkmark.svg").replace("\\", "/")
         
         self.changes_list.setStyleSheet(f"""
-            QListWidget {{
+            QListView {{
                 background-color: {theme.colors['background']};
                 border: none;
                 border-radius: 8px;
@@ -1407,24 +1430,24 @@ class RepositoryTab(QWidget):
                 font-size: 12px;
                 outline: none;
             }}
-            QListWidget::item {{
+            QListView::item {{
                 padding: 10px 12px;
                 border-radius: 8px;
                 margin: 3px 2px;
                 border-left: 3px solid transparent;
                 background-color: {theme.colors['surface']};
             }}
-            QListWidget::item:hover {{
+            QListView::item:hover {{
                 background-color: {theme.colors['surface_hover']};
                 border-left-color: {theme.colors['primary']}80;
             }}
-            QListWidget::item:selected {{
+            QListView::item:selected {{
                 background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
                     stop:0 {theme.colors['primary']}25, 
                     stop:1 {theme.colors['surface']});
                 border-left-color: {theme.colors['primary']};
             }}
-            QListWidget::indicator {{
+            QListView::indicator {{
                 width: 20px;
                 height: 20px;
                 border-radius: 6px;
@@ -1432,25 +1455,25 @@ class RepositoryTab(QWidget):
                 background-color: {theme.colors['background']};
                 margin-right: 10px;
             }}
-            QListWidget::indicator:hover {{
+            QListView::indicator:hover {{
                 border-color: {theme.colors['primary']};
                 background-color: {theme.colors['primary']}15;
             }}
-            QListWidget::indicator:checked {{
+            QListView::indicator:checked {{
                 background-color: {theme.colors['primary']};
                 border-color: {theme.colors['primary']};
                 image: url({checkmark_path});
             }}
-            QListWidget::indicator:checked:hover {{
+            QListView::indicator:checked:hover {{
                 background-color: {theme.colors['primary_hover']};
                 border-color: {theme.colors['primary_hover']};
                 image: url({checkmark_path});
             }}
-            QListWidget::indicator:unchecked:pressed {{
+            QListView::indicator:unchecked:pressed {{
                 background-color: {theme.colors['primary']}40;
                 border-color: {theme.colors['primary']};
             }}
-            QListWidget::indicator:checked:pressed {{
+            QListView::indicator:checked:pressed {{
                 background-color: {theme.colors['primary_pressed']};
                 border-color: {theme.colors['primary_pressed']};
             }}
@@ -1471,9 +1494,9 @@ class RepositoryTab(QWidget):
                 height: 0px;
             }}
         """)
-        self.changes_list.itemDoubleClicked.connect(self.on_change_double_clicked)
-        self.changes_list.itemClicked.connect(self.on_change_clicked)
-        self.changes_list.setSelectionMode(QListWidget.SelectionMode.ExtendedSelection)
+        self.changes_list.doubleClicked.connect(self.on_change_double_clicked)
+        self.changes_list.clicked.connect(self.on_change_clicked)
+        self.changes_list.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         changes_layout.addWidget(self.changes_list)
         
         layout.addWidget(changes_container, 1)
@@ -1711,6 +1734,8 @@ class RepositoryTab(QWidget):
         self.commit_graph.commit_clicked.connect(self.on_graph_commit_clicked)
         self.commit_graph.commit_context_menu.connect(self.show_commit_context_menu)
         scroll.setWidget(self.commit_graph)
+        scroll.verticalScrollBar().valueChanged.connect(self._on_history_scrolled)
+        self.history_scroll = scroll
         
         layout.addWidget(scroll, 1)
         
@@ -1825,16 +1850,15 @@ class RepositoryTab(QWidget):
         diff_layout = QVBoxLayout(diff_container)
         diff_layout.setContentsMargins(10, 10, 10, 10)
         
-        self.changes_diff_view = QTextEdit()
-        self.changes_diff_view.setReadOnly(True)
+        self.changes_diff_view = DiffView(line_budget=self._diff_line_budget())
+        self.changes_diff_view.empty_text = tr('no_changes')
         self.changes_diff_view.setStyleSheet(f"""
-            QTextEdit {{
+            DiffView {{
                 background-color: {theme.colors['background']};
                 border: 1px solid {theme.colors['border']};
                 border-radius: 8px;
                 font-family: 'Cascadia Code', 'Consolas', monospace;
                 font-size: 12px;
-                padding: 10px;
             }}
         """)
         self.changes_diff_view.setPlaceholderText(tr('select_file_diff'))
@@ -1844,6 +1868,13 @@ class RepositoryTab(QWidget):
         
         return container
     
+    def _diff_line_budget(self):
+        if self.settings_manager:
+            budget = self.settings_manager.load_settings().get('diff_line_budget')
+            if isinstance(budget, int) and budget > 0:
+                return budget
+        return DEFAULT_LINE_BUDGET
+
     def _create_history_diff_view(self):
         theme = get_current_theme()
         
@@ -1913,13 +1944,11 @@ class RepositoryTab(QWidget):
         
     def show_home_view(self):
         self.stacked_widget.setCurrentWidget(self.home_view)
-        if self.auto_refresh_timer.isActive():
-            self.auto_refresh_timer.stop()
+        self._update_refresh_timer()
         
     def show_repo_view(self):
         self.stacked_widget.setCurrentWidget(self.repo_view)
-        if self.repo_path and not self.auto_refresh_timer.isActive():
-            self.auto_refresh_timer.start()
+        self._update_refresh_timer()
         if self.repo_path:
             self.refresh_status()
     
@@ -2010,7 +2039,7 @@ class RepositoryTab(QWidget):
         
         self.show_loading(tr('cloning_repository'), url)
         
-        self.clone_thread = CloneThread(self.git_manager, url, final_path)
+        self.clone_thread = CloneJob(self.git_manager, url, final_path)
         self.clone_thread.progress.connect(self.on_clone_progress)
         self.clone_thread.finished.connect(lambda success, msg: self.handle_clone_finished(success, msg, final_path))
         self.clone_thread.start()
@@ -2038,6 +2067,12 @@ class RepositoryTab(QWidget):
         self.show_loading(tr('loading_repository'), path)
         QApplication.processEvents()
         
+        if self.repo_path and self.repo_path != path:
+            self.scheduler.cancel_repo(self.repo_path)
+            if self.plugin_manager:
+                self.plugin_manager.notify_repository_closed(self.repo_path)
+        if self.plugin_manager and self.repo_path != path:
+            self.plugin_manager.notify_repository_opened(path)
         self.repo_path = path
         self.git_manager.set_repository(path)
         
@@ -2054,11 +2089,14 @@ class RepositoryTab(QWidget):
                 tab_widget.setTabText(current_index, f" {repo_name}")
                 tab_widget.setTabIcon(current_index, self.icon_manager.get_icon("folder-open", size=16))
         
-        if not self.auto_refresh_timer.isActive():
-            self.auto_refresh_timer.start()
+        self._update_refresh_timer()
         
+        self.head_dirty = True
+        self.history_first_page = 0
+        self.history_last_page = -1
+        self._start_watcher()
+        self._load_asset_catalog()
         self.refresh_status()
-        self._start_status_worker()
         self.update_repo_info()
         self.load_history()
         
@@ -2137,57 +2175,210 @@ class RepositoryTab(QWidget):
             }}
         """
 
-    def refresh_status(self):
+    def refresh_status(self, paths=None):
+        """Refresh status; `paths` limits the rescan to those files/directories."""
         if not self.repo_path:
             print("[DEBUG] refresh_status: No repo_path")
             return
-        self._clear_file_diff_cache()
-        if self.status_future and not self.status_future.done():
-            print("[DEBUG] refresh_status: Worker running, marking pending")
-            self.status_worker_pending = True
-            return
-        print("[DEBUG] refresh_status: Starting worker")
-        self.status_worker_pending = False
+        self._queue_status_scope(paths)
         self._start_status_worker()
-    
-    def _clear_file_diff_cache(self):
-        keys_to_remove = [k for k in self.diff_cache if k.startswith("file:")]
-        for k in keys_to_remove:
-            del self.diff_cache[k]
 
+    def _queue_status_scope(self, paths):
+        with self.status_scope_lock:
+            if paths is None:
+                self.status_scope_full = True
+            else:
+                self.status_scope.update(paths)
+
+    def _take_status_scope(self):
+        with self.status_scope_lock:
+            scope = None if self.status_scope_full else set(self.status_scope)
+            self.status_scope_full = False
+            self.status_scope = set()
+        return scope
+    
     def _start_status_worker(self):
         if not self.repo_path:
             print("[DEBUG] _start_status_worker: No repo_path")
             return
-        if self.status_future and not self.status_future.done():
-            print("[DEBUG] _start_status_worker: Already running")
-            self.status_worker_pending = True
-            return
         print(f"[DEBUG] _start_status_worker: Submitting task for {self.repo_path}")
-        self.status_worker_pending = False
         self.busy_message = "Loading status..."
         self.busy_timer.start()
         def task():
-            print("[DEBUG] task: Calling get_status_summary")
-            result = self.git_manager.get_status_summary(self.scan_large_files)
+            # The scope is taken when the task starts, so every request folded
+            # into this run (see COALESCE) is covered by it
+            scope = self._take_status_scope()
+            print(f"[DEBUG] task: Calling get_status_summary (scope={'full' if scope is None else len(scope)})")
+            result = self.git_manager.get_status_summary(self.scan_large_files, paths=scope)
             print(f"[DEBUG] task: Got result, entries={len(result.get('entries', []))}")
             return result
-        def on_done(future):
-            print("[DEBUG] on_done: Future callback triggered")
-            try:
-                summary = future.result()
-                print(f"[DEBUG] on_done: Emitting signal with {len(summary.get('entries', []))} entries")
-                self.status_signals.finished.emit(summary)
-            except Exception as e:
-                print(f"[DEBUG] on_done: Exception {e}")
-                self.status_signals.finished.emit({})
-        self.status_future = self.executor.submit(task)
-        self.status_future.add_done_callback(on_done)
-        print("[DEBUG] _start_status_worker: Task submitted")
+        # A burst of requests (watcher events, focus, auto refresh) coalesces into
+        # one pending run; status never runs twice at once for a repository
+        priority = PRIORITY_STATUS if self.activity == TAB_ACTIVE else PRIORITY_BACKGROUND
+        self.status_future = self.scheduler.submit(
+            task, priority=priority, repo=self.repo_path, key='status', mode=COALESCE,
+            name='status', on_result=self._on_status_future, on_error=lambda e: self._on_status_future({}))
+
+    def _start_watcher(self):
+        self._stop_watcher()
+        repo_path = self.repo_path
+        watcher = RepositoryWatcher(repo_path, self.watcher_signals.changed.emit)
+        self.repo_watcher = watcher
+
+        def task():
+            watcher.set_ignored_dirs(self.git_manager.get_ignored_directories())
+            if self.repo_watcher is watcher and watcher.start():
+                print(f"[DEBUG] File watcher started for {repo_path}")
+            else:
+                print(f"[DEBUG] File watcher unavailable, polling status for {repo_path}")
+        self.scheduler.submit(task, priority=PRIORITY_BACKGROUND, repo=repo_path, name='watcher-setup')
+
+    def _stop_watcher(self):
+        if self.repo_watcher:
+            self.repo_watcher.stop()
+            self.repo_watcher = None
+
+    def _watcher_active(self):
+        return bool(self.repo_watcher and self.repo_watcher.backend)
+
+    def _load_asset_catalog(self):
+        """Open the plugin asset catalog of the repository (if any) and bring it up to date off the GUI thread."""
+        self.asset_catalog = None
+        self.git_manager.status_engine.size_hint = None
+        self.changes_model.set_referencers({})
+        if not self.plugin_manager or not self.repo_path:
+            return
+        repo_path = self.repo_path
+
+        def task():
+            catalog = self.plugin_manager.get_asset_catalog(repo_path)
+            if catalog is not None:
+                catalog.refresh()
+            return repo_path, catalog
+        self.scheduler.submit(task, priority=PRIORITY_BACKGROUND, repo=repo_path, key='asset-catalog',
+                              mode=COALESCE, name='asset-catalog', on_result=self._on_asset_catalog)
+
+    def _on_asset_catalog(self, result):
+        repo_path, catalog = result
+        if repo_path != self.repo_path or catalog is None:
+            return
+        self.asset_catalog = catalog
+        self.git_manager.status_engine.size_hint = self._asset_size_hint
+        self._update_referencers(self.changes_model.paths())
+
+    def _update_referencers(self, paths):
+        """Look up, off the GUI thread, which assets reference the changed ones (shown in the changes list)."""
+        catalog = self.asset_catalog
+        if catalog is None or not paths:
+            return
+
+        def task():
+            catalog.refresh()
+            return catalog.referencers_of(paths)
+        self.scheduler.submit(task, priority=PRIORITY_BACKGROUND, repo=self.repo_path, key='asset-referencers',
+                              mode=COALESCE, name='asset-referencers', on_result=self.changes_model.set_referencers)
+
+    def _asset_size_hint(self, path):
+        # Runs on the status worker. Without watcher events the catalog can't know what changed.
+        catalog = self.asset_catalog
+        if catalog is None or not self._watcher_active():
+            return None
+        return catalog.size_hint(path)
+
+    def _on_watcher_changes(self, changes):
+        if not self.repo_path or not self.repo_watcher:
+            return
+        if changes.get('gitattributes'):
+            self.git_manager.invalidate_lfs_matcher(changes.get('paths'))
+        if self.plugin_manager:
+            self.plugin_manager.notify_repository_changed(self.repo_path, changes)
+            if self.asset_catalog is not None and self.activity == TAB_ACTIVE:
+                self.scheduler.submit(self.asset_catalog.refresh, priority=PRIORITY_BACKGROUND, repo=self.repo_path,
+                                      key='asset-catalog-refresh', mode=COALESCE, name='asset-catalog')
+            self.plugin_manager.invalidate_indicators(
+                self.repo_path, None if changes.get('full') else changes.get('paths', set()))
+            if self.activity == TAB_ACTIVE:
+                self.update_plugin_indicators()
+        if self.activity != TAB_ACTIVE:
+            # Not on screen: remember what changed and refresh once on activation
+            if changes.get('full') or changes.get('refs') or changes.get('gitignore') or changes.get('index'):
+                self._queue_status_scope(None)
+            else:
+                self._queue_status_scope(changes.get('paths', set()))
+            if changes.get('refs') or changes.get('full'):
+                self.head_dirty = True
+                self.history_stale = True
+            self.catch_up_pending = True
+            return
+        if changes.get('gitignore'):
+            self.scheduler.submit(self.git_manager.get_ignored_directories, priority=PRIORITY_BACKGROUND,
+                                  repo=self.repo_path, key='ignored-dirs', on_result=self._on_ignored_dirs)
+        full = changes.get('full') or changes.get('refs') or changes.get('gitignore')
+        if changes.get('index') and not self.git_manager.status_engine.index_change_explained():
+            # Something outside this client touched the index; we can't tell which paths
+            full = True
+        if changes.get('refs') or changes.get('full'):
+            self.head_dirty = True
+            if not self.history_future or self.history_future.done():
+                self.load_history()
+        if self.stacked_widget.currentWidget() == self.repo_view:
+            self.refresh_status(None if full else changes.get('paths', set()))
+
+    def set_activity(self, activity):
+        """Apply the lifecycle policy (TAB_ACTIVE / TAB_BACKGROUND / TAB_SUSPENDED)."""
+        if activity == self.activity:
+            return
+        print(f"[DEBUG] set_activity: {self.repo_path} {self.activity} -> {activity}")
+        self.activity = activity
+        self._update_refresh_timer()
+        if activity == TAB_ACTIVE:
+            self._catch_up()
+
+    def _update_refresh_timer(self):
+        if not self.repo_path or self.stacked_widget.currentWidget() != self.repo_view or \
+                self.activity == TAB_SUSPENDED:
+            self.auto_refresh_timer.stop()
+            return
+        if self.activity == TAB_BACKGROUND:
+            if self._watcher_active():
+                # Watcher events are collected for the catch-up, no polling needed
+                self.auto_refresh_timer.stop()
+                return
+            self.auto_refresh_timer.setInterval(BACKGROUND_REFRESH_INTERVAL)
+        else:
+            self.auto_refresh_timer.setInterval(ACTIVE_REFRESH_INTERVAL)
+        if not self.auto_refresh_timer.isActive():
+            self.auto_refresh_timer.start()
+
+    def _catch_up(self):
+        """Bring a tab that was in the background or suspended up to date."""
+        if not self.repo_path or self.stacked_widget.currentWidget() != self.repo_view:
+            return
+        self.catch_up_pending = False
+        if self.history_stale:
+            self.history_stale = False
+            if not self.history_future or self.history_future.done():
+                self.load_history()
+        self._start_status_worker()
+        self.update_plugin_indicators()
+
+    def _on_ignored_dirs(self, ignored_dirs):
+        if self.repo_watcher:
+            self.repo_watcher.set_ignored_dirs(ignored_dirs)
 
     def _auto_refresh_tick(self):
+        if self.activity != TAB_ACTIVE:
+            # Background tab without a watcher: a slow, low-priority poll
+            if self.repo_path and self.stacked_widget.currentWidget() == self.repo_view:
+                self.head_dirty = True
+                self.refresh_status()
+            return
         if self.repo_path and self.stacked_widget.currentWidget() == self.repo_view:
-            self.refresh_status()
+            if not self._watcher_active():
+                # No native watcher for this platform: fall back to polling.
+                self.head_dirty = True
+                self.git_manager.invalidate_lfs_matcher()
+                self.refresh_status()
             if not hasattr(self, '_indicator_tick_count'):
                 self._indicator_tick_count = 0
             self._indicator_tick_count += 1
@@ -2207,9 +2398,6 @@ class RepositoryTab(QWidget):
         self.check_detached_head()
         self._stop_busy()
         print("[DEBUG] _on_status_future: Done")
-        if self.status_worker_pending:
-            print("[DEBUG] _on_status_future: Restarting worker (pending=True)")
-            self._start_status_worker()
 
     def apply_status_summary(self):
         summary = self.last_status_summary or {}
@@ -2221,15 +2409,7 @@ class RepositoryTab(QWidget):
         error_msg = summary.get('error')
         if error_msg:
             print(f"[DEBUG] apply_status_summary: Error detected: {error_msg}")
-            self.changes_list.clear()
-            item = QListWidgetItem(tr('error'))
-            item.setIcon(self.icon_manager.get_icon("warning", size=16))
-            item.setToolTip(error_msg)
-            item.setForeground(QColor("#d16969"))
-            font = QFont("Segoe UI", 11)
-            font.setBold(True)
-            item.setFont(font)
-            self.changes_list.addItem(item)
+            self.changes_model.set_placeholder(PLACEHOLDER_ERROR, tr('error'), error_msg)
             self.branch_button.setText(summary.get('branch', 'unknown'))
             return
 
@@ -2254,19 +2434,6 @@ class RepositoryTab(QWidget):
             self.push_btn.setText(tr('push'))
             self.push_btn.setStyleSheet(self.get_action_button_style(highlight=False))
 
-        # Preserve selection state (checkboxes) and visual selection
-        current_states = {}
-        selected_paths = set()
-        for i in range(self.changes_list.count()):
-            item = self.changes_list.item(i)
-            path = item.data(Qt.ItemDataRole.UserRole)
-            if path:
-                current_states[path] = item.checkState()
-                if item.isSelected():
-                    selected_paths.add(path)
-
-        self.changes_list.setUpdatesEnabled(False)
-        self.changes_list.clear()
         entries = summary.get('entries', [])
         self.large_files = summary.get('large_files', [])
         
@@ -2277,105 +2444,16 @@ class RepositoryTab(QWidget):
             self.changes_tab_counter.setText(count_str)
 
         if not entries:
-            theme = get_current_theme()
-            item = QListWidgetItem(tr('no_changes'))
-            item.setIcon(self.icon_manager.get_icon("check", size=16))
-            item.setForeground(QColor(theme.colors['primary']))
-            font = QFont("Segoe UI", 11)
-            font.setBold(True)
-            item.setFont(font)
-            item.setFlags(Qt.ItemFlag.NoItemFlags)
-            item.setData(Qt.ItemDataRole.UserRole, None)
-            self.changes_list.addItem(item)
+            self.changes_model.set_placeholder(PLACEHOLDER_EMPTY, tr('no_changes'))
             self.large_files_banner.hide()
-            self.changes_list.setUpdatesEnabled(True)
+            self.update_checked_counter()
             return
 
-        for entry in entries:
-            file_path = entry.get('path', '')
-            state = entry.get('state', '??')
-            is_large = entry.get('large', False)
-
-            is_modified = 'M' in state
-            is_added = 'A' in state
-            is_deleted = 'D' in state
-            is_renamed = 'R' in state
-            is_untracked = '?' in state
-            is_conflicted = 'U' in state
-
-            if is_conflicted:
-                icon_name = "warning"
-                color = "#d16969"
-                tooltip = tr('conflicted')
-                status_badge = "C"
-            elif is_renamed:
-                icon_name = "file-plus"
-                color = "#569cd6"
-                tooltip = tr('renamed')
-                status_badge = "R"
-            elif is_added:
-                icon_name = "file-plus"
-                color = "#4ec9b0"
-                tooltip = tr('added')
-                status_badge = "A"
-            elif is_deleted:
-                icon_name = "file-x"
-                color = "#f48771"
-                tooltip = tr('deleted')
-                status_badge = "D"
-            elif is_modified:
-                icon_name = "file-text"
-                color = "#dcdcaa"
-                tooltip = tr('modified')
-                status_badge = "M"
-            elif is_untracked:
-                icon_name = "file"
-                color = "#858585"
-                tooltip = tr('untracked')
-                status_badge = "?"
-            else:
-                icon_name = "file"
-                color = "#858585"
-                tooltip = tr('untracked')
-                status_badge = "?"
-
-            if is_large:
-                icon_name = "warning"
-                tooltip = f"{tooltip} - LARGE FILE (>100MB)"
-
-            # Format display with status badge
-            display_text = f"[{status_badge}] {file_path}"
-            
-            item = QListWidgetItem(display_text)
-            item.setIcon(self.icon_manager.get_icon(icon_name, size=16))
-            item.setToolTip(f"{tooltip}: {file_path} ({state})")
-            item.setForeground(QColor(color))
-
-            font = QFont("Consolas", 11)
-            item.setFont(font)
-            item.setData(Qt.ItemDataRole.UserRole, file_path)
-            item.setData(Qt.ItemDataRole.UserRole + 1, state)  # Store git state
-            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
-            
-            # Restore checkbox state
-            if file_path in current_states:
-                item.setCheckState(current_states[file_path])
-            else:
-                item.setCheckState(Qt.CheckState.Checked)
-                
-            self.changes_list.addItem(item)
-
-        # Restore visual selection AFTER all items are added
-        if selected_paths:
-            for i in range(self.changes_list.count()):
-                item = self.changes_list.item(i)
-                path = item.data(Qt.ItemDataRole.UserRole)
-                if path and path in selected_paths:
-                    item.setSelected(True)
+        # The model diffs against the current rows; check and selection
+        # state survive for paths that are still present.
+        self.changes_model.set_entries(entries)
+        self._update_referencers([entry.path for entry in entries])
 
-        # Reactivar actualizaciones
-        self.changes_list.setUpdatesEnabled(True)
-        
         # Actualizar contador de archivos marcados
         self.update_checked_counter()
 
@@ -2393,19 +2471,15 @@ class RepositoryTab(QWidget):
         dialog.exec()
         self.refresh_status()
             
-    def on_change_double_clicked(self, item):
+    def on_change_double_clicked(self, index):
         pass
     
-    def on_change_clicked(self, item):
-        file_path = item.data(Qt.ItemDataRole.UserRole)
+    def on_change_clicked(self, index):
+        file_path = index.data(PATH_ROLE)
         if not file_path:
             return
-        diff = self.git_manager.get_file_diff(file_path)
-        if diff:
-            formatted = self.format_diff(diff)
-            self.changes_diff_view.setHtml(formatted)
-        else:
-            self.changes_diff_view.setPlainText(tr('no_changes'))
+        # git diff and styling both run off the GUI thread
+        self.changes_diff_view.load(lambda: self.git_manager.get_file_diff(file_path), repo=self.repo_path)
         
     def stage_all(self):
         success, message = self.git_manager.stage_all()
@@ -2415,64 +2489,61 @@ class RepositoryTab(QWidget):
         else:
             QMessageBox.warning(self, tr('error'), message)
     
-    def get_checked_items(self):
-        checked_items = []
-        for i in range(self.changes_list.count()):
-            item = self.changes_list.item(i)
-            if item.checkState() == Qt.CheckState.Checked:
-                checked_items.append(item)
-        return checked_items
+    def get_checked_paths(self):
+        return self.changes_model.checked_paths()
+
+    def get_current_path(self):
+        return self.changes_list.currentIndex().data(PATH_ROLE)
+
+    def get_selected_paths(self):
+        rows = sorted(index.row() for index in self.changes_list.selectionModel().selectedRows())
+        return [path for path in (self.changes_model.path_at(row) for row in rows) if path]
+
+    def _checked_or_current_paths(self):
+        paths = self.get_checked_paths()
+        if not paths:
+            current_path = self.get_current_path()
+            if current_path:
+                paths.append(current_path)
+        return paths
 
     def stage_selected(self):
-        items_to_process = self.get_checked_items()
-        if not items_to_process:
-            current_item = self.changes_list.currentItem()
-            if current_item:
-                items_to_process.append(current_item)
-        
-        if not items_to_process:
+        paths_to_process = self._checked_or_current_paths()
+        if not paths_to_process:
             return
 
         errors = []
-        for item in items_to_process:
-            file_path = item.data(Qt.ItemDataRole.UserRole)
+        for file_path in paths_to_process:
             success, message = self.git_manager.stage_file(file_path)
             if not success:
                 errors.append(f"{file_path}: {message}")
         
-        self.refresh_status()
+        self.refresh_status(paths=set())
         
         if errors:
             QMessageBox.warning(self, tr('error'), "\n".join(errors))
                 
     def unstage_selected(self):
-        items_to_process = self.get_checked_items()
-        if not items_to_process:
-            current_item = self.changes_list.currentItem()
-            if current_item:
-                items_to_process.append(current_item)
-        
-        if not items_to_process:
+        paths_to_process = self._checked_or_current_paths()
+        if not paths_to_process:
             return
 
         errors = []
-        for item in items_to_process:
-            file_path = item.data(Qt.ItemDataRole.UserRole)
+        for file_path in paths_to_process:
             success, message = self.git_manager.unstage_file(file_path)
             if not success:
                 errors.append(f"{file_path}: {message}")
         
-        self.refresh_status()
+        self.refresh_status(paths=set())
         
         if errors:
             QMessageBox.warning(self, tr('error'), "\n".join(errors))
 
     def show_changes_context_menu(self, position):
-        item = self.changes_list.itemAt(position)
-        if not item:
+        file_path = self.changes_list.indexAt(position).data(PATH_ROLE)
+        if not file_path:
             return
             
-        file_path = item.data(Qt.ItemDataRole.UserRole)
         menu = QMenu(self)
         theme = get_current_theme()
         menu.setStyleSheet(f"""
@@ -2535,9 +2606,7 @@ class RepositoryTab(QWidget):
         menu.addSeparator()
         
         # Single discard option - smart based on selection
-        selected_items = self.changes_list.selectedItems()
-        selected_files = [item for item in selected_items if item.data(Qt.ItemDataRole.UserRole)]
-        selected_count = len(selected_files)
+        selected_count = len(self.get_selected_paths())
         
         if selected_count > 1:
             # Multiple files selected - discard all selected (files icon)
@@ -2570,7 +2639,7 @@ class RepositoryTab(QWidget):
         discard_all_action.triggered.connect(self.discard_all_with_confirmation)
         menu.addAction(discard_all_action)
         
-        menu.exec(self.changes_list.mapToGlobal(position))
+        menu.exec(self.changes_list.viewport().mapToGlobal(position))
 
     def show_in_folder(self, file_path):
         """Open the folder containing the file in the system file explorer with the file selected"""
@@ -2620,7 +2689,7 @@ class RepositoryTab(QWidget):
         else:
             QMessageBox.warning(self, tr('error'), message)
 
-    def on_item_check_changed(self, item):
+    def on_item_check_changed(self):
         if not hasattr(self, '_check_timer'):
             self._check_timer = QTimer()
             self._check_timer.setSingleShot(True)
@@ -2628,14 +2697,8 @@ class RepositoryTab(QWidget):
         self._check_timer.start(50)
     
     def update_checked_counter(self):
-        checked_count = 0
-        total_count = 0
-        for i in range(self.changes_list.count()):
-            item = self.changes_list.item(i)
-            if item.flags() & Qt.ItemFlag.ItemIsUserCheckable:
-                total_count += 1
-                if item.checkState() == Qt.CheckState.Checked:
-                    checked_count += 1
+        checked_count = self.changes_model.checked_count()
+        total_count = self.changes_model.checkable_count()
         if hasattr(self, 'checked_label'):
             self.checked_label.setText(tr('checked_for_commit', checked=checked_count, total=total_count))
         if hasattr(self, '_all_checked') and hasattr(self, 'toggle_select_btn'):
@@ -2650,8 +2713,7 @@ class RepositoryTab(QWidget):
     
     def discard_selected_items(self):
         """Discard changes for all selected items (multi-select via Ctrl/Shift)"""
-        selected_items = self.changes_list.selectedItems()
-        file_paths = [item.data(Qt.ItemDataRole.UserRole) for item in selected_items if item.data(Qt.ItemDataRole.UserRole)]
+        file_paths = self.get_selected_paths()
         
         if not file_paths:
             return
@@ -2680,7 +2742,7 @@ class RepositoryTab(QWidget):
             if errors:
                 QMessageBox.warning(self, tr('error'), "\n".join(errors))
             
-            self.refresh_status()
+            self.refresh_status(paths=set())
 
     # ==================== CONFLICT METHODS ====================
     
@@ -2766,7 +2828,7 @@ class RepositoryTab(QWidget):
         success, msg = self.git_manager.resolve_conflict_ours(file_path)
         if success:
             QMessageBox.information(self, tr('success'), tr('conflict_resolved', file=file_path))
-            self.refresh_status()
+            self.refresh_status(paths=set())
         else:
             QMessageBox.warning(self, tr('error'), msg)
     
@@ -2775,7 +2837,7 @@ class RepositoryTab(QWidget):
         success, msg = self.git_manager.resolve_conflict_theirs(file_path)
         if success:
             QMessageBox.information(self, tr('success'), tr('conflict_resolved', file=file_path))
-            self.refresh_status()
+            self.refresh_status(paths=set())
         else:
             QMessageBox.warning(self, tr('error'), msg)
     
@@ -2784,7 +2846,7 @@ class RepositoryTab(QWidget):
         success, msg = self.git_manager.mark_resolved(file_path)
         if success:
             QMessageBox.information(self, tr('success'), tr('conflict_resolved', file=file_path))
-            self.refresh_status()
+            self.refresh_status(paths=set())
         else:
             QMessageBox.warning(self, tr('error'), msg)
     
@@ -2819,14 +2881,9 @@ class RepositoryTab(QWidget):
             QMessageBox.warning(self, tr('error'), msg)
 
     def toggle_all_changes(self):
-        self.changes_list.blockSignals(True)
-        self.changes_list.setUpdatesEnabled(False)
+        self.changes_model.blockSignals(True)
         try:
-            new_state = Qt.CheckState.Unchecked if self._all_checked else Qt.CheckState.Checked
-            for i in range(self.changes_list.count()):
-                item = self.changes_list.item(i)
-                if item.flags() & Qt.ItemFlag.ItemIsUserCheckable:
-                    item.setCheckState(new_state)
+            self.changes_model.set_all_checked(not self._all_checked)
             self._all_checked = not self._all_checked
             if self._all_checked:
                 self.toggle_select_btn.setIcon(self.icon_manager.get_icon("check-square", size=14, color="#ffffff"))
@@ -2835,21 +2892,21 @@ class RepositoryTab(QWidget):
                 self.toggle_select_btn.setIcon(self.icon_manager.get_icon("square", size=14, color="#ffffff"))
                 self.toggle_select_btn.setToolTip(tr('select_all'))
         finally:
-            self.changes_list.setUpdatesEnabled(True)
-            self.changes_list.blockSignals(False)
+            self.changes_model.blockSignals(False)
+            self.changes_list.viewport().update()
             self.update_checked_counter()
 
     def stage_file_single(self, file_path):
         success, message = self.git_manager.stage_file(file_path)
         if success:
-            self.refresh_status()
+            self.refresh_status(paths=set())
         else:
             QMessageBox.warning(self, tr('error'), message)
 
     def unstage_file_single(self, file_path):
         success, message = self.git_manager.unstage_file(file_path)
         if success:
-            self.refresh_status()
+            self.refresh_status(paths=set())
         else:
             QMessageBox.warning(self, tr('error'), message)
 
@@ -2864,20 +2921,14 @@ class RepositoryTab(QWidget):
         if reply == QMessageBox.StandardButton.Yes:
             success, message = self.git_manager.discard_file(file_path)
             if success:
-                self.refresh_status()
+                self.refresh_status(paths=set())
             else:
                 QMessageBox.warning(self, tr('error'), message)
     
     def discard_selected_changes(self):
-        checked_items = self.get_checked_items()
-        if not checked_items:
-            QMessageBox.warning(self, tr('warning'), tr('no_files_selected'))
-            return
-        
-        file_paths = [item.data(Qt.ItemDataRole.UserRole) for item in checked_items if item.data(Qt.ItemDataRole.UserRole)]
-        
+        file_paths = self.get_checked_paths()
         if not file_paths:
-            QMessageBox.warning(self, tr('warning'), tr('no_valid_files_selected'))
+            QMessageBox.warning(self, tr('warning'), tr('no_files_selected'))
             return
         
         file_count = len(file_paths)
@@ -2905,7 +2956,7 @@ class RepositoryTab(QWidget):
 
     def discard_all_with_confirmation(self):
         """Discard all changes in the repository with confirmation"""
-        count = self.changes_list.count()
+        count = self.changes_model.checkable_count()
         if count == 0:
             return
 
@@ -2932,7 +2983,7 @@ class RepositoryTab(QWidget):
                     QMessageBox.warning(self, tr('error'), message)
             finally:
                 if was_active:
-                    self.auto_refresh_timer.start()
+                    self._update_refresh_timer()
 
     def show_stash_dialog(self):
         """Show the stash management dialog"""
@@ -2952,13 +3003,7 @@ class RepositoryTab(QWidget):
             return
 
         # Collect selected files
-        files_to_stage = []
-        for i in range(self.changes_list.count()):
-            item = self.changes_list.item(i)
-            if item.checkState() == Qt.CheckState.Checked:
-                file_path = item.data(Qt.ItemDataRole.UserRole)
-                if file_path:
-                    files_to_stage.append(file_path)
+        files_to_stage = self.get_checked_paths()
         
         if not files_to_stage:
              QMessageBox.warning(self, tr('error'), tr('error_no_files_selected'))
@@ -2982,7 +3027,7 @@ class RepositoryTab(QWidget):
                 return False, result
             return self.git_manager.commit(message)
         
-        self._commit_worker = GitWorker(commit_operation, parent=self)
+        self._commit_worker = GitWorker(commit_operation, parent=self, repo=self.repo_path)
         self._commit_worker.signals.finished.connect(self._on_commit_finished)
         self._commit_worker.start()
     
@@ -2990,7 +3035,7 @@ class RepositoryTab(QWidget):
         self._stop_busy()
         
         if hasattr(self, 'auto_refresh_timer'):
-            self.auto_refresh_timer.start()
+            self._update_refresh_timer()
         
         if success:
             self.commit_summary.clear()
@@ -3029,7 +3074,7 @@ class RepositoryTab(QWidget):
         else:
             self.push_dialog.show() # Fallback
         
-        self.push_thread = PushThread(self.git_manager)
+        self.push_thread = PushJob(self.git_manager)
         self.push_thread.progress.connect(self.on_push_progress)
         self.push_thread.finished.connect(self.on_push_finished)
         self.push_thread.start()
@@ -3045,8 +3090,9 @@ class RepositoryTab(QWidget):
             self.parent_window.progress_label.setText("...")
         self.busy_message = status_message
         self.busy_timer.start()
-        self.git_op_future = self.executor.submit(operation)
-        self.git_op_future.add_done_callback(lambda f: QTimer.singleShot(0, lambda: self._on_git_future(f)))
+        self.git_op_future = self.scheduler.submit(operation, priority=PRIORITY_INTERACTIVE, repo=self.repo_path,
+                                                   terminate_on_cancel=False, on_result=self._on_git_result,
+                                                   on_error=lambda e: self._on_git_result((False, str(e))))
         
     def on_push_progress(self, line):
         if hasattr(self, 'push_dialog') and self.push_dialog:
@@ -3099,11 +3145,7 @@ class RepositoryTab(QWidget):
         else:
             self.handle_git_error(tr('error'), message)
 
-    def _on_git_future(self, future):
-        try:
-            result = future.result()
-        except Exception as e:
-            result = (False, str(e))
+    def _on_git_result(self, result):
         if isinstance(result, tuple) and len(result) == 2:
             success, message = result
         else:
@@ -3135,6 +3177,8 @@ class RepositoryTab(QWidget):
         
         if not text:
             self.commit_graph.set_commits(self.commits)
+            if self.commit_graph.selected_commit:
+                self._scroll_history_to(self.commit_graph.selected_commit, show_diff=False)
             return
             
         filtered = []
@@ -3152,19 +3196,29 @@ class RepositoryTab(QWidget):
             except Exception as e:
                 print(f"[DEBUG] filter error: {e}")
                 
-        self.commit_graph.set_commits(filtered)
+        self.commit_graph.set_commits(filtered, connected=False)
+
+        # A hash that is not in the loaded pages: fetch the page that has it
+        if not filtered and re.match(r'^[0-9a-f]{7,40}$', text) and text != self.history_jump_text:
+            self.history_jump_text = text
+            self.jump_to_commit(text)
 
     def check_detached_head(self):
         """Check if we are in detached HEAD state and update UI."""
         try:
-            current = self.git_manager.get_current_branch()
-            head_hash = self.git_manager.get_head_hash()
+            current = self.current_branch_name or self.git_manager.get_current_branch()
             
-            print(f"[DEBUG] check_detached_head: current='{current}', head='{head_hash}'")
-            
-            # Update graph highlight
-            if hasattr(self, 'commit_graph') and head_hash:
-                self.commit_graph.set_current_head(head_hash)
+            # HEAD only moves when the watcher reports a ref change
+            if self.head_dirty:
+                head_hash = self.last_status_summary.get('head') if self.last_status_summary else None
+                if not head_hash:
+                    head_hash = self.git_manager.get_head_hash()
+                self.head_dirty = False
+                print(f"[DEBUG] check_detached_head: current='{current}', head='{head_hash}'")
+                
+                # Update graph highlight
+                if hasattr(self, 'commit_graph') and head_hash:
+                    self.commit_graph.set_current_head(head_hash)
             
             # If current branch is a hash or contains "detached", we are detached
             is_detached = False
@@ -3264,85 +3318,208 @@ class RepositoryTab(QWidget):
             self.history_worker_pending = True
             return
         print("[DEBUG] load_history: Submitting history task")
-        branch = self.current_branch_name or self.git_manager.get_current_branch()
-        self.history_branch_requested = branch
         self.history_worker_pending = False
         self.busy_message = "Loading history..."
         self.busy_timer.start()
         
-        signals = HistoryWorkerSignals()
-        signals.finished.connect(self._on_history_result)
+        self.history_generation += 1
+        first_page = self.history_first_page
+        page_count = max(1, self.history_last_page - first_page + 1)
         
         def task():
-            result = self.git_manager.get_commit_history(50)
-            print(f"[DEBUG] history task: Got {len(result)} commits")
-            return result
-        
-        def on_done(future):
-            try:
-                result = future.result()
-            except Exception as e:
-                print(f"[DEBUG] history on_done: Exception {e}")
-                result = []
-            print(f"[DEBUG] history on_done: Emitting signal with {len(result)} commits")
-            signals.finished.emit(result)
-        
-        self.history_future = self.executor.submit(task)
-        self.history_future.add_done_callback(on_done)
-
-    def _on_history_result(self, history):
-        print(f"[DEBUG] _on_history_result: received {len(history)} commits")
-        if not history:
-            self._stop_busy()
-            if self.history_worker_pending:
-                self.load_history()
-            return
+            # Refs moved: drop cached pages and reload the pages on screen
+            pager = self.git_manager.history_pager
+            pager.reset()
+            start = first_page
+            rows = []
+            for page in range(start, start + page_count):
+                page_rows = pager.get_page(page)
+                rows.extend(page_rows)
+                if len(page_rows) < pager.page_size:
+                    break
+            if not rows and start > 0:
+                start = 0
+                rows = list(pager.get_page(0))
+            print(f"[DEBUG] history task: Got {len(rows)} commits")
+            return {'first_page': start, 'rows': rows}
+        
+        self.history_future = self.scheduler.submit(
+            task, priority=PRIORITY_STATUS, repo=self.repo_path, name='history',
+            on_result=self._on_history_result,
+            on_error=lambda e: self._on_history_result({'first_page': 0, 'rows': []}))
 
+    def _format_history_rows(self, rows):
         formatted_commits = []
-        for commit in history:
+        for commit in rows:
             formatted_commit = {
                 'hash': commit['hash'],
+                'parents': commit.get('parents', []),
+                'timestamp': commit.get('timestamp', 0),
+                'graph': commit.get('graph'),
                 'message': commit['message'],
                 'author': commit['author'],
                 'email': commit.get('email', ''),
-                'date': commit['date'],
-                'branch': self.history_branch_requested
+                'date': commit['date']
             }
             formatted_commits.append(formatted_commit)
 
             email = commit.get('email', '')
             if email and email not in self.avatar_cache:
                 self.download_gravatar(email, commit['author'])
+        return formatted_commits
+
+    def _history_pages_in(self, count):
+        page_size = self.git_manager.history_pager.page_size
+        return (count + page_size - 1) // page_size
+
+    def _on_history_result(self, result):
+        history = result['rows']
+        print(f"[DEBUG] _on_history_result: received {len(history)} commits")
+        if not history:
+            self._stop_busy()
+            if self.history_worker_pending:
+                self.load_history()
+            return
+
+        formatted_commits = self._format_history_rows(history)
+        page_size = self.git_manager.history_pager.page_size
+        self.history_first_page = result['first_page']
+        self.history_last_page = self.history_first_page + self._history_pages_in(len(formatted_commits)) - 1
+        self.history_exhausted = len(formatted_commits) % page_size != 0
 
         self.commits = formatted_commits
         print(f"[DEBUG] _on_history_result: setting {len(formatted_commits)} commits on graph")
-        self.commit_graph.set_commits(formatted_commits)
+        if self.history_filter.text():
+            self.filter_commits(self.history_filter.text())
+        else:
+            self.commit_graph.set_commits(formatted_commits)
         self._stop_busy()
         
         self._preload_commit_diffs(formatted_commits[:10])
 
         if self.history_worker_pending:
             self.load_history()
+
+    def _on_history_scrolled(self, value):
+        """Load the next/previous history page when the view nears an edge."""
+        if self.history_filter.text() or not self.commits:
+            return
+        margin = self.commit_graph.row_height * 10
+        bar = self.history_scroll.verticalScrollBar()
+        if value >= bar.maximum() - margin and not self.history_exhausted:
+            self._load_history_page(self.history_last_page + 1, 'append')
+        elif value <= margin and self.history_first_page > 0:
+            self._load_history_page(self.history_first_page - 1, 'prepend')
+
+    def _history_busy(self):
+        return ((self.history_future and not self.history_future.done()) or
+                (self.history_page_future and not self.history_page_future.done()))
+
+    def _load_history_page(self, page, where, target=None):
+        if not self.repo_path or self._history_busy():
+            return
+        pager = self.git_manager.history_pager
+        generation = self.history_generation
+        
+        def task():
+            if where == 'jump':
+                row = pager.find_row(target)
+                if row < 0:
+                    return {'where': where, 'page': -1, 'rows': [], 'target': target}
+                page_index = row // pager.page_size
+                return {'where': where, 'page': page_index, 'rows': pager.get_page(page_index), 'target': target}
+            return {'where': where, 'page': page, 'rows': pager.get_page(page), 'target': target}
+        
+        def on_done(result):
+            result['generation'] = generation
+            self._on_history_page(result)
+        
+        self.history_page_future = self.scheduler.submit(
+            task, priority=PRIORITY_PRELOAD, repo=self.repo_path, name='history-page', on_result=on_done,
+            on_error=lambda e: on_done({'where': where, 'page': page, 'rows': [], 'target': target}))
+
+    def _on_history_page(self, result):
+        if result['generation'] != self.history_generation:
+            return  # history was reloaded while this page was loading
+        where = result['where']
+        rows = result['rows']
+        page_size = self.git_manager.history_pager.page_size
+        if not rows:
+            if where == 'append':
+                self.history_exhausted = True
+            return
+
+        commits = self._format_history_rows(rows)
+        bar = self.history_scroll.verticalScrollBar()
+        max_window = self.git_manager.history_pager.max_pages * page_size
+
+        if where == 'jump':
+            self.history_first_page = self.history_last_page = result['page']
+            self.history_exhausted = len(rows) < page_size
+            self.commits = commits
+            self.commit_graph.set_commits(commits)
+            self._scroll_history_to(result['target'])
+            if self.history_filter.text():
+                self.filter_commits(self.history_filter.text())
+            return
+
+        if where == 'append':
+            self.history_last_page = result['page']
+            self.history_exhausted = len(rows) < page_size
+            self.commits = self.commits + commits
+            self.commit_graph.append_commits(commits)
+            if len(self.commits) > max_window:
+                # Keep the window bounded; the dropped page reloads on scroll-up
+                removed = self.commit_graph.drop_commits(page_size, from_top=True)
+                self.commits = self.commits[page_size:]
+                self.history_first_page += 1
+                QTimer.singleShot(0, lambda: bar.setValue(bar.value() - removed))
+        else:
+            self.history_first_page = result['page']
+            self.commits = commits + self.commits
+            added = self.commit_graph.prepend_commits(commits)
+            QTimer.singleShot(0, lambda: bar.setValue(bar.value() + added))
+            if len(self.commits) > max_window:
+                # Only the last page can be short, so it holds whatever is past the full ones
+                tail = len(self.commits) - (self.history_last_page - self.history_first_page) * page_size
+                self.commit_graph.drop_commits(tail, from_top=False)
+                self.commits = self.commits[:len(self.commits) - tail]
+                self.history_last_page -= 1
+                self.history_exhausted = False
+
+    def jump_to_commit(self, revision):
+        """Show a commit in the history graph, loading only the page that contains it."""
+        for commit in self.commits:
+            if commit['hash'].startswith(revision):
+                self._scroll_history_to(commit['hash'])
+                return
+        self._load_history_page(-1, 'jump', target=revision)
+
+    def _scroll_history_to(self, revision, show_diff=True):
+        row = -1
+        for i, commit in enumerate(self.commit_graph.commits):
+            if commit['hash'].startswith(revision):
+                row = i
+                break
+        if row < 0:
+            return
+        commit_hash = self.commit_graph.commits[row]['hash']
+        self.commit_graph.select_commit(commit_hash)
+        y = self.commit_graph.row_y(row)
+        QTimer.singleShot(0, lambda: self.history_scroll.ensureVisible(0, y, 0, self.history_scroll.viewport().height() // 2))
+        if show_diff:
+            self._request_commit_diff(commit_hash)
     
     def _preload_commit_diffs(self, commits):
+        repo = repo_key(self.repo_path)
         for commit in commits:
             commit_hash = commit['hash']
-            if commit_hash not in self.diff_cache:
-                self.executor.submit(self._preload_single_diff, commit_hash)
-    
-    def _preload_single_diff(self, commit_hash):
-        try:
-            if commit_hash in self.diff_cache:
-                return
-            files = self.git_manager.get_commit_files(commit_hash)
-            file_diffs = {}
-            for f in files:
-                diff = self.git_manager.get_commit_file_diff(commit_hash, f['path'])
-                file_diffs[f['path']] = {'status': f['status'], 'diff': diff}
-            if len(self.diff_cache) < self.diff_cache_max_size:
-                self.diff_cache[commit_hash] = file_diffs
-        except Exception:
-            pass
+            if not self.diff_cache.contains_bundle(repo, commit_hash):
+                # Same key as the interactive fetch: clicking a commit that is being
+                # preloaded attaches to (and promotes) the running preload
+                self.scheduler.submit(self.git_manager.get_commit_diff_bundle, commit_hash,
+                                      priority=PRIORITY_PRELOAD, repo=self.repo_path,
+                                      key=('commit-diff', commit_hash), mode=SHARE, name='preload-diff')
             
     def on_graph_commit_clicked(self, commit_hash):
         if commit_hash:
@@ -3353,48 +3530,42 @@ class RepositoryTab(QWidget):
         if commit_hash:
             self._request_commit_diff(commit_hash)
     
+    def _cached_commit_diff(self, commit_hash):
+        if not self.repo_path:
+            return None
+        return self.diff_cache.get_bundle(repo_key(self.repo_path), commit_hash)
+
     def _request_commit_diff(self, commit_hash):
         self.pending_diff_commit = commit_hash
-        if commit_hash in self.diff_cache:
-            cached = self.diff_cache[commit_hash]
-            if isinstance(cached, dict):
-                self._display_commit_files(commit_hash, cached)
-                return
-            else:
-                del self.diff_cache[commit_hash]
+        self._cancel_diff_fetch(keep=commit_hash)
+        cached = self._cached_commit_diff(commit_hash)
+        if cached is not None:
+            self._display_commit_files(commit_hash, cached)
+            return
         self.diff_debounce_timer.start()
+
+    def _cancel_diff_fetch(self, keep=None):
+        """Drop the fetch of a commit the user moved away from (kills its `git show`)."""
+        if self.diff_future is not None and not self.diff_future.done() and \
+                self.diff_future.key != ('commit-diff', keep):
+            self.diff_future.cancel()
+            self.diff_future = None
     
     def _load_pending_diff(self):
         commit_hash = self.pending_diff_commit
         if not commit_hash:
             return
-        if commit_hash in self.diff_cache:
-            cached = self.diff_cache[commit_hash]
-            if isinstance(cached, dict):
-                self._display_commit_files(commit_hash, cached)
-                return
-            else:
-                del self.diff_cache[commit_hash]
-        self.executor.submit(self._fetch_and_display_diff, commit_hash)
-    
-    def _fetch_and_display_diff(self, commit_hash):
-        try:
-            files = self.git_manager.get_commit_files(commit_hash)
-            file_diffs = {}
-            for f in files:
-                diff = self.git_manager.get_commit_file_diff(commit_hash, f['path'])
-                file_diffs[f['path']] = {'status': f['status'], 'diff': diff}
-            
-            if len(self.diff_cache) >= self.diff_cache_max_size:
-                try:
-                    oldest_key = next(iter(self.diff_cache))
-                    del self.diff_cache[oldest_key]
-                except StopIteration:
-                    pass
-            self.diff_cache[commit_hash] = file_diffs
-            QTimer.singleShot(0, lambda: self._display_commit_files(commit_hash, file_diffs))
-        except Exception:
-            pass
+        cached = self._cached_commit_diff(commit_hash)
+        if cached is not None:
+            self._display_commit_files(commit_hash, cached)
+            return
+        if self.diff_future is not None and not self.diff_future.done():
+            return  # already fetching this commit
+        # Shared with a preload or another view asking for the same commit
+        self.diff_future = self.scheduler.submit(
+            self.git_manager.get_commit_diff_bundle, commit_hash, priority=PRIORITY_INTERACTIVE,
+            repo=self.repo_path, key=('commit-diff', commit_hash), mode=SHARE, name='commit-diff',
+            on_result=lambda file_diffs: self._display_commit_files(commit_hash, file_diffs))
     
     def _display_commit_files(self, commit_hash, file_diffs):
         if self.pending_diff_commit != commit_hash:
@@ -3414,60 +3585,13 @@ class RepositoryTab(QWidget):
         for file_path, data in file_diffs.items():
             item = CommitFileItem(
                 file_path, 
-                data['status'], 
-                data['diff'], 
+                data.status, 
+                data.diff, 
                 self.icon_manager
             )
             self.commit_file_items.append(item)
             self.diff_files_layout.addWidget(item)
     
-    def format_diff(self, diff_text):
-        import html
-        theme = get_current_theme()
-        lines = diff_text.split('\n')
-        
-        colors = theme.colors
-        parts = [f'<div style="font-family: Consolas, Monaco, monospace; font-size: 13px; line-height: 1.5; color: {colors["text"]};">']
-        
-        style_commit = f'style="color: {colors["warning"]}; font-weight: bold; font-size: 14px; padding: 10px 0 5px 0;"'
-        style_author = f'style="color: {colors["text"]}; padding-bottom: 2px;"'
-        style_author_span = f'style="color: {colors["text_secondary"]};"'
-        style_date = f'style="color: {colors["text"]}; padding-bottom: 15px; border-bottom: 1px solid {colors["border"]}; margin-bottom: 15px;"'
-        style_diff_header = f'style="color: {colors["primary"]}; font-weight: bold; margin-top: 20px; padding: 8px; background-color: {colors["surface"]}; border-radius: 5px; border: 1px solid {colors["border"]};"'
-        style_meta = f'style="color: {colors["text_secondary"]}; padding-left: 10px; font-size: 11px;"'
-        style_file_marker = f'style="color: {colors["text_secondary"]}; padding-left: 10px;"'
-        style_hunk = f'style="color: {colors["secondary"]}; background-color: {colors["surface"]}; margin: 5px 0; padding: 4px 8px; border-radius: 3px;"'
-        style_add = f'style="background-color: {colors["diff_add_bg"]}; color: {colors["diff_add_text"]}; white-space: pre-wrap;"'
-        style_del = f'style="background-color: {colors["diff_del_bg"]}; color: {colors["diff_del_text"]}; white-space: pre-wrap;"'
-        style_default = 'style="white-space: pre-wrap;"'
-        
-        for line in lines:
-            line_content = html.escape(line)
-            
-            if line.startswith('commit '):
-                parts.append(f'<div {style_commit}>{line_content}</div>')
-            elif line.startswith('Author: '):
-                parts.append(f'<div {style_author}><span {style_author_span}>Author: </span>{line_content[8:]}</div>')
-            elif line.startswith('Date:   '):
-                parts.append(f'<div {style_date}><span {style_author_span}>Date: </span>{line_content[8:]}</div>')
-            elif line.startswith('diff --git'):
-                parts.append(f'<div {style_diff_header}>{line_content}</div>')
-            elif line.startswith('index ') or line.startswith('new file mode') or line.startswith('deleted file mode'):
-                parts.append(f'<div {style_meta}>{line_content}</div>')
-            elif line.startswith('---') or line.startswith('+++'):
-                parts.append(f'<div {style_file_marker}>{line_content}</div>')
-            elif line.startswith('@@'):
-                parts.append(f'<div {style_hunk}>{line_content}</div>')
-            elif line.startswith('+') and not line.startswith('+++'):
-                parts.append(f'<div {style_add}>{line_content}</div>')
-            elif line.startswith('-') and not line.startswith('---'):
-                parts.append(f'<div {style_del}>{line_content}</div>')
-            else:
-                parts.append(f'<div {style_default}>{line_content}</div>')
-        
-        parts.append('</div>')
-        return ''.join(parts)
-    
     def show_commit_context_menu(self, commit_hash):
         if not commit_hash:
             return
@@ -3883,24 +4007,46 @@ class RepositoryTab(QWidget):
         reply.deleteLater()
     
     def update_plugin_indicators(self):
-        theme = get_current_theme()
+        """Show the cached plugin indicators and re-evaluate the stale ones on a worker."""
         if not self.plugin_manager or not self.repo_path:
             return
-        
-        indicators = self.plugin_manager.get_repository_indicators(self.repo_path)
-        
-        current_state = str([(i.get('text'), i.get('color')) for i in indicators])
-        if hasattr(self, '_last_indicator_state') and self._last_indicator_state == current_state:
+
+        self._render_plugin_indicators(self.plugin_manager.cached_indicators(self.repo_path))
+        # Plugins may list directories or look up processes; never on the GUI thread
+        for name in self.plugin_manager.indicators_due(self.repo_path):
+            self.scheduler.submit(self.plugin_manager.evaluate_indicator, name, self.repo_path,
+                                  priority=PRIORITY_BACKGROUND, repo=self.repo_path,
+                                  key=('plugin-indicator', name), mode=SHARE,
+                                  name=f'indicator:{name}', on_result=self._on_plugin_indicator)
+
+    def _indicator_invalidated(self, repo_path):
+        # Any thread (e.g. the process monitor): hop to the GUI thread
+        self.scheduler.post(self._on_indicator_invalidated, repo_path)
+
+    def _on_indicator_invalidated(self, repo_path):
+        if repo_path not in (None, self.repo_path):
+            return
+        if self.activity == TAB_ACTIVE:
+            self.update_plugin_indicators()
+        else:
+            self.catch_up_pending = True
+
+    def _on_plugin_indicator(self, changed):
+        if changed and self.plugin_manager and self.repo_path:
+            self._render_plugin_indicators(self.plugin_manager.cached_indicators(self.repo_path))
+
+    def _render_plugin_indicators(self, indicators):
+        current_state = str([(i.get('text'), i.get('color'), i.get('tooltip'), i.get('icon')) for i in indicators])
+        if getattr(self, '_last_indicator_state', None) == current_state:
             return
         self._last_indicator_state = current_state
-        
+        theme = get_current_theme()
+
         while self.plugin_indicators_layout.count():
             item = self.plugin_indicators_layout.takeAt(0)
             if item.widget():
                 item.widget().deleteLater()
-        
-        indicators = self.plugin_manager.get_repository_indicators(self.repo_path)
-        
+
         default_style = f"""
             QPushButton {{
                 color: {theme.colors['primary']};
@@ -3985,9 +4131,15 @@ class RepositoryTab(QWidget):
     def show_plugin_actions(self, indicator=None):
         if not self.plugin_manager or not self.repo_path:
             return
-        
-        actions = self.plugin_manager.get_plugin_actions('repository', repo_path=self.repo_path)
-        
+
+        # Building the action list may probe processes; the menu opens when it is ready
+        cursor_pos = QCursor.pos()
+        self.scheduler.submit(self.plugin_manager.get_plugin_actions, 'repository', self.repo_path,
+                              priority=PRIORITY_INTERACTIVE, repo=self.repo_path, key='plugin-actions',
+                              name='plugin-actions',
+                              on_result=lambda actions: self._show_plugin_actions_menu(actions, indicator, cursor_pos))
+
+    def _show_plugin_actions_menu(self, actions, indicator, cursor_pos):
         if not actions:
             return
         
@@ -4024,7 +4176,6 @@ class RepositoryTab(QWidget):
             menu.addAction(action)
         
         if visible_actions > 0:
-            cursor_pos = QCursor.pos()
             menu.exec(cursor_pos)
     
     def show_lfs_menu(self):
@@ -4182,7 +4333,7 @@ class RepositoryTab(QWidget):
             QMessageBox.warning(self, tr('error'), message)
 
     def show_lfs_locks(self):
-        dialog = LFSLocksDialog(self.git_manager, self)
+        dialog = LFSLocksDialog(self.git_manager, self, plugin_manager=self.plugin_manager)
         dialog.exec()
 
     def do_lfs_prune(self):
@@ -4195,7 +4346,7 @@ class RepositoryTab(QWidget):
     def clone_repository(self, url, path):
         self.show_loading(tr('cloning_repository'), f"{url}\n-> {path}")
         
-        self.clone_thread = CloneThread(self.git_manager, url, path)
+        self.clone_thread = CloneJob(self.git_manager, url, path)
         self.clone_thread.finished.connect(self.on_clone_finished)
         self.clone_thread.progress.connect(self.on_clone_progress)
         self.clone_thread.start()
@@ -4392,41 +4543,31 @@ class RepositoryTab(QWidget):
             self.update_repo_info()
     
     def select_all_changes(self):
-        for i in range(self.changes_list.count()):
-            item = self.changes_list.item(i)
-            item.setCheckState(Qt.CheckState.Checked)
+        self.changes_model.set_all_checked(True)
             
     def deselect_all_changes(self):
-        for i in range(self.changes_list.count()):
-            item = self.changes_list.item(i)
-            item.setCheckState(Qt.CheckState.Unchecked)
+        self.changes_model.set_all_checked(False)
 
     def discard_selected(self):
-        items_to_process = self.get_checked_items()
-        if not items_to_process:
-            current_item = self.changes_list.currentItem()
-            if current_item:
-                items_to_process.append(current_item)
-        
-        if not items_to_process:
+        paths_to_process = self._checked_or_current_paths()
+        if not paths_to_process:
             return
 
         reply = QMessageBox.question(
             self,
             tr('confirm_discard'),
-            tr('confirm_discard_text', file=f"{len(items_to_process)} files"),
+            tr('confirm_discard_text', file=f"{len(paths_to_process)} files"),
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         
         if reply == QMessageBox.StandardButton.Yes:
             errors = []
-            for item in items_to_process:
-                file_path = item.data(Qt.ItemDataRole.UserRole)
+            for file_path in paths_to_process:
                 success, message = self.git_manager.discard_file(file_path)
                 if not success:
                     errors.append(f"{file_path}: {message}")
             
-            self.refresh_status()
+            self.refresh_status(paths=set())
             
             if errors:
                 QMessageBox.warning(self, tr('error'), "\n".join(errors))
@@ -4442,7 +4583,7 @@ class RepositoryTab(QWidget):
         if reply == QMessageBox.StandardButton.Yes:
             success, message = self.git_manager.discard_file(file_path)
             if success:
-                self.refresh_status()
+                self.refresh_status(paths=set())
             else:
                 QMessageBox.warning(self, tr('error'), message)
     def generate_ai_commit(self):
@@ -4451,14 +4592,11 @@ class RepositoryTab(QWidget):
             return
             
         # Get AI plugin
-        plugins = self.plugin_manager.get_all_plugins()
-        ai_plugin = None
-        
-        # Try finding by key first
-        if "ai_assistant" in plugins:
-            ai_plugin = plugins["ai_assistant"]
-        else:
+        ai_plugin = self.plugin_manager.get_plugin("ai_assistant")
+
+        if not ai_plugin:
             # Fallback to name check
+            plugins = self.plugin_manager.get_plugins_with('sidebar_widget')
             for name, p in plugins.items():
                 if hasattr(p, 'get_name') and p.get_name() == "AI Assistant":
                     ai_plugin = p
@@ -4492,13 +4630,12 @@ class RepositoryTab(QWidget):
         
         # If no staged changes, check if we have selected files in the UI and get their diffs
         if not success or not diff.strip():
-            checked_items = self.get_checked_items()
+            checked_paths = self.get_checked_paths()
             
-            if checked_items:
+            if checked_paths:
                 # Collect diffs for selected files
                 diff_parts = []
-                for item in checked_items[:10]: # Limit to 10 files to avoid massive diffs
-                    file_path = item.data(Qt.ItemDataRole.UserRole)
+                for file_path in checked_paths[:10]: # Limit to 10 files to avoid massive diffs
                     
                     if file_path:
                         # Try to get diff for this file (works for modified)